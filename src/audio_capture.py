@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import threading
+import time
+from math import gcd
+from typing import Optional
+
+import numpy as np
+import sounddevice as sd
+from scipy.signal import firwin
+
+from .echo_cancel import EchoCanceller
+
+
+class _PolyphaseResampler:
+    """Streaming polyphase resampler with the filter of scipy's resample_poly.
+
+    Input history is carried across blocks, so consecutive blocks give the
+    same samples as resample_poly on the whole stream (no edge artifacts at
+    block boundaries). Output trails the input by half the filter length,
+    10 output samples (0.6 ms at 16 kHz).
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int) -> None:
+        g = gcd(int(dst_rate), int(src_rate))
+        self.up = int(dst_rate) // g
+        self.down = int(src_rate) // g
+        max_rate = max(self.up, self.down)
+        self._delay = 10 * max_rate
+        h = firwin(2 * self._delay + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * self.up
+        self._taps = -(-h.size // self.up)
+        padded = np.zeros(self._taps * self.up)
+        padded[: h.size] = h
+        # Row p holds the phase-p taps h[p], h[p + up], ..., reversed so a
+        # row times the ascending input window gives one output sample.
+        self._bank = padded.reshape(self._taps, self.up).T[:, ::-1].copy()
+        self.reset()
+
+    def reset(self) -> None:
+        # Zeros before the stream start, like resample_poly's padding
+        self._buf = np.zeros(self._taps - 1)
+        self._buf_start = -(self._taps - 1)  # stream index of _buf[0]
+        self._next_out = 0
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """Resample an int16 block; returns the int16 samples completed so far."""
+        buf = np.concatenate([self._buf, x.astype(np.float64)])
+        end = self._buf_start + buf.size
+        last = (end * self.up - 1 - self._delay) // self.down
+        out = np.zeros(0, dtype=np.int16)
+        if last >= self._next_out:
+            t = np.arange(self._next_out, last + 1) * self.down + self._delay
+            windows = np.lib.stride_tricks.sliding_window_view(buf, self._taps)
+            first = t // self.up - self._taps + 1 - self._buf_start
+            y = np.einsum("ij,ij->i", self._bank[t % self.up], windows[first])
+            out = y.astype(np.int16)
+            self._next_out = last + 1
+        keep_from = (self._next_out * self.down + self._delay) // self.up - self._taps + 1
+        keep_from = min(max(keep_from, self._buf_start), end)
+        self._buf = buf[keep_from - self._buf_start:]
+        self._buf_start = keep_from
+        return out
+
+
+class AudioCaptureEngine:
+    """Always-on microphone capture into a preallocated ring buffer.
+
+    One long-lived ``sd.InputStream`` writes mono int16 frames (already at the
+    target sample rate) into a fixed-size ring. Frames are addressed by an
+    absolute, monotonically increasing frame index, so readers can pull audio
+    gaplessly while the previous chunk is still being transcribed.
+    """
+
+    def __init__(
+        self,
+        device_id: int | None,
+        samplerate: int = 16000,
+        stream_samplerate: int | None = None,
+        buffer_sec: float = 30.0,
+        block_sec: float = 0.02,
+        skip_event: Optional[threading.Event] = None,
+        echo_canceller: Optional[EchoCanceller] = None,
+    ) -> None:
+        """
+        Args:
+            device_id: PortAudio input device (None = default)
+            samplerate: Sample rate of the frames handed to readers
+            stream_samplerate: Rate the device is opened with (None = samplerate)
+            buffer_sec: Ring buffer length in seconds
+            block_sec: PortAudio block size in seconds
+            skip_event: Frames captured while this event is set are flagged
+                (used to hide our own playback from the recognizers)
+            echo_canceller: Removes our own playback from the frames before
+                they enter the ring (its clock is this engine's frame_at)
+        """
+        self.device_id = device_id
+        self.samplerate = int(samplerate)
+        self.stream_samplerate = int(stream_samplerate or samplerate)
+        self.block_sec = block_sec
+        self._capacity = max(int(self.samplerate * buffer_sec), self.samplerate)
+        self._ring = np.zeros(self._capacity, dtype=np.int16)
+        self._write_pos = 0
+        self._last_ts = time.monotonic()
+        self._skip_event = skip_event
+        self._skip_until = 0
+        self._cond = threading.Condition()
+        self._stream: Optional[sd.InputStream] = None
+        self._resampler: Optional[_PolyphaseResampler] = None
+        self._paused = False
+        self.echo_canceller = echo_canceller
+        if echo_canceller is not None:
+            echo_canceller.attach_clock(self.frame_at)
+        self.overruns = 0
+        self.status_errors = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._stream is not None and self._stream.active
+
+    @property
+    def position(self) -> int:
+        """Absolute index of the next frame that will be captured."""
+        with self._cond:
+            return self._write_pos
+
+    @property
+    def skip_until(self) -> int:
+        """Frames before this index were captured while skip_event was set."""
+        with self._cond:
+            return self._skip_until
+
+    def start(self) -> None:
+        if self._stream is not None:
+            return
+        blocksize = max(1, int(self.stream_samplerate * self.block_sec))
+        self._resampler = None
+        if self.stream_samplerate != self.samplerate:
+            self._resampler = _PolyphaseResampler(self.stream_samplerate, self.samplerate)
+        stream = sd.InputStream(
+            device=self.device_id,
+            samplerate=self.stream_samplerate,
+            channels=1,
+            dtype="int16",
+            blocksize=blocksize,
+            callback=self._callback,
+        )
+        stream.start()
+        self._stream = stream
+
+    def stop(self) -> None:
+        self._close_stream()
+        with self._cond:
+            self._paused = False
+            self._cond.notify_all()
+
+    def pause(self) -> None:
+        """Close the stream but keep readers waiting (device re-initialization)."""
+        with self._cond:
+            self._paused = True
+        self._close_stream()
+
+    def resume(self, device_id: int | None, stream_samplerate: int | None = None) -> None:
+        """Reopen the stream after pause(), possibly on a renumbered device."""
+        self.device_id = device_id
+        if stream_samplerate:
+            self.stream_samplerate = int(stream_samplerate)
+        self.start()
+        with self._cond:
+            self._paused = False
+            self._cond.notify_all()
+
+    def _close_stream(self) -> None:
+        stream = self._stream
+        self._stream = None
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception:
+                pass
+
+    def _callback(self, indata, frames_count, time_info, status) -> None:
+        if status:
+            self.status_errors += 1
+        mono = indata[:, 0] if indata.ndim > 1 else indata
+        resampler = self._resampler
+        if resampler is not None and mono.size:
+            mono = resampler.process(mono)
+        if self.echo_canceller is not None and mono.size:
+            try:
+                mono = self.echo_canceller.process(mono, self._write_pos)
+            except Exception:
+                self.status_errors += 1
+        self._write(mono)
+
+    def _write(self, mono: np.ndarray) -> None:
+        n = int(mono.size)
+        if n == 0:
+            return
+        if n > self._capacity:
+            mono = mono[-self._capacity:]
+            n = self._capacity
+        with self._cond:
+            start = self._write_pos % self._capacity
+            first = min(n, self._capacity - start)
+            self._ring[start:start + first] = mono[:first]
+            if first < n:
+                self._ring[:n - first] = mono[first:]
+            self._write_pos += n
+            self._last_ts = time.monotonic()
+            if self._skip_event is not None and self._skip_event.is_set():
+                self._skip_until = self._write_pos
+            self._cond.notify_all()
+
+    def time_at(self, frame: int) -> float:
+        """Monotonic timestamp (time.monotonic) at which a frame was captured."""
+        with self._cond:
+            return self._last_ts - (self._write_pos - frame) / self.samplerate
+
+    def frame_at(self, ts: float) -> int:
+        """Absolute frame index captured at monotonic timestamp ts."""
+        with self._cond:
+            return self._write_pos - int(round((self._last_ts - ts) * self.samplerate))
+
+    def read(
+        self,
+        start: int,
+        frames: int,
+        timeout: float | None = None,
+        skip_flagged: bool = False,
+    ) -> tuple[int, np.ndarray]:
+        """Return (actual_start, frames) for [start, start + frames).
+
+        Blocks until the requested frames have been captured. If the reader
+        fell behind by more than the ring length, it is moved forward to the
+        oldest frame still available (counted in ``overruns``). With
+        ``skip_flagged`` the range is moved past frames captured while
+        skip_event was set.
+        """
+        frames = max(0, int(frames))
+        if timeout is None:
+            timeout = frames / self.samplerate + 2.0
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if skip_flagged and start < self._skip_until:
+                    start = self._skip_until
+                oldest = self._write_pos - self._capacity
+                if start < oldest:
+                    start = oldest
+                    self.overruns += 1
+                if self._write_pos >= start + frames:
+                    return start, self._copy(start, frames)
+                if self._paused:
+                    # Device is being re-initialized: wait without timing out.
+                    self._cond.wait()
+                    deadline = time.monotonic() + timeout
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stream is None:
+                    raise TimeoutError(
+                        f"Audio-Aufnahme: keine Daten (device={self.device_id})"
+                    )
+                self._cond.wait(remaining)
+
+    def read_between(self, start_ts: float, end_ts: float) -> np.ndarray:
+        """Return the already captured frames between two monotonic timestamps."""
+        with self._cond:
+            start = self._write_pos - int(round((self._last_ts - start_ts) * self.samplerate))
+            end = self._write_pos - int(round((self._last_ts - end_ts) * self.samplerate))
+            start = max(start, self._write_pos - self._capacity)
+            end = min(end, self._write_pos)
+            if end <= start:
+                return np.zeros(0, dtype=np.int16)
+            return self._copy(start, end - start)
+
+    def _copy(self, start: int, frames: int) -> np.ndarray:
+        out = np.empty(frames, dtype=np.int16)
+        if frames == 0:
+            return out
+        pos = start % self._capacity
+        first = min(frames, self._capacity - pos)
+        out[:first] = self._ring[pos:pos + first]
+        if first < frames:
+            out[first:] = self._ring[:frames - first]
+        return out
+
+    def reader(self, skip_flagged: bool = True) -> "CaptureReader":
+        """Create a sequential reader starting at the current position."""
+        return CaptureReader(self, skip_flagged=skip_flagged)
+
+
+class CaptureReader:
+    """Sequential, gapless cursor over an AudioCaptureEngine."""
+
+    def __init__(self, engine: AudioCaptureEngine, skip_flagged: bool = True) -> None:
+        self.engine = engine
+        self.samplerate = engine.samplerate
+        self.skip_flagged = skip_flagged
+        self.position = engine.position
+
+    def read(self, frames: int, timeout: float | None = None) -> np.ndarray:
+        """Return the next `frames` frames directly following the previous read."""
+        start, audio = self.engine.read(
+            self.position, frames, timeout=timeout, skip_flagged=self.skip_flagged
+        )
+        self.position = start + len(audio)
+        return audio
+
+    def seek_latest(self) -> None:
+        """Drop everything captured so far and continue with new audio."""
+        self.position = self.engine.position
+
+    @property
+    def timestamp(self) -> float:
+        """Monotonic capture time of the next frame this reader returns."""
+        return self.engine.time_at(self.position)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+_SCALE = np.float32(1.0 / 32768.0)
+
+
+class AudioFrame:
+    """Mono audio block shared by all pipeline stages.
+
+    Carries the int16 samples and a lazily computed float32 view (-1..1);
+    whichever side is missing is converted once and cached, as are RMS and
+    peak. Stages attach their results (e.g. ``vad``) instead of recomputing
+    them. Treat the arrays as read-only; use take_float32() to hand the
+    float buffer to an in-place stage.
+    """
+
+    __slots__ = ("samplerate", "_pcm", "_float", "_rms", "_peak", "vad")
+
+    def __init__(
+        self,
+        pcm: Optional[np.ndarray] = None,
+        samplerate: int = 16000,
+        float32: Optional[np.ndarray] = None,
+    ) -> None:
+        if pcm is None and float32 is None:
+            pcm = np.zeros(0, dtype=np.int16)
+        if pcm is not None:
+            pcm = pcm.reshape(-1)
+            if pcm.dtype != np.int16:
+                pcm = pcm.astype(np.int16)
+        self.samplerate = int(samplerate)
+        self._pcm = pcm
+        self._float = float32.reshape(-1) if float32 is not None else None
+        self._rms: Optional[float] = None
+        self._peak: Optional[float] = None
+        self.vad: Any = None
+
+    @classmethod
+    def from_float(cls, float32: np.ndarray, samplerate: int = 16000) -> "AudioFrame":
+        return cls(None, samplerate, float32=float32.astype(np.float32, copy=False))
+
+    @classmethod
+    def concat(cls, frames: Iterable["AudioFrame"], samplerate: int | None = None) -> "AudioFrame":
+        """Join frames; cached float32 parts are joined too (no re-conversion)."""
+        frames = [f for f in frames if len(f)]
+        if not frames:
+            return cls(None, samplerate or 16000)
+        if len(frames) == 1:
+            return frames[0]
+        sr = samplerate or frames[0].samplerate
+        if all(f._float is not None for f in frames):
+            joined_float = np.concatenate([f._float for f in frames])
+        else:
+            joined_float = None
+        if joined_float is not None and not all(f._pcm is not None for f in frames):
+            return cls(None, sr, float32=joined_float)
+        return cls(np.concatenate([f.pcm for f in frames]), sr, float32=joined_float)
+
+    def __len__(self) -> int:
+        return int(self._pcm.size if self._pcm is not None else self._float.size)
+
+    @property
+    def duration(self) -> float:
+        return len(self) / self.samplerate if self.samplerate else 0.0
+
+    @property
+    def pcm(self) -> np.ndarray:
+        """int16 samples (converted from float32 once if needed)."""
+        if self._pcm is None:
+            buf = np.clip(self._float, -1.0, 32767.0 / 32768.0) * 32768.0
+            self._pcm = buf.astype(np.int16)
+        return self._pcm
+
+    @property
+    def float32(self) -> np.ndarray:
+        """float32 samples in -1..1 (converted from int16 once)."""
+        if self._float is None:
+            self._float = self._pcm.astype(np.float32)
+            self._float *= _SCALE
+        return self._float
+
+    def take_float32(self) -> np.ndarray:
+        """Hand over the float32 buffer for in-place processing.
+
+        The int16 samples stay valid; the cached float view is dropped (and
+        converted again only if someone asks for it later).
+        """
+        buf = self.float32
+        if self._pcm is None:
+            buf = buf.copy()
+        else:
+            self._float = None
+        return buf
+
+    @property
+    def rms(self) -> float:
+        if self._rms is None:
+            f = self.float32
+            self._rms = float(np.sqrt(np.dot(f, f) / f.size)) if f.size else 0.0
+        return self._rms
+
+    @property
+    def peak(self) -> float:
+        if self._peak is None:
+            f = self.float32
+            self._peak = float(np.max(np.abs(f))) if f.size else 0.0
+        return self._peak
+
+    def slice(self, start: int, stop: int | None = None) -> "AudioFrame":
+        """View of [start, stop) without copying."""
+        pcm = self._pcm[start:stop] if self._pcm is not None else None
+        flt = self._float[start:stop] if self._float is not None else None
+        return AudioFrame(pcm, self.samplerate, float32=flt)
+
+    def copy(self) -> "AudioFrame":
+        pcm = self._pcm.copy() if self._pcm is not None else None
+        flt = self._float.copy() if self._float is not None else None
+        return AudioFrame(pcm, self.samplerate, float32=flt)
+
+    def tail(self, n: int) -> "AudioFrame":
+        return self if n >= len(self) else self.slice(len(self) - n)
+
+    def to_bytes(self) -> bytes:
+        return self.pcm.tobytes()
@@ -5,23 +5,53 @@ import sys
 import time
 import threading
 import wave
-import re
 import subprocess
 import shutil
+from contextlib import contextmanager
 import numpy as np
 import sounddevice as sd
 from scipy.signal import resample_poly
 
+from .audio_capture import AudioCaptureEngine, CaptureReader
+from .audio_playback import PRIORITY_SPEECH, PRIORITY_STATUS, PlaybackEngine
+from .device_registry import get_device_registry
+from .echo_cancel import EchoCanceller
+
 _playback_active = threading.Event()
 _volume_lock = threading.Lock()
 _idle_muted = False
+_capture_engine: AudioCaptureEngine | None = None
+_capture_lock = threading.Lock()
+_playback_hold = 0
+_playback_hold_lock = threading.Lock()
+_stop_generation = 0
+_playback_engine: PlaybackEngine | None = None
+_playback_engine_lock = threading.Lock()
+_playback_engine_failed: tuple | None = None
+_printed_generation: dict[str, int] = {}
+_hotplug_registered = False
+_capture_device_name: str | None = None
 
 def _status_sound_enabled() -> bool:
     return os.getenv("STATUS_SOUND_ENABLED", "true").strip().lower() in ("1", "true", "yes", "y", "on")
 
+def echo_cancellation_enabled() -> bool:
+    return os.getenv("ECHO_CANCELLATION", "false").strip().lower() in ("1", "true", "yes", "y", "on")
+
 def is_playback_active() -> bool:
     return _playback_active.is_set()
 
+def barge_in_active() -> bool:
+    """True if the capture runs through the echo canceller, so it can stay on during playback."""
+    engine = _capture_engine
+    return engine is not None and engine.echo_canceller is not None and engine.is_running
+
+def _feed_echo_reference(block: np.ndarray, samplerate: int, dac_ts: float) -> None:
+    engine = _capture_engine
+    canceller = engine.echo_canceller if engine is not None else None
+    if canceller is not None:
+        canceller.feed_playback(block, samplerate, dac_ts)
+
 def wait_for_playback_end(poll_interval: float = 0.05) -> None:
     """Block until playback is finished."""
     while _playback_active.is_set():
@@ -29,6 +59,11 @@ def wait_for_playback_end(poll_interval: float = 0.05) -> None:
 
 def stop_playback() -> None:
     """Stop any ongoing playback immediately."""
+    global _stop_generation
+    _stop_generation += 1
+    engine = _playback_engine
+    if engine is not None:
+        engine.flush()
     try:
         sd.stop()
     except Exception:
@@ -36,6 +71,36 @@ def stop_playback() -> None:
     _playback_active.clear()
     _mute_output_when_idle(True)
 
+def playback_generation() -> int:
+    """Counter bumped by stop_playback(); lets multi-clip playback detect a stop."""
+    return _stop_generation
+
+@contextmanager
+def playback_session():
+    """Keep playback marked active across several clips (e.g. streamed sentences)."""
+    global _playback_hold
+    with _playback_hold_lock:
+        _playback_hold += 1
+        _playback_active.set()
+    try:
+        yield
+    finally:
+        with _playback_hold_lock:
+            _playback_hold -= 1
+            held = _playback_hold > 0
+            if not held:
+                _playback_active.clear()
+        if not held:
+            _mute_output_when_idle(True)
+
+def _release_playback_active(busy: bool = False) -> bool:
+    """Clear the playback flag unless held (playback_session or other clips); returns held."""
+    with _playback_hold_lock:
+        if _playback_hold == 0 and not busy:
+            _playback_active.clear()
+            return False
+        return True
+
 def _mute_output_when_idle(enabled: bool) -> None:
     """Mute/unmute system output when idle to avoid noise."""
     if os.getenv("MUTE_OUTPUT_WHEN_IDLE", "false").strip().lower() not in ("1", "true", "yes", "y", "on"):
@@ -81,88 +146,29 @@ def _set_system_volume_percent(percent: int) -> bool:
 
 def _get_input_devices() -> list[tuple[int, dict]]:
     """Return list of (device_id, device_info) for input-capable devices."""
-    try:
-        devices = sd.query_devices()
-        return [
-            (i, d)
-            for i, d in enumerate(devices)
-            if d.get("max_input_channels", 0) > 0
-        ]
-    except Exception:
-        return []
+    return get_device_registry().input_devices()
 
 def _get_output_devices() -> list[tuple[int, dict]]:
     """Return list of (device_id, device_info) for output-capable devices."""
-    try:
-        devices = sd.query_devices()
-        return [
-            (i, d)
-            for i, d in enumerate(devices)
-            if d.get("max_output_channels", 0) > 0
-        ]
-    except Exception:
-        return []
+    return get_device_registry().output_devices()
 
 def _resolve_device_id(device_spec: str | int | None) -> int | None:
     """Resolve device specification (name or ID) to device ID.
 
-    Supports:
-    - int or numeric string (device ID)
-    - partial name match
-    - composite match using "token1|token2" (all tokens must match)
-    - key-value match like "card=...;device=..." or "card=... , device=..."
+    Resolutions are cached by the device registry until the ALSA card set
+    changes; see device_registry.match_device_spec for the spec syntax.
     """
-    if device_spec is None:
-        return None
-    
-    # If it's already an integer, return it
-    if isinstance(device_spec, int):
-        return device_spec
-    
-    # Try to parse as integer
-    try:
-        return int(device_spec)
-    except ValueError:
-        pass
-    
-    spec = str(device_spec).strip()
-    tokens: list[str] = []
-    
-    # Parse key-value spec: card=...;device=...
-    if "card=" in spec.lower() or "device=" in spec.lower():
-        parts = re.split(r"[;,]", spec)
-        kv = {}
-        for part in parts:
-            if "=" in part:
-                k, v = part.split("=", 1)
-                kv[k.strip().lower()] = v.strip()
-        card = kv.get("card")
-        device = kv.get("device")
-        if card:
-            tokens.append(card)
-        if device:
-            tokens.append(device)
-        # If numeric card/device are provided, add hw:card,device token
-        if card and device and card.isdigit() and device.isdigit():
-            tokens.append(f"hw:{card},{device}")
-    elif "|" in spec:
-        tokens = [t.strip() for t in spec.split("|") if t.strip()]
-    else:
-        tokens = [spec]
-    
-    # Search by name (case-insensitive partial match for all tokens)
-    devices = sd.query_devices()
-    tokens_lower = [t.lower() for t in tokens if t]
-    for i, device in enumerate(devices):
-        name = device.get('name', '').lower()
-        if all(token in name for token in tokens_lower):
-            return i
-    
-    # Not found, return None (caller may fallback)
-    return None
+    return get_device_registry().resolve(device_spec)
+
+def _device_info(device_id: int | None, kind: str | None = None) -> dict | None:
+    """Cached device info (None = PortAudio default for kind)."""
+    return get_device_registry().device(device_id, kind)
 
 def _print_input_devices() -> None:
-    """Print available input devices for troubleshooting."""
+    """Print available input devices for troubleshooting (once per device set)."""
+    if _printed_generation.get("input") == get_device_registry().generation:
+        return
+    _printed_generation["input"] = get_device_registry().generation
     input_devices = _get_input_devices()
     if not input_devices:
         return
@@ -171,7 +177,10 @@ def _print_input_devices() -> None:
         print(f"  {i}: {d['name']} (in={d['max_input_channels']})", file=sys.stderr)
 
 def _print_output_devices() -> None:
-    """Print available output devices for troubleshooting."""
+    """Print available output devices for troubleshooting (once per device set)."""
+    if _printed_generation.get("output") == get_device_registry().generation:
+        return
+    _printed_generation["output"] = get_device_registry().generation
     output_devices = _get_output_devices()
     if not output_devices:
         return
@@ -179,22 +188,60 @@ def _print_output_devices() -> None:
     for i, d in output_devices:
         print(f"  {i}: {d['name']} (out={d['max_output_channels']})", file=sys.stderr)
 
+def _on_device_change(phase: str, generation: int) -> None:
+    """Close open streams before PortAudio is re-initialized and reopen them after."""
+    global _playback_engine_failed, _capture_device_name
+    engine = _capture_engine
+    if phase == "before":
+        release_playback_engine()
+        if engine is not None and engine.is_running:
+            # Device IDs may be renumbered; remember the name to find it again.
+            info = _device_info(engine.device_id) if engine.device_id is not None else None
+            _capture_device_name = info.get("name") if info else None
+            engine.pause()
+        return
+    _playback_engine_failed = None
+    if engine is None or engine.is_running:
+        return
+    registry = get_device_registry()
+    name = _capture_device_name
+    device_id = registry.find_by_name(name) if name else engine.device_id
+    if name and device_id is None:
+        print(f"Audio-Eingang: '{name}' getrennt, warte auf Wiederanschluss...", file=sys.stderr)
+        return
+    try:
+        engine.resume(device_id, _pick_input_samplerate(device_id, engine.samplerate))
+        print(f"Audio-Eingang: Aufnahme nach Geräteänderung fortgesetzt (ID: {device_id}).", file=sys.stderr)
+    except Exception as e:
+        print(f"Audio-Eingang: Wiederaufnahme fehlgeschlagen ({e})", file=sys.stderr)
+        engine.stop()
+
+def _ensure_hotplug_listener() -> None:
+    global _hotplug_registered
+    if not _hotplug_registered:
+        _hotplug_registered = True
+        get_device_registry().add_listener(_on_device_change)
+
+def _device_wait_sec(name: str) -> float:
+    try:
+        return float(os.getenv(name, "5.0"))
+    except ValueError:
+        return 5.0
+
 def select_input_device(device_spec: str | int | None, announce: bool = True) -> int | None:
     """Select input device; optionally announce list and selection.
 
-    Falls back to first available input device if spec not found.
+    If the spec is not present yet, waits up to INPUT_DEVICE_RETRY_SEC for a
+    hotplug event, then falls back to the first available input device.
     """
     if announce:
         _print_input_devices()
+    registry = get_device_registry()
     device_id = _resolve_device_id(device_spec)
     if device_id is None and device_spec:
-        retry_sec = float(os.getenv("INPUT_DEVICE_RETRY_SEC", "5.0"))
-        retry_interval = float(os.getenv("INPUT_DEVICE_RETRY_INTERVAL", "0.5"))
-        if retry_sec > 0 and retry_interval > 0:
-            deadline = time.time() + retry_sec
-            while time.time() < deadline and device_id is None:
-                time.sleep(retry_interval)
-                device_id = _resolve_device_id(device_spec)
+        device_id = registry.wait_for_device(
+            device_spec, "input", _device_wait_sec("INPUT_DEVICE_RETRY_SEC")
+        )
     if device_id is None:
         input_devices = _get_input_devices()
         if input_devices:
@@ -211,36 +258,29 @@ def select_input_device(device_spec: str | int | None, announce: bool = True) ->
             print("❌ Kein Eingabegerät gefunden.", file=sys.stderr)
             play_error_tone(device=None)
     if announce and device_id is not None:
-        try:
-            dev_info = sd.query_devices(device_id)
+        dev_info = _device_info(device_id)
+        if dev_info is not None:
             print(f"Verwendetes Input-Gerät: {dev_info['name']} (ID: {device_id})", file=sys.stderr)
-        except Exception:
-            pass
     return device_id
 
 def select_output_device(device_spec: str | int | None, announce: bool = True) -> int | None:
     """Select output device; optionally announce list and selection.
 
-    Falls back to first available output device if spec not found.
+    If the spec is not present yet, waits up to OUTPUT_DEVICE_RETRY_SEC for a
+    hotplug event, then falls back to the first available output device.
     """
     if announce:
         _print_output_devices()
+    registry = get_device_registry()
     device_id = _resolve_device_id(device_spec)
-    if device_id is None and device_spec:
-        retry_sec = float(os.getenv("OUTPUT_DEVICE_RETRY_SEC", "5.0"))
-        retry_interval = float(os.getenv("OUTPUT_DEVICE_RETRY_INTERVAL", "0.5"))
-        if retry_sec > 0 and retry_interval > 0:
-            deadline = time.time() + retry_sec
-            while time.time() < deadline and device_id is None:
-                time.sleep(retry_interval)
-                device_id = _resolve_device_id(device_spec)
     if device_id is not None:
-        try:
-            dev_info = sd.query_devices(device_id)
-            if dev_info.get("max_output_channels", 0) <= 0:
-                device_id = None
-        except Exception:
+        dev_info = _device_info(device_id)
+        if dev_info is None or dev_info.get("max_output_channels", 0) <= 0:
             device_id = None
+    if device_id is None and device_spec:
+        device_id = registry.wait_for_device(
+            device_spec, "output", _device_wait_sec("OUTPUT_DEVICE_RETRY_SEC")
+        )
     if device_id is None:
         output_devices = _get_output_devices()
         if output_devices:
@@ -257,66 +297,107 @@ def select_output_device(device_spec: str | int | None, announce: bool = True) -
             print("❌ Kein Ausgabegerät gefunden.", file=sys.stderr)
             play_error_tone(device=None)
     if announce and device_id is not None:
-        try:
-            dev_info = sd.query_devices(device_id)
+        dev_info = _device_info(device_id)
+        if dev_info is not None:
             print(f"Verwendetes Output-Gerät: {dev_info['name']} (ID: {device_id})", file=sys.stderr)
-        except Exception:
-            pass
     return device_id
 
-def play_wav_bytes(wav_bytes: bytes, device: str | int | None = None, announce: bool = True) -> None:
-    """Play WAV audio bytes via the selected output device."""
-    if not wav_bytes:
-        return
-    _mute_output_when_idle(False)
-    device_id = select_output_device(device, announce=announce)
-    with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
-        channels = wf.getnchannels()
-        sampwidth = wf.getsampwidth()
-        samplerate = wf.getframerate()
-        frames = wf.readframes(wf.getnframes())
-
-    if sampwidth != 2:
-        raise ValueError(f"Unsupported sample width: {sampwidth * 8} bits")
-
-    audio = np.frombuffer(frames, dtype=np.int16)
-    if channels > 1:
-        audio = audio.reshape(-1, channels)
-
-    dev_info = None
+def _get_playback_engine(device_id: int | None) -> PlaybackEngine | None:
+    """Return the warm output engine for device_id (None = use per-clip streams)."""
+    global _playback_engine, _playback_engine_failed
+    if os.getenv("PLAYBACK_ENGINE_ENABLED", "true").strip().lower() not in ("1", "true", "yes", "y", "on"):
+        return None
+    _ensure_hotplug_listener()
+    with _playback_engine_lock:
+        engine = _playback_engine
+        if engine is not None and engine.device_id == device_id and engine.is_running:
+            return engine
+        if engine is not None:
+            engine.stop()
+            _playback_engine = None
+        if _playback_engine_failed == (device_id,):
+            return None
+        try:
+            dev_info = _device_info(device_id, "output") or {}
+            samplerate = int(dev_info.get("default_samplerate") or 48000)
+            channels = 2 if dev_info.get("max_output_channels", 0) >= 2 else 1
+            engine = PlaybackEngine(device_id, samplerate, channels)
+            if echo_cancellation_enabled():
+                engine.add_tap(_feed_echo_reference)
+            engine.start()
+        except Exception as e:
+            print(f"Audio-Ausgabe: Dauer-Stream nicht verfügbar ({e}), nutze Einzel-Streams.", file=sys.stderr)
+            _playback_engine_failed = (device_id,)
+            return None
+        _playback_engine = engine
+        _playback_engine_failed = None
+        return engine
+
+def release_playback_engine() -> None:
+    """Close the warm output stream."""
+    global _playback_engine
+    with _playback_engine_lock:
+        if _playback_engine is not None:
+            _playback_engine.stop()
+            _playback_engine = None
+
+def _wait_for_clip(engine: PlaybackEngine, handle, stall_sec: float = 5.0) -> bool:
+    """Wait until the clip has played; False if the output stream stalled.
+
+    Time spent queued behind other clips does not count: while waiting for
+    its turn only a silent callback means a stall, and the clip's own length
+    is timed from its first block.
+    """
+    while not handle.wait_started(0.5):
+        if handle.done:
+            return True
+        if engine.callback_age > stall_sec:
+            return False
+    return handle.wait(handle.frames / engine.samplerate + stall_sec)
+
+def _play_with_engine(engine: PlaybackEngine, audio: np.ndarray, samplerate: int, priority: int) -> None:
+    global _playback_engine
+    if samplerate != engine.samplerate and audio.size > 0:
+        audio = resample_poly(audio, engine.samplerate, samplerate, axis=0).astype(np.int16)
+    handle = engine.enqueue(audio, priority=priority)
+    _playback_active.set()
     try:
-        if device_id is not None:
-            dev_info = sd.query_devices(device_id)
-    except Exception:
-        dev_info = None
+        if not _wait_for_clip(engine, handle):
+            # Stream stalled (device gone?): drop it, the next clip reopens.
+            with _playback_engine_lock:
+                if _playback_engine is engine:
+                    _playback_engine = None
+            engine.stop()
+            raise RuntimeError("Audio-Ausgabe: Wiedergabe hängt, Stream wird neu geöffnet.")
+        if not handle.cancelled:
+            # Let the last block reach the DAC before reporting "done".
+            time.sleep(engine.output_latency)
+    finally:
+        held = _release_playback_active(busy=not engine.is_idle)
+        if not held:
+            _mute_output_when_idle(True)
 
+def _play_with_stream(
+    audio: np.ndarray,
+    samplerate: int,
+    channels: int,
+    device_id: int | None,
+    dev_info: dict | None,
+) -> None:
+    """Fallback: open a dedicated OutputStream for one clip."""
     target_channels = channels
     if dev_info and channels == 1 and dev_info.get("max_output_channels", 0) >= 2:
         target_channels = 2
 
     # If the device rejects the sample rate, resample to a supported rate.
+    registry = get_device_registry()
     target_sr = samplerate
-    try:
-        sd.check_output_settings(
-            device=device_id,
-            samplerate=target_sr,
-            channels=target_channels,
-            dtype="int16",
-        )
-    except sd.PortAudioError:
+    if not registry.supports(device_id, "output", target_sr, target_channels):
         default_sr = int((dev_info or {}).get("default_samplerate") or 48000)
         for sr in (default_sr, 48000, 44100):
-            try:
-                sd.check_output_settings(
-                    device=device_id,
-                    samplerate=sr,
-                    channels=target_channels,
-                    dtype="int16",
-                )
+            if registry.supports(device_id, "output", sr, target_channels):
                 target_sr = sr
                 break
-            except sd.PortAudioError:
-                continue
         else:
             target_sr = default_sr
 
@@ -344,21 +425,93 @@ def play_wav_bytes(wav_bytes: bytes, device: str | int | None = None, announce:
                 audio = np.concatenate([audio, np.zeros((pad_frames, audio.shape[1]), dtype=np.int16)], axis=0)
 
     # Use a dedicated OutputStream to avoid PortAudio crashes on stop/play.
-    stream = sd.OutputStream(
-        device=device_id,
-        samplerate=target_sr,
-        channels=target_channels,
-        dtype="int16",
-    )
-    _playback_active.set()
-    try:
-        stream.start()
-        stream.write(audio)
-    finally:
-        _playback_active.clear()
-        stream.stop()
-        stream.close()
-        _mute_output_when_idle(True)
+    # The session keeps a device re-initialization from running under the stream.
+    with registry.stream_session():
+        stream = sd.OutputStream(
+            device=device_id,
+            samplerate=target_sr,
+            channels=target_channels,
+            dtype="int16",
+        )
+        _playback_active.set()
+        try:
+            stream.start()
+            _feed_echo_reference(audio, target_sr, time.monotonic() + float(stream.latency))
+            stream.write(audio)
+        finally:
+            held = _release_playback_active()
+            stream.stop()
+            stream.close()
+            if not held:
+                _mute_output_when_idle(True)
+
+def _play_audio(
+    audio: np.ndarray,
+    samplerate: int,
+    channels: int,
+    device: str | int | None = None,
+    announce: bool = True,
+    priority: int = PRIORITY_SPEECH,
+) -> None:
+    """Play int16 audio ((frames,) or (frames, channels)) and block until done."""
+    if audio.size == 0:
+        return
+    _mute_output_when_idle(False)
+    device_id = select_output_device(device, announce=announce)
+    engine = _get_playback_engine(device_id)
+    if engine is not None:
+        _play_with_engine(engine, audio, samplerate, priority)
+        return
+
+    dev_info = _device_info(device_id) if device_id is not None else None
+    _play_with_stream(audio, samplerate, channels, device_id, dev_info)
+
+def play_wav_bytes(
+    wav_bytes: bytes,
+    device: str | int | None = None,
+    announce: bool = True,
+    priority: int = PRIORITY_SPEECH,
+) -> None:
+    """Play WAV audio bytes via the selected output device."""
+    if not wav_bytes:
+        return
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+        channels = wf.getnchannels()
+        sampwidth = wf.getsampwidth()
+        samplerate = wf.getframerate()
+        frames = wf.readframes(wf.getnframes())
+
+    if sampwidth != 2:
+        raise ValueError(f"Unsupported sample width: {sampwidth * 8} bits")
+
+    audio = np.frombuffer(frames, dtype=np.int16)
+    if channels > 1:
+        audio = audio.reshape(-1, channels)
+    _play_audio(audio, samplerate, channels, device=device, announce=announce, priority=priority)
+
+def _pick_input_samplerate(
+    device_id: int | None,
+    samplerate: int,
+    channels: int = 1,
+    dtype: str = "int16",
+) -> int:
+    """Return samplerate if the device accepts it, else a supported fallback rate.
+
+    Probes are cached per device by the registry.
+    """
+    registry = get_device_registry()
+    if registry.supports(device_id, "input", samplerate, channels, dtype):
+        return samplerate
+    dev_info = _device_info(device_id, "input") if device_id is not None else None
+    candidates = []
+    default_sr = int((dev_info or {}).get("default_samplerate") or 48000)
+    for sr in (default_sr, 48000, 44100, 16000):
+        if sr not in candidates:
+            candidates.append(sr)
+    for sr in candidates:
+        if registry.supports(device_id, "input", sr, channels, dtype):
+            return sr
+    return samplerate
 
 def record_audio_chunk(
     frames_to_record: int,
@@ -369,46 +522,16 @@ def record_audio_chunk(
 ) -> np.ndarray:
     """Record audio with fallback sample rate and resample to target if needed."""
     target_sr = samplerate
-    actual_sr = target_sr
-    try:
-        sd.check_input_settings(
-            device=device_id,
-            samplerate=target_sr,
+    actual_sr = _pick_input_samplerate(device_id, target_sr, channels=channels, dtype=dtype)
+    with get_device_registry().stream_session():
+        recording = sd.rec(
+            frames_to_record if actual_sr == target_sr else int(actual_sr * (frames_to_record / target_sr)),
+            samplerate=actual_sr,
             channels=channels,
             dtype=dtype,
+            device=device_id,
         )
-    except sd.PortAudioError:
-        dev_info = None
-        try:
-            if device_id is not None:
-                dev_info = sd.query_devices(device_id, "input")
-        except Exception:
-            dev_info = None
-        candidates = []
-        default_sr = int((dev_info or {}).get("default_samplerate") or 48000)
-        for sr in (default_sr, 48000, 44100, 16000):
-            if sr not in candidates:
-                candidates.append(sr)
-        for sr in candidates:
-            try:
-                sd.check_input_settings(
-                    device=device_id,
-                    samplerate=sr,
-                    channels=channels,
-                    dtype=dtype,
-                )
-                actual_sr = sr
-                break
-            except sd.PortAudioError:
-                continue
-    recording = sd.rec(
-        frames_to_record if actual_sr == target_sr else int(actual_sr * (frames_to_record / target_sr)),
-        samplerate=actual_sr,
-        channels=channels,
-        dtype=dtype,
-        device=device_id,
-    )
-    sd.wait()
+        sd.wait()
     # Convert to mono if needed.
     if len(recording.shape) > 1:
         recording = recording[:, 0]
@@ -416,13 +539,69 @@ def record_audio_chunk(
         recording = resample_poly(recording, target_sr, actual_sr).astype(np.int16)
     return recording
 
-def _tone_wav_bytes(
+def get_capture_engine(device_id: int | None, samplerate: int = 16000) -> AudioCaptureEngine:
+    """Return the shared, running capture engine for device_id (opened lazily).
+
+    The microphone stays open for the whole process; frames captured while our
+    own playback is active are flagged so readers can skip them. With
+    ECHO_CANCELLATION the playback is subtracted instead and nothing is flagged.
+    """
+    global _capture_engine
+    _ensure_hotplug_listener()
+    with _capture_lock:
+        engine = _capture_engine
+        if engine is not None and (engine.device_id != device_id or engine.samplerate != samplerate):
+            engine.stop()
+            engine = None
+        if engine is None:
+            try:
+                buffer_sec = float(os.getenv("CAPTURE_BUFFER_SEC", "30"))
+            except ValueError:
+                buffer_sec = 30.0
+            canceller = None
+            if echo_cancellation_enabled():
+                try:
+                    filter_ms = float(os.getenv("ECHO_FILTER_MS", "150"))
+                except ValueError:
+                    filter_ms = 150.0
+                canceller = EchoCanceller(samplerate, filter_ms=filter_ms)
+            engine = AudioCaptureEngine(
+                device_id,
+                samplerate=samplerate,
+                stream_samplerate=_pick_input_samplerate(device_id, samplerate),
+                buffer_sec=buffer_sec,
+                skip_event=None if canceller is not None else _playback_active,
+                echo_canceller=canceller,
+            )
+            _capture_engine = engine
+        if not engine.is_running:
+            engine.stop()
+            engine.start()
+        return engine
+
+def open_capture_reader(device_id: int | None, samplerate: int = 16000) -> CaptureReader | None:
+    """Open a gapless reader on the shared capture engine (None if the device fails)."""
+    try:
+        return get_capture_engine(device_id, samplerate).reader()
+    except Exception as e:
+        print(f"Audio-Fehler beim Öffnen der Daueraufnahme (device={device_id}): {e}", file=sys.stderr)
+        return None
+
+def release_capture_engine() -> None:
+    """Stop the shared capture engine and release the microphone."""
+    global _capture_engine
+    with _capture_lock:
+        if _capture_engine is not None:
+            _capture_engine.stop()
+            _capture_engine = None
+
+def _tone_samples(
     frequency: float = 880.0,
     duration_sec: float = 0.08,
     samplerate: int = 48000,
     volume: float = 0.2,
-) -> bytes:
-    """Generate a short sine beep as WAV bytes."""
+) -> np.ndarray:
+    """Generate a short sine beep as int16 samples."""
     t = np.linspace(0, duration_sec, int(samplerate * duration_sec), endpoint=False)
     wave_data = np.sin(2 * np.pi * frequency * t) * volume
     # Apply short fade-in/out to avoid clicks
@@ -430,15 +609,35 @@ def _tone_wav_bytes(
     fade = np.linspace(0, 1, fade_len)
     wave_data[:fade_len] *= fade
     wave_data[-fade_len:] *= fade[::-1]
-    audio = (wave_data * 32767.0).astype(np.int16)
+    return (wave_data * 32767.0).astype(np.int16)
 
-    buf = io.BytesIO()
-    with wave.open(buf, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(samplerate)
-        wf.writeframes(audio.tobytes())
-    return buf.getvalue()
+def _play_tones(
+    tones: list[tuple[float, float, float]],
+    gap_sec: float,
+    device: str | int | None,
+    announce: bool,
+    samplerate: int = 48000,
+) -> None:
+    """Play (frequency, duration, volume) tones separated by gaps as one clip."""
+    gap = np.zeros(int(samplerate * max(0.0, gap_sec)), dtype=np.int16)
+    parts: list[np.ndarray] = []
+    for i, (frequency, duration_sec, volume) in enumerate(tones):
+        if i:
+            parts.append(gap)
+        parts.append(_tone_samples(frequency, duration_sec, samplerate, volume))
+    if not parts:
+        return
+    try:
+        _play_audio(
+            np.concatenate(parts),
+            samplerate,
+            1,
+            device=device,
+            announce=announce,
+            priority=PRIORITY_STATUS,
+        )
+    except Exception as e:
+        print(f"Beep-Fehler: {e}", file=sys.stderr)
 
 def play_beep_sequence(
     count: int = 2,
@@ -452,41 +651,11 @@ def play_beep_sequence(
     """Play a short double-beep sequence."""
     if count <= 0:
         return
-    beep = _tone_wav_bytes(
-        frequency=frequency,
-        duration_sec=duration_sec,
-        volume=volume,
-    )
-    for i in range(count):
-        try:
-            play_wav_bytes(beep, device=device, announce=announce)
-        except Exception as e:
-            print(f"Beep-Fehler: {e}", file=sys.stderr)
-            break
-        if i < count - 1:
-            time.sleep(gap_sec)
+    _play_tones([(frequency, duration_sec, volume)] * count, gap_sec, device, announce)
 
 def play_hangup_tone(device: str | int | None = None, announce: bool = False) -> None:
     """Play a short descending tone (MS Teams-like hangup)."""
-    play_beep_sequence(
-        count=1,
-        gap_sec=0.0,
-        frequency=740.0,
-        duration_sec=0.08,
-        volume=0.18,
-        device=device,
-        announce=announce,
-    )
-    time.sleep(0.04)
-    play_beep_sequence(
-        count=1,
-        gap_sec=0.0,
-        frequency=520.0,
-        duration_sec=0.1,
-        volume=0.18,
-        device=device,
-        announce=announce,
-    )
+    _play_tones([(740.0, 0.08, 0.18), (520.0, 0.1, 0.18)], 0.04, device, announce)
 
 def play_status_listening(device: str | int | None = None) -> None:
     """Acoustic cue: recognition running."""
@@ -541,37 +710,38 @@ def record_while_pressed(is_pressed_fn, samplerate: int = 16000, device: str | i
             blocksize=int(samplerate * 0.1)  # 0.1 Sekunden Blöcke
         )
     
-    stream = None
-    try:
+    with get_device_registry().stream_session():
+        stream = None
         try:
-            stream = _open_stream(device_id)
-            stream.start()
-        except sd.PortAudioError as e:
-            print(f"Audio-Fehler beim Öffnen InputStream (device={device_id}): {e}", file=sys.stderr)
-            if device_id is not None:
-                # Fallback auf Standardgerät
-                print("Versuche Standardgerät...", file=sys.stderr)
-                time.sleep(0.1)
-                stream = _open_stream(None)
+            try:
+                stream = _open_stream(device_id)
                 stream.start()
-            else:
-                _print_input_devices()
-                raise
+            except sd.PortAudioError as e:
+                print(f"Audio-Fehler beim Öffnen InputStream (device={device_id}): {e}", file=sys.stderr)
+                if device_id is not None:
+                    # Fallback auf Standardgerät
+                    print("Versuche Standardgerät...", file=sys.stderr)
+                    time.sleep(0.1)
+                    stream = _open_stream(None)
+                    stream.start()
+                else:
+                    _print_input_devices()
+                    raise
         
-        # Warte während Taster gedrückt ist
-        while is_pressed_fn():
-            sd.sleep(100)  # 100ms Pause
+            # Warte während Taster gedrückt ist
+            while is_pressed_fn():
+                sd.sleep(100)  # 100ms Pause
         
-        # Kurze Pause um letzten Block zu erfassen
-        sd.sleep(100)
+            # Kurze Pause um letzten Block zu erfassen
+            sd.sleep(100)
         
-    except sd.PortAudioError:
-        _print_input_devices()
-        raise
-    finally:
-        if stream is not None:
-            stream.stop()
-            stream.close()
+        except sd.PortAudioError:
+            _print_input_devices()
+            raise
+        finally:
+            if stream is not None:
+                stream.stop()
+                stream.close()
     
     # Konkateniere alle Frames
     if frames:
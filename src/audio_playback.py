@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import sounddevice as sd
+
+PRIORITY_STATUS = 0
+PRIORITY_SPEECH = 10
+
+
+class PlaybackHandle:
+    """Completion handle for a queued clip."""
+
+    def __init__(self, frames: int) -> None:
+        self.frames = frames
+        self.cancelled = False
+        self._started = threading.Event()
+        self._done = threading.Event()
+
+    @property
+    def started(self) -> bool:
+        """True once the clip's first block went to the device."""
+        return self._started.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait_started(self, timeout: float | None = None) -> bool:
+        return self._started.wait(timeout)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def _finish(self, cancelled: bool = False) -> None:
+        self.cancelled = cancelled
+        self._done.set()
+
+
+class PlaybackEngine:
+    """Keeps one OutputStream open at the device's native rate and plays queued clips.
+
+    Clips are int16 arrays shaped (frames, channels) at ``samplerate``. Lower
+    priority values play first (status tones before speech); clips of equal
+    priority play in FIFO order. A clip that is already playing is never
+    interrupted except by flush(). Taps see every block sent to the device
+    (including silence), e.g. as the echo canceller's reference.
+    """
+
+    def __init__(
+        self,
+        device_id: int | None,
+        samplerate: int,
+        channels: int,
+        latency: str | float = "low",
+    ) -> None:
+        self.device_id = device_id
+        self.samplerate = int(samplerate)
+        self.channels = int(channels)
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._queue: list[tuple[int, int, np.ndarray, PlaybackHandle]] = []
+        self._seq = itertools.count()
+        self._current: Optional[np.ndarray] = None
+        self._current_handle: Optional[PlaybackHandle] = None
+        self._pos = 0
+        self._stream: Optional[sd.OutputStream] = None
+        self._taps: list[Callable[[np.ndarray, int, float], None]] = []
+        self._last_callback = 0.0
+        self.underflows = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._stream is not None and self._stream.active
+
+    @property
+    def output_latency(self) -> float:
+        """Seconds between a frame leaving the callback and reaching the DAC."""
+        try:
+            return float(self._stream.latency) if self._stream is not None else 0.0
+        except Exception:
+            return 0.0
+
+    @property
+    def callback_age(self) -> float:
+        """Seconds since the audio callback last ran (grows while the stream stalls)."""
+        return time.monotonic() - self._last_callback
+
+    @property
+    def is_idle(self) -> bool:
+        with self._lock:
+            return self._current is None and not self._queue
+
+    def start(self) -> None:
+        if self._stream is not None:
+            return
+        stream = sd.OutputStream(
+            device=self.device_id,
+            samplerate=self.samplerate,
+            channels=self.channels,
+            dtype="int16",
+            latency=self.latency,
+            callback=self._callback,
+        )
+        self._last_callback = time.monotonic()
+        stream.start()
+        self._stream = stream
+
+    def stop(self) -> None:
+        self.flush()
+        stream = self._stream
+        self._stream = None
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception:
+                pass
+
+    def add_tap(self, tap: Callable[[np.ndarray, int, float], None]) -> None:
+        """Call tap(block, samplerate, dac_ts) from the audio callback for every output block.
+
+        block is the int16 (frames, channels) buffer handed to PortAudio (copy
+        what you keep); dac_ts is the time.monotonic() at which its first frame
+        reaches the DAC. Taps must be fast and must not block.
+        """
+        if tap not in self._taps:
+            self._taps = self._taps + [tap]
+
+    def remove_tap(self, tap: Callable[[np.ndarray, int, float], None]) -> None:
+        self._taps = [t for t in self._taps if t is not tap]
+
+    def enqueue(self, audio: np.ndarray, priority: int = PRIORITY_SPEECH) -> PlaybackHandle:
+        """Queue a clip (int16, (frames, channels) at the engine rate)."""
+        if audio.ndim == 1:
+            audio = audio.reshape(-1, 1)
+        if audio.shape[1] != self.channels:
+            if audio.shape[1] == 1:
+                audio = np.repeat(audio, self.channels, axis=1)
+            else:
+                audio = audio[:, : self.channels]
+        audio = np.ascontiguousarray(audio, dtype=np.int16)
+        handle = PlaybackHandle(len(audio))
+        if len(audio) == 0:
+            handle._finish()
+            return handle
+        with self._lock:
+            heapq.heappush(self._queue, (priority, next(self._seq), audio, handle))
+        return handle
+
+    def flush(self) -> None:
+        """Drop the playing clip and everything queued."""
+        with self._lock:
+            dropped = [item[3] for item in self._queue]
+            self._queue.clear()
+            if self._current_handle is not None:
+                dropped.append(self._current_handle)
+            self._current = None
+            self._current_handle = None
+            self._pos = 0
+        for handle in dropped:
+            handle._finish(cancelled=True)
+
+    def _callback(self, outdata, frames_count, time_info, status) -> None:
+        self._last_callback = time.monotonic()
+        if status.output_underflow:
+            self.underflows += 1
+        started: list[PlaybackHandle] = []
+        finished: list[PlaybackHandle] = []
+        written = 0
+        with self._lock:
+            while written < frames_count:
+                if self._current is None:
+                    if not self._queue:
+                        break
+                    _, _, self._current, self._current_handle = heapq.heappop(self._queue)
+                    self._pos = 0
+                    started.append(self._current_handle)
+                n = min(frames_count - written, len(self._current) - self._pos)
+                outdata[written:written + n] = self._current[self._pos:self._pos + n]
+                written += n
+                self._pos += n
+                if self._pos >= len(self._current):
+                    finished.append(self._current_handle)
+                    self._current = None
+                    self._current_handle = None
+        if written < frames_count:
+            outdata[written:] = 0
+        taps = self._taps
+        if taps:
+            try:
+                delay = float(time_info.outputBufferDacTime - time_info.currentTime)
+            except Exception:
+                delay = 0.0
+            if delay <= 0:
+                delay = self.output_latency
+            dac_ts = time.monotonic() + delay
+            for tap in taps:
+                try:
+                    tap(outdata, self.samplerate, dac_ts)
+                except Exception:
+                    pass
+        for handle in started:
+            handle._started.set()
+        for handle in finished:
+            handle._finish()
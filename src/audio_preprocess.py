@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import numpy as np
+from scipy.signal import butter, sosfilt, sosfilt_zi
+
+from .audio_frame import AudioFrame
+from .noise_suppression import SpectralNoiseSuppressor
+
+
+class HighPassFilter:
+    """Causal Butterworth high-pass with filter state carried across blocks.
+
+    The SOS coefficients are designed once; consecutive blocks are filtered
+    as one continuous signal, so there are no transients at block edges.
+    """
+
+    def __init__(self, samplerate: int = 16000, cutoff: float = 80.0, order: int = 2) -> None:
+        self.samplerate = int(samplerate)
+        self.cutoff = cutoff
+        self._sos = butter(order, cutoff, btype="highpass", fs=self.samplerate, output="sos")
+        self._zi_unit = sosfilt_zi(self._sos)
+        self._zi = None
+
+    def reset(self) -> None:
+        self._zi = None
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """Filter a float32 block in place and return it."""
+        if x.size == 0:
+            return x
+        if self._zi is None:
+            # Start in steady state for the first sample (no DC step).
+            self._zi = self._zi_unit * x[0]
+        y, self._zi = sosfilt(self._sos, x, zi=self._zi)
+        x[:] = y
+        return x
+
+
+class StreamingAgc:
+    """Smooth automatic gain control with attack/release.
+
+    The level is measured on short frames; the gain moves towards
+    target_rms / level with the attack time constant when it has to drop and
+    the release time constant when it may rise. Below gate_rms the gain is
+    held, so pauses are not amplified into noise. Gains are interpolated per
+    sample between frames, so there are no steps at block boundaries.
+
+    The frame grid runs across calls (an unfinished frame is completed by the
+    next block), so the gain trajectory does not depend on the block size.
+    Output equals one-shot processing when blocks are multiples of the frame
+    length (10 ms); samples of a frame split across two calls get the held
+    gain instead of the ramp, since the frame's level is not known yet.
+    """
+
+    def __init__(
+        self,
+        samplerate: int = 16000,
+        target_rms: float = 0.1,
+        max_gain: float = 10.0,
+        min_gain: float = 0.5,
+        attack_sec: float = 0.02,
+        release_sec: float = 0.5,
+        gate_rms: float = 0.003,
+        frame_ms: int = 10,
+    ) -> None:
+        self.samplerate = int(samplerate)
+        self.target_rms = target_rms
+        self.max_gain = max_gain
+        self.min_gain = min_gain
+        self.gate_rms = gate_rms
+        self.frame_len = max(1, int(self.samplerate * frame_ms / 1000))
+        frame_sec = self.frame_len / self.samplerate
+        self._attack = 1.0 - np.exp(-frame_sec / max(attack_sec, 1e-4))
+        self._release = 1.0 - np.exp(-frame_sec / max(release_sec, 1e-4))
+        self.gain = 1.0
+        # Samples of the unfinished frame (already returned, level pending)
+        self._partial = np.zeros(0, dtype=np.float32)
+
+    def reset(self) -> None:
+        self.gain = 1.0
+        self._partial = np.zeros(0, dtype=np.float32)
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """Apply gain to a float32 block in place and return it."""
+        n = x.size
+        if n == 0:
+            return x
+        head = self._partial.size
+        buf = np.concatenate([self._partial, x]) if head else x
+        n_frames = buf.size // self.frame_len
+        complete = n_frames * self.frame_len
+        self._partial = buf[complete:].copy()
+        levels = np.sqrt(np.mean(buf[:complete].reshape(n_frames, self.frame_len) ** 2, axis=1))
+        gains = np.empty(n_frames + 1, dtype=np.float32)
+        gains[0] = g = self.gain
+        for i, level in enumerate(levels.tolist()):
+            if level >= self.gate_rms:
+                desired = min(self.max_gain, max(self.min_gain, self.target_rms / level))
+                coeff = self._attack if desired < g else self._release
+                g += coeff * (desired - g)
+            gains[i + 1] = g
+        self.gain = g
+        # Per-sample ramp from the previous frame's gain to this frame's gain;
+        # samples past the last complete frame keep its gain (interp clamps).
+        positions = (np.arange(n, dtype=np.float32) + (head + 1.0)) / self.frame_len
+        x *= np.interp(positions, np.arange(n_frames + 1, dtype=np.float32), gains).astype(np.float32)
+        return x
+
+
+class PreprocessChain:
+    """High-pass + optional noise suppression + AGC for one continuous stream.
+
+    Keep one instance per stream; the state carries over between calls.
+    With noise suppression the output trails the input by one STFT hop.
+    """
+
+    def __init__(
+        self,
+        samplerate: int = 16000,
+        highpass_cutoff: float | None = 80.0,
+        agc: bool = True,
+        noise_suppression: bool = False,
+    ) -> None:
+        self.samplerate = int(samplerate)
+        self.highpass = HighPassFilter(samplerate, highpass_cutoff) if highpass_cutoff else None
+        self.denoise = SpectralNoiseSuppressor(samplerate) if noise_suppression else None
+        self.agc = StreamingAgc(samplerate) if agc else None
+
+    def reset(self) -> None:
+        if self.highpass:
+            self.highpass.reset()
+        if self.denoise:
+            self.denoise.reset()
+        if self.agc:
+            self.agc.reset()
+
+    def process(self, frame: AudioFrame, speech: bool | None = None) -> AudioFrame:
+        """Return the processed frame.
+
+        Works in place on the input's float32 buffer (taken over from the
+        frame); the input's int16 samples stay untouched.
+
+        Args:
+            speech: VAD decision for the block, steers the noise estimate
+                (None = frame.vad if present, else the suppressor decides)
+        """
+        if speech is None and frame.vad is not None:
+            speech = frame.vad.is_speech
+        buf = frame.take_float32()
+        if self.highpass:
+            self.highpass.process(buf)
+        if self.denoise:
+            buf = self.denoise.process(buf, speech)
+        if self.agc:
+            self.agc.process(buf)
+        return AudioFrame.from_float(buf, self.samplerate)
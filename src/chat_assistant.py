@@ -1,22 +1,41 @@
 from __future__ import annotations
 
+import atexit
 import threading
+import io
 import json
 import os
 import base64
+import queue
 import time
 import shutil
 import subprocess
-from collections import deque
-from typing import Optional, Callable, Deque, Tuple, List, Dict
+import wave
+from collections import OrderedDict
+from typing import Optional, Callable, Tuple, List, Dict
 
+import numpy as np
 from openai import OpenAI
+from scipy.signal import resample_poly
 
-from .audio_io import play_wav_bytes, play_status_waiting
+from .audio_io import play_wav_bytes, play_status_waiting, playback_generation, playback_session
+from .sentence_detection import SentenceDetector, chatgpt_filter_message
+from .tts_cache import warm_tts_cache
+from .history_store import HistoryStore
+from .openai_client import breaker, call_timeout
+from .local_tts import synthesize_with_fallback
+
+# Spoken when the chat endpoint fails or its circuit breaker is open.
+CHAT_UNAVAILABLE_MESSAGE = "Ich erreiche den Sprachdienst gerade nicht. Bitte versuche es gleich noch einmal."
 
 class ChatAssistant:
     """Send text to ChatGPT and play back the response with TTS."""
 
+    # Decoded history clips kept in memory (most recently played/added).
+    HISTORY_DECODED_ITEMS = 3
+    # Answers waiting for OGG encoding; put() blocks when full.
+    HISTORY_QUEUE_SIZE = 8
+
     def __init__(
         self,
         client: OpenAI,
@@ -31,6 +50,7 @@ class ChatAssistant:
         history_path: str | None = None,
         history_dir: str | None = None,
         history_max: int = 50,
+        stream_responses: bool = False,
     ) -> None:
         self.client = client
         self.model_chat = model_chat
@@ -41,15 +61,33 @@ class ChatAssistant:
         self._on_tts_done = on_tts_done
         self.system_prompt = system_prompt
         self.echo_input_before_chat = echo_input_before_chat
+        self.stream_responses = stream_responses
         self._inflight = False
         self._last_text: Optional[str] = None
         self._lock = threading.Lock()
         self._history_path = history_path or "data/tts_history/index.json"
         self._history_dir = history_dir or os.path.dirname(self._history_path) or "data/tts_history"
         self._history_max = max(1, history_max)
-        self._history: Deque[Tuple[str, str, bytes, str]] = deque()
+        # Index of (question, answer, ogg file); audio is decoded on demand
+        self._history_store: Optional[HistoryStore] = None
+        self._history_wav: "OrderedDict[str, bytes]" = OrderedDict()
+        # Used by the archive worker and the playback path
+        self._history_wav_lock = threading.Lock()
         self._history_seq = 0
         self._load_history()
+        self._archive_queue: "queue.Queue[Tuple[str, str, bytes]]" = queue.Queue(
+            maxsize=self.HISTORY_QUEUE_SIZE
+        )
+        threading.Thread(target=self._archive_worker, daemon=True).start()
+        atexit.register(self.close_history)
+        self.warm_tts_cache(
+            ["Okay, verworfen.", CHAT_UNAVAILABLE_MESSAGE]
+            + [chatgpt_filter_message(reason) for reason in ("leer", "zu_kurz", "trivial_wörter")]
+        )
+
+    def warm_tts_cache(self, phrases: List[str]) -> None:
+        """Pre-synthesize fixed phrases into the TTS cache (background)."""
+        warm_tts_cache(phrases, self.model_tts, self.tts_voice, self._tts_request)
 
     def set_on_tts_done(self, callback: Optional[Callable[[], None]]) -> None:
         self._on_tts_done = callback
@@ -104,39 +142,209 @@ class ChatAssistant:
                 self._tts_play(text, notify=False)
             system_prompt = (system_prompt_override or self.system_prompt).strip() or self.system_prompt
             play_status_waiting(device=self.audio_output_device)
-            chat = self.client.chat.completions.create(
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": text},
+            ]
+            if self.stream_responses:
+                self._run_streaming(text, messages)
+                return
+            chat = breaker("chat").call(
+                self.client.chat.completions.create,
                 model=self.model_chat,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": text},
-                ],
+                messages=messages,
+                timeout=call_timeout("chat"),
             )
             answer = (chat.choices[0].message.content or "").strip()
             if not answer:
                 return
             print(f"ChatGPT: {answer}")
             wav_bytes = self._tts_synthesize(answer)
-            self._append_history(text, answer, wav_bytes)
-            self._save_history()
+            self._archive_history(text, answer, wav_bytes)
             self._play_wav_bytes(wav_bytes)
         except Exception as e:
             print(f"ChatGPT-Fehler: {e}")
+            try:
+                self._tts_play(CHAT_UNAVAILABLE_MESSAGE)
+            except Exception as tts_error:
+                print(f"TTS-Fehler: {tts_error}")
         finally:
             with self._lock:
                 self._inflight = False
 
+    def _run_streaming(self, question: str, messages: List[Dict[str, str]]) -> None:
+        """Stream the answer and speak it sentence by sentence.
+
+        Sentence N+1 is synthesized while sentence N is playing. stop_playback()
+        drops the sentences that have not been played yet.
+        """
+        generation = playback_generation()
+        sentences: "queue.Queue[Optional[str]]" = queue.Queue()
+        clips: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=2)
+        spoken: List[bytes] = []
+        errors: List[Exception] = []
+
+        def _synthesize() -> None:
+            try:
+                while True:
+                    sentence = sentences.get()
+                    if sentence is None:
+                        break
+                    if playback_generation() != generation:
+                        continue
+                    clips.put(self._tts_synthesize(sentence))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                clips.put(None)
+
+        def _play() -> None:
+            wav_bytes = clips.get()
+            if wav_bytes is None:
+                return
+            # Keep playback marked active in the gaps between sentences.
+            with playback_session():
+                while wav_bytes is not None:
+                    if playback_generation() == generation and not errors:
+                        try:
+                            self._play_wav_bytes(wav_bytes, notify=False)
+                            spoken.append(wav_bytes)
+                        except Exception as e:
+                            errors.append(e)
+                    wav_bytes = clips.get()
+
+        synth_thread = threading.Thread(target=_synthesize, daemon=True)
+        play_thread = threading.Thread(target=_play, daemon=True)
+        synth_thread.start()
+        play_thread.start()
+
+        detector = SentenceDetector()
+        parts: List[str] = []
+        pending = ""
+        try:
+            stream = breaker("chat").call(
+                self.client.chat.completions.create,
+                model=self.model_chat,
+                messages=messages,
+                stream=True,
+                timeout=call_timeout("chat"),
+            )
+            for event in stream:
+                if not event.choices:
+                    continue
+                delta = event.choices[0].delta.content or ""
+                if not delta:
+                    continue
+                parts.append(delta)
+                ready, pending = self._split_complete_sentences(detector, pending + delta)
+                if ready:
+                    print(f"ChatGPT: {ready}")
+                    sentences.put(ready)
+                if playback_generation() != generation:
+                    break
+            pending = pending.strip()
+            if pending and playback_generation() == generation:
+                print(f"ChatGPT: {pending}")
+                sentences.put(pending)
+        finally:
+            sentences.put(None)
+            synth_thread.join()
+            play_thread.join()
+
+        if errors:
+            raise errors[0]
+        answer = "".join(parts).strip()
+        if not answer or not spoken:
+            return
+        wav_bytes = self._concat_wav_bytes(spoken)
+        if wav_bytes:
+            self._archive_history(question, answer, wav_bytes)
+        else:
+            print("Historie: Audioformate nicht kombinierbar, Antwort wird nicht archiviert.")
+        if self._on_tts_done:
+            try:
+                self._on_tts_done()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _split_complete_sentences(detector: SentenceDetector, text: str) -> Tuple[str, str]:
+        """Split streamed text into (complete sentences, remainder).
+
+        The last detected sentence is held back because more tokens may follow,
+        and a cut is only made where whitespace follows the sentence end (so
+        "z.B." arriving in pieces is not split).
+        """
+        text = text.lstrip()
+        found = detector.detect_sentences(text)
+        for sentence in reversed(found[:-1]):
+            cut = sentence.end_pos
+            if cut < len(text) and text[cut].isspace():
+                return text[:cut].strip(), text[cut:]
+        return "", text
+
+    @staticmethod
+    def _concat_wav_bytes(clips: List[bytes]) -> bytes:
+        """Join WAV clips into one WAV in the first clip's format.
+
+        Clips in another format (e.g. local TTS sentences between OpenAI
+        ones) are converted. Returns b"" if there is nothing to join or a
+        clip cannot be converted (only 16-bit PCM is).
+        """
+        if len(clips) == 1:
+            return clips[0]
+        params = None
+        frames: List[bytes] = []
+        for clip in clips:
+            with wave.open(io.BytesIO(clip), "rb") as wf:
+                clip_params = (wf.getnchannels(), wf.getsampwidth(), wf.getframerate())
+                data = wf.readframes(wf.getnframes())
+            if params is None:
+                params = clip_params
+            elif clip_params != params:
+                if clip_params[1] != 2 or params[1] != 2:
+                    return b""
+                data = ChatAssistant._convert_pcm16(data, clip_params, params)
+            frames.append(data)
+        if params is None:
+            return b""
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as wf:
+            wf.setnchannels(params[0])
+            wf.setsampwidth(params[1])
+            wf.setframerate(params[2])
+            wf.writeframes(b"".join(frames))
+        return buf.getvalue()
+
+    @staticmethod
+    def _convert_pcm16(data: bytes, src: Tuple[int, int, int], dst: Tuple[int, int, int]) -> bytes:
+        """Convert 16-bit PCM frames from (channels, width, rate) src to dst."""
+        audio = np.frombuffer(data, dtype=np.int16).reshape(-1, src[0]).astype(np.float32)
+        if src[0] != dst[0]:
+            audio = np.repeat(audio.mean(axis=1, keepdims=True), dst[0], axis=1)
+        if src[2] != dst[2] and len(audio):
+            audio = resample_poly(audio, dst[2], src[2], axis=0)
+        return np.clip(audio, -32768, 32767).astype(np.int16).tobytes()
+
     def _tts_play(self, text: str, notify: bool = True) -> None:
         wav_bytes = self._tts_synthesize(text)
         self._play_wav_bytes(wav_bytes, notify=notify)
 
     def _tts_synthesize(self, text: str) -> bytes:
-        speech = self.client.audio.speech.create(
-            model=self.model_tts,
-            voice=self.tts_voice,
-            input=text,
-            response_format="wav",
-        )
-        return speech.read()
+        return synthesize_with_fallback(text, self.model_tts, self.tts_voice, self._tts_request)
+
+    def _tts_request(self, text: str) -> bytes:
+        def _request() -> bytes:
+            speech = self.client.audio.speech.create(
+                model=self.model_tts,
+                voice=self.tts_voice,
+                input=text,
+                response_format="wav",
+                timeout=call_timeout("tts"),
+            )
+            return speech.read()
+
+        return breaker("tts").call(_request)
 
     def _play_wav_bytes(self, wav_bytes: bytes, notify: bool = True) -> None:
         announce = self._announce_output
@@ -150,83 +358,135 @@ class ChatAssistant:
 
     def play_history(self, index: int) -> bool:
         """Play a previous answer by 1-based index (1 = most recent)."""
-        if index <= 0:
+        if index <= 0 or not self._history_store:
             return False
-        if not self._history:
+        entry = self._history_store.get(index)
+        if not entry:
             return False
-        if index > len(self._history):
+        question, answer, ogg_rel = entry
+        wav_bytes = self._history_clip(ogg_rel)
+        if not wav_bytes:
             return False
-        question, answer, wav_bytes, _ = list(self._history)[-index]
         if question:
             print(f"Historie {index} (Frage): {question}")
         print(f"Historie {index} (Antwort): {answer}")
         self._play_wav_bytes(wav_bytes)
         return True
 
-    def _load_history(self) -> None:
-        try:
-            if not os.path.exists(self._history_path):
-                print("Historie: 0 Aufnahmen vorhanden.")
-                return
-            with open(self._history_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                print("Historie: 0 Aufnahmen vorhanden.")
-                return
-            for item in data[-self._history_max:]:
-                if not isinstance(item, dict):
-                    continue
-                text = (item.get("text") or "").strip()
-                question = (item.get("question") or "").strip()
-                ogg_rel = (item.get("ogg_path") or "").strip()
-                if not text or not ogg_rel:
-                    # Backward-compat: older JSON with base64 WAV
-                    wav_b64 = (item.get("wav_b64") or "").strip()
-                    if not text or not wav_b64:
-                        continue
-                    try:
-                        wav_bytes = base64.b64decode(wav_b64.encode("ascii"))
-                    except Exception:
-                        continue
-                    ogg_rel = self._write_ogg(wav_bytes)
-                    if not ogg_rel:
-                        continue
-                    self._history.append((question, text, wav_bytes, ogg_rel))
-                    continue
-                ogg_path = os.path.join(self._history_dir, ogg_rel)
-                wav_bytes = self._decode_ogg_to_wav(ogg_path)
-                if not wav_bytes:
-                    continue
-                self._history.append((question, text, wav_bytes, ogg_rel))
-            print(f"Historie: {len(self._history)} Aufnahme(n) vorhanden.")
-        except Exception as e:
-            print(f"Historie laden fehlgeschlagen: {e}")
+    def _history_db_path(self) -> str:
+        return os.path.splitext(self._history_path)[0] + ".sqlite3"
 
-    def _save_history(self) -> None:
+    def _load_history(self) -> None:
         try:
             os.makedirs(os.path.dirname(self._history_path) or ".", exist_ok=True)
             os.makedirs(self._history_dir, exist_ok=True)
-            data: List[Dict[str, str]] = []
-            for question, text, wav_bytes, ogg_rel in list(self._history):
-                data.append({
-                    "question": question,
-                    "text": text,
-                    "ogg_path": ogg_rel,
-                })
-            with open(self._history_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False)
+            self._history_store = HistoryStore(self._history_db_path(), max_entries=self._history_max)
+            if self._history_store.count() == 0 and self._history_path.endswith(".json"):
+                self._migrate_json_history()
             self._prune_history_files()
+            print(f"Historie: {self._history_store.count()} Aufnahme(n) vorhanden.")
         except Exception as e:
-            print(f"Historie speichern fehlgeschlagen: {e}")
+            print(f"Historie laden fehlgeschlagen: {e}")
+
+    def _migrate_json_history(self) -> None:
+        """Import the former index.json into the SQLite index (once)."""
+        if not os.path.exists(self._history_path):
+            return
+        with open(self._history_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            return
+        for item in data[-self._history_max:]:
+            if not isinstance(item, dict):
+                continue
+            text = (item.get("text") or "").strip()
+            question = (item.get("question") or "").strip()
+            ogg_rel = (item.get("ogg_path") or "").strip()
+            if not text or not ogg_rel:
+                # Backward-compat: older JSON with base64 WAV
+                wav_b64 = (item.get("wav_b64") or "").strip()
+                if not text or not wav_b64:
+                    continue
+                try:
+                    wav_bytes = base64.b64decode(wav_b64.encode("ascii"))
+                except Exception:
+                    continue
+                ogg_rel = self._write_ogg(wav_bytes)
+                if not ogg_rel:
+                    continue
+            elif not os.path.exists(os.path.join(self._history_dir, ogg_rel)):
+                continue
+            self._history_store.add(question, text, ogg_rel)
+
+    def _archive_history(self, question: str, text: str, wav_bytes: bytes) -> None:
+        """Queue an answer for OGG encoding and indexing off the playback path."""
+        if not self._history_store:
+            return
+        self._archive_queue.put((question, text, wav_bytes))
+
+    def _archive_worker(self) -> None:
+        while True:
+            question, text, wav_bytes = self._archive_queue.get()
+            try:
+                self._append_history(question, text, wav_bytes)
+            except Exception as e:
+                print(f"Historie speichern fehlgeschlagen: {e}")
+            finally:
+                self._archive_queue.task_done()
+
+    def flush_history(self, timeout: float = 30.0) -> bool:
+        """Wait until queued answers are archived. Returns False on timeout."""
+        deadline = time.time() + timeout
+        while self._archive_queue.unfinished_tasks:
+            if time.time() >= deadline:
+                print("Historie: Archivierung nicht abgeschlossen.")
+                return False
+            time.sleep(0.05)
+        return True
+
+    def close_history(self) -> None:
+        """Archive what is still queued, then close the history index."""
+        self.flush_history()
+        store, self._history_store = self._history_store, None
+        if store:
+            store.close()
 
     def _append_history(self, question: str, text: str, wav_bytes: bytes) -> None:
+        if not self._history_store:
+            return
         ogg_rel = self._write_ogg(wav_bytes)
         if not ogg_rel:
             return
-        if len(self._history) >= self._history_max:
-            old = self._history.popleft()
-            self._remove_history_file(old[3])
-        self._history.append((question, text, wav_bytes, ogg_rel))
+        try:
+            pruned = self._history_store.add(question, text, ogg_rel)
+        except Exception as e:
+            print(f"Historie speichern fehlgeschlagen: {e}")
+            self._remove_history_file(ogg_rel)
+            return
+        for old in pruned:
+            with self._history_wav_lock:
+                self._history_wav.pop(old, None)
+            self._remove_history_file(old)
+        self._remember_history_clip(ogg_rel, wav_bytes)
+
+    def _history_clip(self, ogg_rel: str) -> bytes:
+        """Return WAV bytes for a history entry, decoding the OGG on a cache miss."""
+        with self._history_wav_lock:
+            wav_bytes = self._history_wav.get(ogg_rel)
+            if wav_bytes is not None:
+                self._history_wav.move_to_end(ogg_rel)
+                return wav_bytes
+        wav_bytes = self._decode_ogg_to_wav(os.path.join(self._history_dir, ogg_rel))
+        if wav_bytes:
+            self._remember_history_clip(ogg_rel, wav_bytes)
+        return wav_bytes
+
+    def _remember_history_clip(self, ogg_rel: str, wav_bytes: bytes) -> None:
+        with self._history_wav_lock:
+            self._history_wav[ogg_rel] = wav_bytes
+            self._history_wav.move_to_end(ogg_rel)
+            while len(self._history_wav) > self.HISTORY_DECODED_ITEMS:
+                self._history_wav.popitem(last=False)
 
     def _write_ogg(self, wav_bytes: bytes) -> str:
         if not self._ffmpeg_available():
@@ -289,18 +549,14 @@ class ChatAssistant:
             return b""
 
     def _prune_history_files(self) -> None:
+        """Delete tts_*.ogg files missing from the index (e.g. a crash before add())."""
         try:
-            keep = {entry[3] for entry in self._history if entry[3]}
+            keep = self._history_store.ogg_paths()
             for name in os.listdir(self._history_dir):
-                if not name.endswith(".ogg"):
-                    continue
-                if name.startswith("tts_") and name not in keep:
-                    try:
-                        os.remove(os.path.join(self._history_dir, name))
-                    except OSError:
-                        pass
-        except Exception:
-            pass
+                if name.startswith("tts_") and name.endswith(".ogg") and name not in keep:
+                    self._remove_history_file(name)
+        except Exception as e:
+            print(f"Historie: Aufräumen fehlgeschlagen ({e})")
 
     def _remove_history_file(self, ogg_rel: str) -> None:
         if not ogg_rel:
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose breaker is open."""
+
+
+def is_transport_error(error: BaseException) -> bool:
+    """Default outage check: connection problems and timeouts."""
+    return isinstance(error, (OSError, TimeoutError))
+
+
+class CircuitBreaker:
+    """Health of one remote endpoint; short-circuits calls while it is down.
+
+    ``failure_threshold`` consecutive bad calls (errors, or successes slower
+    than ``slo_sec``) open the breaker: call() then raises CircuitOpenError
+    at once instead of waiting for timeouts. While open, ``probe()`` is tried
+    every ``probe_sec`` in a background thread (without a probe the breaker
+    simply waits ``probe_sec``). After that the breaker is half-open: one
+    real call is let through, and its outcome closes or re-opens it.
+    Only errors for which ``is_failure(error)`` is true count (an invalid
+    request says nothing about the endpoint's health); others are re-raised
+    untouched. A threshold of 0 disables the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 2,
+        slo_sec: Optional[float] = None,
+        probe: Optional[Callable[[], Any]] = None,
+        probe_sec: float = 15.0,
+        is_failure: Callable[[BaseException], bool] = is_transport_error,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(0, int(failure_threshold))
+        self.slo_sec = slo_sec
+        self.probe = probe
+        self.probe_sec = max(0.5, probe_sec)
+        self.is_failure = is_failure
+        self.state = self.CLOSED
+        self._lock = threading.Lock()
+        self._bad = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.short_circuits = 0
+        self.opened = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != self.CLOSED
+
+    def allow(self) -> bool:
+        """True if a call may go out now (in half-open state: only one trial call)."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if self.probe is not None or time.monotonic() - self._opened_at < self.probe_sec:
+                    return False
+                self.state = self.HALF_OPEN
+            if self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self, elapsed: float) -> None:
+        with self._lock:
+            self._trial = False
+            if self.slo_sec is None or elapsed <= self.slo_sec:
+                self._bad = 0
+                if self.state != self.CLOSED:
+                    self.state = self.CLOSED
+                    print(f"Verbindung {self.name}: wieder erreichbar.", file=sys.stderr)
+                return
+            self.slow_calls += 1
+            self._bad += 1
+            self._maybe_open(f"langsam ({elapsed:.1f}s)")
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            self._trial = False
+            self.failures += 1
+            self._bad += 1
+            self._maybe_open(str(error) or type(error).__name__)
+
+    def _maybe_open(self, reason: str) -> None:
+        if self.failure_threshold == 0:
+            return
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self._bad >= self.failure_threshold):
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self.opened += 1
+            print(f"Verbindung {self.name}: gestört ({reason}), nutze Ersatz.", file=sys.stderr)
+            if self.probe is not None:
+                threading.Thread(target=self._probe_loop, name=f"probe-{self.name}", daemon=True).start()
+
+    def _probe_loop(self) -> None:
+        while True:
+            time.sleep(self.probe_sec)
+            if self.state != self.OPEN:
+                return
+            try:
+                self.probe()
+            except Exception:
+                continue
+            with self._lock:
+                if self.state == self.OPEN:
+                    self.state = self.HALF_OPEN
+            return
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run fn through the breaker (raises CircuitOpenError while open)."""
+        if not self.allow():
+            self.short_circuits += 1
+            raise CircuitOpenError(f"{self.name} nicht erreichbar")
+        self.calls += 1
+        t0 = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure(e):
+                self.record_failure(e)
+            raise
+        finally:
+            # Whatever happened, a half-open trial call is over.
+            with self._lock:
+                self._trial = False
+        self.record_success(time.monotonic() - t0)
+        return result
+
+    def summary(self) -> str:
+        return (
+            f"{self.name}: {self.state} calls={self.calls} err={self.failures} "
+            f"slow={self.slow_calls} skipped={self.short_circuits} opened={self.opened}x"
+        )
@@ -33,7 +33,11 @@ class Settings:
     # Vosk (lokales Sprachmodell)
     vosk_model_path: str | None
     vosk_model_path_en: str | None  # Englisch
+    vosk_kws_model_path: str | None  # Kleines Modell für Wake-Word-Erkennung
+    vosk_command_model_path: str | None  # Kleines Modell für lokale Kurzbefehle
     live_pause_duration: float
+    live_speculative_stt: bool
+    live_segment_min_sec: float
     wake_phrases: list[str]
     context_phrases: list[str]
     stop_phrases: list[str]
@@ -46,8 +50,10 @@ class Settings:
     chat_system_prompt_new: str
     chat_system_prompt_context: str
     echo_input_before_chat: bool
+    chat_streaming: bool
     echo_input_local_tts: bool
     enable_audio_processing: bool
+    enable_noise_suppression: bool
     vad_rms_threshold: float
     vad_noise_multiplier: float
     vad_noise_alpha: float
@@ -62,6 +68,24 @@ class Settings:
     reject_phrases: list[str]
     vosk_chunk_duration: float
     vosk_pause_duration: float
+    vosk_streaming: bool
+    vosk_stream_chunk_duration: float
+    vosk_pipeline: bool
+    smart_multilang_en_deadline_sec: float
+    stt_upload_format: str
+    stt_trim_silence: bool
+    stt_hedge: bool
+    stt_hedge_local: str
+    stt_hedge_vosk_model: str | None
+    stt_hedge_cloud_delay_sec: float
+    stt_local_fallback: bool
+    openai_keepalive_sec: float
+    openai_timeout_stt_sec: float
+    openai_timeout_chat_sec: float
+    openai_timeout_tts_sec: float
+    openai_breaker_failures: int
+    openai_breaker_slo_sec: float
+    openai_breaker_probe_sec: float
     confirm_timeout_sec: float
     history_path: str
     history_dir: str
@@ -76,6 +100,9 @@ class Settings:
     whisper_cpp_threads: int
     whisper_cpp_temperature: float
     whisper_cpp_extra_args: str | None
+    whisper_cpp_backend: str
+    whisper_cpp_server_bin: str
+    whisper_cpp_server_port: int
     play_input_before_stt: bool
 
 def load_settings() -> Settings:
@@ -96,8 +123,10 @@ def load_settings() -> Settings:
     auto_pause_after_sec = float(os.getenv("AUTO_PAUSE_AFTER_SEC", "10"))
     debug_logs = _get_bool("DEBUG_LOGS", False)
     echo_input_before_chat = _get_bool("ECHO_INPUT_BEFORE_CHAT", True)
+    chat_streaming = _get_bool("CHAT_STREAMING", True)
     echo_input_local_tts = _get_bool("ECHO_INPUT_LOCAL_TTS", True)
     enable_audio_processing = _get_bool("ENABLE_AUDIO_PROCESSING", True)
+    enable_noise_suppression = _get_bool("ENABLE_NOISE_SUPPRESSION", False)
     vad_rms_threshold = float(os.getenv("VAD_RMS_THRESHOLD", "0.01"))
     vad_noise_multiplier = float(os.getenv("VAD_NOISE_MULTIPLIER", "3.0"))
     vad_noise_alpha = float(os.getenv("VAD_NOISE_ALPHA", "0.1"))
@@ -112,6 +141,23 @@ def load_settings() -> Settings:
     reject_phrases = [p.strip().lower() for p in os.getenv("REJECT_PHRASES", "nein,no,falsch,abbruch").split(",") if p.strip()]
     vosk_chunk_duration = float(os.getenv("VOSK_CHUNK_DURATION", "3.0"))
     vosk_pause_duration = float(os.getenv("VOSK_PAUSE_DURATION", "0.9"))
+    vosk_streaming = _get_bool("VOSK_STREAMING", True)
+    vosk_stream_chunk_duration = float(os.getenv("VOSK_STREAM_CHUNK_DURATION", "0.3"))
+    vosk_pipeline = _get_bool("VOSK_PIPELINE", True)
+    smart_multilang_en_deadline_sec = float(os.getenv("SMART_MULTILANG_EN_DEADLINE_SEC", "1.0"))
+    stt_upload_format = os.getenv("STT_UPLOAD_FORMAT", "wav").strip().lower()
+    stt_trim_silence = _get_bool("STT_TRIM_SILENCE", True)
+    stt_hedge = _get_bool("STT_HEDGE", False)
+    stt_hedge_local = os.getenv("STT_HEDGE_LOCAL", "auto").strip().lower()
+    stt_hedge_cloud_delay_sec = float(os.getenv("STT_HEDGE_CLOUD_DELAY_SEC", "0.0"))
+    stt_local_fallback = _get_bool("STT_LOCAL_FALLBACK", True)
+    openai_keepalive_sec = float(os.getenv("OPENAI_KEEPALIVE_SEC", "60"))
+    openai_timeout_stt_sec = float(os.getenv("OPENAI_TIMEOUT_STT_SEC", "15"))
+    openai_timeout_chat_sec = float(os.getenv("OPENAI_TIMEOUT_CHAT_SEC", "30"))
+    openai_timeout_tts_sec = float(os.getenv("OPENAI_TIMEOUT_TTS_SEC", "30"))
+    openai_breaker_failures = int(os.getenv("OPENAI_BREAKER_FAILURES", "2"))
+    openai_breaker_slo_sec = float(os.getenv("OPENAI_BREAKER_SLO_SEC", "8.0"))
+    openai_breaker_probe_sec = float(os.getenv("OPENAI_BREAKER_PROBE_SEC", "15.0"))
     confirm_timeout_sec = float(os.getenv("CONFIRM_TIMEOUT_SEC", "6.0"))
     history_path = os.getenv("HISTORY_PATH", "data/tts_history/index.json")
     history_dir = os.getenv("HISTORY_DIR", "data/tts_history")
@@ -126,6 +172,9 @@ def load_settings() -> Settings:
     whisper_cpp_threads = int(os.getenv("WHISPER_CPP_THREADS", "4"))
     whisper_cpp_temperature = float(os.getenv("WHISPER_CPP_TEMPERATURE", "0.0"))
     whisper_cpp_extra_args = os.getenv("WHISPER_CPP_EXTRA_ARGS") or None
+    whisper_cpp_backend = os.getenv("WHISPER_CPP_BACKEND", "cli").strip().lower()
+    whisper_cpp_server_bin = os.getenv("WHISPER_CPP_SERVER_BIN", "whisper.cpp/server")
+    whisper_cpp_server_port = int(os.getenv("WHISPER_CPP_SERVER_PORT", "8178"))
     play_input_before_stt = _get_bool("PLAY_INPUT_BEFORE_STT", False)
     chat_system_prompt_new = os.getenv(
         "CHAT_SYSTEM_PROMPT_NEW",
@@ -158,7 +207,11 @@ def load_settings() -> Settings:
         
         vosk_model_path=os.getenv("VOSK_MODEL_PATH") or None,
         vosk_model_path_en=os.getenv("VOSK_MODEL_PATH_EN") or None,
+        vosk_kws_model_path=os.getenv("VOSK_KWS_MODEL_PATH") or None,
+        vosk_command_model_path=os.getenv("VOSK_COMMAND_MODEL_PATH") or os.getenv("VOSK_KWS_MODEL_PATH") or None,
         live_pause_duration=float(os.getenv("LIVE_PAUSE_DURATION", "0.9")),
+        live_speculative_stt=_get_bool("LIVE_SPECULATIVE_STT", False),
+        live_segment_min_sec=float(os.getenv("LIVE_SEGMENT_MIN_SEC", "2.0")),
         wake_phrases=wake_phrases,
         context_phrases=context_phrases,
         stop_phrases=stop_phrases,
@@ -171,8 +224,10 @@ def load_settings() -> Settings:
         chat_system_prompt_new=chat_system_prompt_new,
         chat_system_prompt_context=chat_system_prompt_context,
         echo_input_before_chat=echo_input_before_chat,
+        chat_streaming=chat_streaming,
         echo_input_local_tts=echo_input_local_tts,
         enable_audio_processing=enable_audio_processing,
+        enable_noise_suppression=enable_noise_suppression,
         vad_rms_threshold=vad_rms_threshold,
         vad_noise_multiplier=vad_noise_multiplier,
         vad_noise_alpha=vad_noise_alpha,
@@ -187,6 +242,24 @@ def load_settings() -> Settings:
         reject_phrases=reject_phrases,
         vosk_chunk_duration=vosk_chunk_duration,
         vosk_pause_duration=vosk_pause_duration,
+        vosk_streaming=vosk_streaming,
+        vosk_stream_chunk_duration=vosk_stream_chunk_duration,
+        vosk_pipeline=vosk_pipeline,
+        smart_multilang_en_deadline_sec=smart_multilang_en_deadline_sec,
+        stt_upload_format=stt_upload_format,
+        stt_trim_silence=stt_trim_silence,
+        stt_hedge=stt_hedge,
+        stt_hedge_local=stt_hedge_local,
+        stt_hedge_vosk_model=os.getenv("STT_HEDGE_VOSK_MODEL") or None,
+        stt_hedge_cloud_delay_sec=stt_hedge_cloud_delay_sec,
+        stt_local_fallback=stt_local_fallback,
+        openai_keepalive_sec=openai_keepalive_sec,
+        openai_timeout_stt_sec=openai_timeout_stt_sec,
+        openai_timeout_chat_sec=openai_timeout_chat_sec,
+        openai_timeout_tts_sec=openai_timeout_tts_sec,
+        openai_breaker_failures=openai_breaker_failures,
+        openai_breaker_slo_sec=openai_breaker_slo_sec,
+        openai_breaker_probe_sec=openai_breaker_probe_sec,
         confirm_timeout_sec=confirm_timeout_sec,
         history_path=history_path,
         history_dir=history_dir,
@@ -201,5 +274,8 @@ def load_settings() -> Settings:
         whisper_cpp_threads=whisper_cpp_threads,
         whisper_cpp_temperature=whisper_cpp_temperature,
         whisper_cpp_extra_args=whisper_cpp_extra_args,
+        whisper_cpp_backend=whisper_cpp_backend,
+        whisper_cpp_server_bin=whisper_cpp_server_bin,
+        whisper_cpp_server_port=whisper_cpp_server_port,
         play_input_before_stt=play_input_before_stt,
     )
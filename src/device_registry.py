@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import sounddevice as sd
+
+ASOUND_CARDS = "/proc/asound/cards"
+
+
+def match_device_spec(device_spec: str | int | None, devices: list[dict]) -> int | None:
+    """Resolve device specification (name or ID) to device ID.
+
+    Supports:
+    - int or numeric string (device ID)
+    - partial name match
+    - composite match using "token1|token2" (all tokens must match)
+    - key-value match like "card=...;device=..." or "card=... , device=..."
+    """
+    if device_spec is None:
+        return None
+
+    # If it's already an integer, return it
+    if isinstance(device_spec, int):
+        return device_spec
+
+    # Try to parse as integer
+    try:
+        return int(device_spec)
+    except ValueError:
+        pass
+
+    spec = str(device_spec).strip()
+    tokens: list[str] = []
+
+    # Parse key-value spec: card=...;device=...
+    if "card=" in spec.lower() or "device=" in spec.lower():
+        parts = re.split(r"[;,]", spec)
+        kv = {}
+        for part in parts:
+            if "=" in part:
+                k, v = part.split("=", 1)
+                kv[k.strip().lower()] = v.strip()
+        card = kv.get("card")
+        device = kv.get("device")
+        if card:
+            tokens.append(card)
+        if device:
+            tokens.append(device)
+        # If numeric card/device are provided, add hw:card,device token
+        if card and device and card.isdigit() and device.isdigit():
+            tokens.append(f"hw:{card},{device}")
+    elif "|" in spec:
+        tokens = [t.strip() for t in spec.split("|") if t.strip()]
+    else:
+        tokens = [spec]
+
+    # Search by name (case-insensitive partial match for all tokens)
+    tokens_lower = [t.lower() for t in tokens if t]
+    for i, device in enumerate(devices):
+        name = device.get("name", "").lower()
+        if all(token in name for token in tokens_lower):
+            return i
+
+    # Not found, return None (caller may fallback)
+    return None
+
+
+class DeviceRegistry:
+    """Cached PortAudio device list with hotplug detection.
+
+    ``sd.query_devices()``, spec resolution and sample-rate probes are cached
+    until the set of ALSA cards changes. A watcher thread polls
+    /proc/asound/cards; on a change PortAudio is re-initialized (so new devices
+    become visible), the caches are dropped, ``generation`` is bumped and
+    waiters are woken. Listeners get ("before", gen) / ("after", gen) calls so
+    open streams can be closed and reopened around the re-initialization.
+    Streams opened outside the engines must be held in stream_session(): the
+    re-initialization is deferred while one is open, and new ones wait for it.
+    """
+
+    def __init__(self, cards_path: str = ASOUND_CARDS, poll_interval: float = 1.0) -> None:
+        self.cards_path = cards_path
+        self.poll_interval = poll_interval
+        self.generation = 0
+        self._cond = threading.Condition()
+        self._devices: Optional[list[dict]] = None
+        self._resolved: dict[str | int, int | None] = {}
+        self._rates: dict[tuple, bool] = {}
+        self._cards = self._read_cards()
+        self._listeners: list[Callable[[str, int], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._active_streams = 0
+        self._reinit = False
+
+    def _read_cards(self) -> Optional[str]:
+        try:
+            with open(self.cards_path, "r", encoding="utf-8", errors="replace") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @property
+    def can_watch(self) -> bool:
+        return self._cards is not None
+
+    def devices(self) -> list[dict]:
+        """All PortAudio devices (cached until the next refresh)."""
+        with self._cond:
+            if self._devices is None:
+                try:
+                    self._devices = [dict(d) for d in sd.query_devices()]
+                except Exception:
+                    return []
+            return self._devices
+
+    def device(self, device_id: int | None, kind: str | None = None) -> Optional[dict]:
+        """Device info for an ID (None = PortAudio default for kind)."""
+        devices = self.devices()
+        if device_id is None:
+            try:
+                default = sd.default.device
+                device_id = default[1] if kind == "output" else default[0]
+            except Exception:
+                return None
+        if device_id is None or not 0 <= int(device_id) < len(devices):
+            return None
+        return devices[int(device_id)]
+
+    def input_devices(self) -> list[tuple[int, dict]]:
+        return [(i, d) for i, d in enumerate(self.devices()) if d.get("max_input_channels", 0) > 0]
+
+    def output_devices(self) -> list[tuple[int, dict]]:
+        return [(i, d) for i, d in enumerate(self.devices()) if d.get("max_output_channels", 0) > 0]
+
+    def resolve(self, device_spec: str | int | None) -> int | None:
+        if device_spec is None:
+            return None
+        with self._cond:
+            if device_spec in self._resolved:
+                return self._resolved[device_spec]
+        device_id = match_device_spec(device_spec, self.devices())
+        with self._cond:
+            self._resolved[device_spec] = device_id
+        return device_id
+
+    def find_by_name(self, name: str) -> int | None:
+        for i, d in enumerate(self.devices()):
+            if d.get("name") == name:
+                return i
+        return None
+
+    def supports(
+        self,
+        device_id: int | None,
+        kind: str,
+        samplerate: int,
+        channels: int = 1,
+        dtype: str = "int16",
+    ) -> bool:
+        """Cached check_input_settings/check_output_settings probe."""
+        key = (self.generation, device_id, kind, int(samplerate), channels, dtype)
+        with self._cond:
+            if key in self._rates:
+                return self._rates[key]
+        check = sd.check_input_settings if kind == "input" else sd.check_output_settings
+        try:
+            check(device=device_id, samplerate=samplerate, channels=channels, dtype=dtype)
+            ok = True
+        except Exception:
+            ok = False
+        with self._cond:
+            self._rates[key] = ok
+        return ok
+
+    def add_listener(self, listener: Callable[[str, int], None]) -> None:
+        self._listeners.append(listener)
+
+    @contextmanager
+    def stream_session(self) -> Iterator[None]:
+        """Hold while a stream outside the playback/capture engines is open."""
+        with self._cond:
+            self._cond.wait_for(lambda: not self._reinit)
+            self._active_streams += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active_streams -= 1
+                self._cond.notify_all()
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-initialize PortAudio if the card set changed (or force). Returns changed.
+
+        Deferred (returns False, the watcher retries) while a stream_session()
+        is open, since PortAudio must not be terminated under an open stream.
+        """
+        cards = self._read_cards()
+        if not force and cards == self._cards:
+            return False
+        with self._cond:
+            if self._active_streams or self._reinit:
+                return False
+            self._reinit = True
+        try:
+            self._notify("before")
+            with self._cond:
+                self._cards = cards
+                try:
+                    sd._terminate()
+                    sd._initialize()
+                except Exception as e:
+                    print(f"Audio-Geräte: PortAudio-Neustart fehlgeschlagen ({e})", file=sys.stderr)
+                self._devices = None
+                self._resolved.clear()
+                self._rates.clear()
+                self.generation += 1
+                self._cond.notify_all()
+            self._notify("after")
+        finally:
+            with self._cond:
+                self._reinit = False
+                self._cond.notify_all()
+        return True
+
+    def _notify(self, phase: str) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(phase, self.generation)
+            except Exception as e:
+                print(f"Audio-Geräte: Listener-Fehler ({e})", file=sys.stderr)
+
+    def start_watcher(self) -> None:
+        if self._watcher is not None or not self.can_watch or self.poll_interval <= 0:
+            return
+
+        def _watch() -> None:
+            while True:
+                time.sleep(self.poll_interval)
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Audio-Geräte: Aktualisierung fehlgeschlagen ({e})", file=sys.stderr)
+
+        self._watcher = threading.Thread(target=_watch, daemon=True)
+        self._watcher.start()
+
+    def wait_for_device(
+        self,
+        device_spec: str | int | None,
+        kind: str,
+        timeout: float,
+    ) -> int | None:
+        """Resolve spec to a device of kind, waiting up to timeout for hotplug."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            device_id = self.resolve(device_spec)
+            info = self.device(device_id) if device_id is not None else None
+            channels_key = "max_input_channels" if kind == "input" else "max_output_channels"
+            if info is not None and info.get(channels_key, 0) > 0:
+                return device_id
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if not self.can_watch:
+                # No card list to watch: one forced re-scan, then give up.
+                self.refresh(force=True)
+                device_id = self.resolve(device_spec)
+                info = self.device(device_id) if device_id is not None else None
+                if info is not None and info.get(channels_key, 0) > 0:
+                    return device_id
+                return None
+            generation = self.generation
+            with self._cond:
+                self._cond.wait_for(lambda: self.generation != generation, timeout=remaining)
+
+
+_registry: Optional[DeviceRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_device_registry() -> DeviceRegistry:
+    """Return the shared registry (hotplug watcher started on first use)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            try:
+                interval = float(os.getenv("DEVICE_WATCH_INTERVAL_SEC", "1.0"))
+            except ValueError:
+                interval = 1.0
+            _registry = DeviceRegistry(poll_interval=interval)
+            _registry.start_watcher()
+        return _registry
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+from scipy.signal import firwin, lfilter
+
+_SCALE = np.float32(1.0 / 32768.0)
+
+
+class _StreamResampler:
+    """Block-wise resampler without edge effects (FIR low-pass + linear interpolation).
+
+    Filter state and the fractional read position carry over between blocks,
+    so a stream resampled in pieces equals the stream resampled at once.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int) -> None:
+        self.src_rate = int(src_rate)
+        self.dst_rate = int(dst_rate)
+        self._step = self.src_rate / self.dst_rate
+        self._taps = None
+        if self.src_rate > self.dst_rate:
+            self._taps = firwin(31, 0.45 * self.dst_rate, fs=self.src_rate)
+        self.reset()
+
+    def reset(self) -> None:
+        self._zi = np.zeros(30) if self._taps is not None else None
+        self._pos = 0.0  # position of the next output sample, relative to the block start
+        self._last = 0.0
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        if self.src_rate == self.dst_rate or x.size == 0:
+            return x
+        if self._taps is not None:
+            x, self._zi = lfilter(self._taps, 1.0, x, zi=self._zi)
+        n = x.size
+        if self._pos > n - 1:
+            self._pos -= n
+            self._last = float(x[-1])
+            return np.zeros(0, dtype=np.float32)
+        positions = np.arange(self._pos, n - 1 + 1e-9, self._step)
+        # Index -1 (the previous block's last sample) lives at 0 in x_ext.
+        x_ext = np.concatenate([[self._last], x])
+        out = np.interp(positions + 1.0, np.arange(n + 1), x_ext).astype(np.float32)
+        self._pos = float(positions[-1] + self._step - n)
+        self._last = float(x[-1])
+        return out
+
+
+class EchoReference:
+    """Ring of played-back audio on the capture clock (absolute capture frame indices)."""
+
+    def __init__(self, samplerate: int = 16000, buffer_sec: float = 2.0) -> None:
+        self.samplerate = int(samplerate)
+        self._capacity = max(int(self.samplerate * buffer_sec), 1024)
+        self._ring = np.zeros(self._capacity, dtype=np.float32)
+        self._end: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def end(self) -> Optional[int]:
+        """Index after the last written sample (None = nothing written yet)."""
+        with self._lock:
+            return self._end
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ring[:] = 0
+            self._end = None
+
+    def _put(self, samples: np.ndarray, start: int) -> None:
+        pos = start % self._capacity
+        first = min(samples.size, self._capacity - pos)
+        self._ring[pos:pos + first] = samples[:first]
+        if first < samples.size:
+            self._ring[: samples.size - first] = samples[first:]
+
+    def write(self, samples: np.ndarray, start: int) -> None:
+        n = int(samples.size)
+        if n == 0:
+            return
+        if n > self._capacity:
+            samples = samples[-self._capacity:]
+            start += n - self._capacity
+            n = self._capacity
+        with self._lock:
+            if self._end is not None and start > self._end:
+                # Nothing was played in between: the gap is silence.
+                gap = min(start - self._end, self._capacity)
+                self._put(np.zeros(gap, dtype=np.float32), start - gap)
+            self._put(samples, start)
+            self._end = start + n
+
+    def read(self, start: int, frames: int) -> np.ndarray:
+        """Reference for [start, start + frames); zeros where nothing was played."""
+        out = np.zeros(frames, dtype=np.float32)
+        with self._lock:
+            if self._end is None:
+                return out
+            lo = max(start, self._end - self._capacity)
+            hi = min(start + frames, self._end)
+            if hi <= lo:
+                return out
+            pos = lo % self._capacity
+            n = hi - lo
+            first = min(n, self._capacity - pos)
+            out[lo - start:lo - start + first] = self._ring[pos:pos + first]
+            if first < n:
+                out[lo - start + first:hi - start] = self._ring[: n - first]
+        return out
+
+
+class EchoCanceller:
+    """Streaming acoustic echo canceller (partitioned-block frequency-domain NLMS).
+
+    The playback side calls feed_playback() with every block it sends to the
+    DAC; the block is resampled to the capture rate and stored at the capture
+    frame index where it will be heard (via the capture engine's clock, minus a
+    safety margin so the echo never precedes its reference). The capture side
+    calls process() with each microphone block and its absolute frame index;
+    the echo estimated from the reference is subtracted. The filter covers
+    ``filter_ms`` of echo path (including the delay estimate's error).
+
+    Adaptation is held while near-end speech dominates a converged filter
+    (double talk) for up to ``double_talk_hold_sec``, after which an echo path
+    change is assumed. Output is delayed by one block.
+    """
+
+    def __init__(
+        self,
+        samplerate: int = 16000,
+        filter_ms: float = 150.0,
+        block: int = 128,
+        mu: float = 0.5,
+        margin_ms: float = 20.0,
+        reference_sec: float = 2.0,
+        double_talk_hold_sec: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            samplerate: Capture sample rate
+            filter_ms: Echo path length covered by the adaptive filter
+            block: Block length in samples (FFT size is twice that)
+            mu: NLMS step size (0..1)
+            margin_ms: Reference is placed this much earlier than the clock estimate
+            reference_sec: Length of the reference ring
+            double_talk_hold_sec: Longest adaptation freeze during double talk
+        """
+        self.samplerate = int(samplerate)
+        self.block = int(block)
+        self.partitions = max(1, -(-int(self.samplerate * filter_ms / 1000) // self.block))
+        self.mu = mu
+        self.margin = int(self.samplerate * margin_ms / 1000)
+        self.double_talk_hold_blocks = max(1, int(double_talk_hold_sec * self.samplerate / self.block))
+        self.reference = EchoReference(self.samplerate, reference_sec)
+        self._clock: Optional[Callable[[float], int]] = None
+        self._resamplers: dict[int, _StreamResampler] = {}
+        self._next_ref: Optional[int] = None
+        self._feed_lock = threading.Lock()
+        self.reset()
+
+    def attach_clock(self, clock: Callable[[float], int]) -> None:
+        """Set the capture clock: monotonic timestamp -> absolute capture frame index."""
+        self._clock = clock
+
+    def reset(self) -> None:
+        n = self.block
+        self._W = np.zeros((self.partitions, n + 1), dtype=np.complex128)
+        self._X = np.zeros((self.partitions, n + 1), dtype=np.complex128)
+        self._power = np.full(n + 1, 1e-6)
+        self._prev_ref = np.zeros(n, dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._pending_start: Optional[int] = None
+        self._out = np.zeros(n, dtype=np.float32)
+        self._idle_blocks = self.partitions + 1
+        self._hold_blocks = 0
+        self._constrain_next = 0
+        self._d_pow = 0.0
+        self._e_pow = 0.0
+        self.blocks = 0
+        self.adapted_blocks = 0
+        self.cost_sec = 0.0
+
+    @property
+    def latency_sec(self) -> float:
+        return self.block / self.samplerate
+
+    @property
+    def erle_db(self) -> float:
+        """Smoothed echo return loss enhancement while a reference was active."""
+        if self._e_pow <= 0 or self._d_pow <= 0:
+            return 0.0
+        return float(10.0 * np.log10(self._d_pow / self._e_pow))
+
+    @property
+    def realtime_factor(self) -> float:
+        audio_sec = self.blocks * self.block / self.samplerate
+        return self.cost_sec / audio_sec if audio_sec else 0.0
+
+    # -- playback side -------------------------------------------------
+
+    def feed_playback(self, audio: np.ndarray, samplerate: int, dac_ts: float) -> None:
+        """Store a played block (int16, (frames,) or (frames, channels)) as reference.
+
+        Args:
+            dac_ts: time.monotonic() at which the block's first frame reaches the DAC
+        """
+        if self._clock is None or audio.size == 0:
+            return
+        mono = audio.mean(axis=1) if audio.ndim > 1 else audio.astype(np.float32)
+        mono = mono.astype(np.float32) * _SCALE
+        with self._feed_lock:
+            resampler = self._resamplers.get(int(samplerate))
+            if resampler is None:
+                resampler = self._resamplers[int(samplerate)] = _StreamResampler(samplerate, self.samplerate)
+            ref = resampler.process(mono)
+            measured = self._clock(dac_ts) - self.margin
+            # Stay contiguous while playback runs; re-anchor on jumps (underflow, restart).
+            if self._next_ref is None or abs(measured - self._next_ref) > self.margin:
+                self._next_ref = measured
+            self.reference.write(ref, self._next_ref)
+            self._next_ref += ref.size
+
+    # -- capture side --------------------------------------------------
+
+    def process(self, mono: np.ndarray, start_index: int) -> np.ndarray:
+        """Cancel the echo in an int16 microphone block; returns int16 of the same length.
+
+        Args:
+            start_index: Absolute capture frame index of mono[0]
+        """
+        n_in = int(mono.size)
+        if n_in == 0:
+            return mono
+        t0 = time.perf_counter()
+        d_new = mono.astype(np.float32) * _SCALE
+        if self._pending_start is None or self._pending_start + self._pending.size != start_index:
+            # First block or a gap in the capture stream: restart the block grid.
+            self._pending = d_new
+            self._pending_start = start_index
+        else:
+            self._pending = np.concatenate([self._pending, d_new])
+        n = self.block
+        k = self._pending.size // n
+        outputs = [self._out]
+        for b in range(k):
+            d = self._pending[b * n:(b + 1) * n]
+            outputs.append(self._process_block(d, self._pending_start + b * n))
+        self._pending = self._pending[k * n:]
+        self._pending_start += k * n
+        out = np.concatenate(outputs)
+        self._out = out[n_in:]
+        self.cost_sec += time.perf_counter() - t0
+        self.blocks += k
+        return (np.clip(out[:n_in], -1.0, 32767.0 / 32768.0) * 32768.0).astype(np.int16)
+
+    def _process_block(self, d: np.ndarray, index: int) -> np.ndarray:
+        n = self.block
+        r = self.reference.read(index, n)
+        if r.any():
+            self._idle_blocks = 0
+        else:
+            self._idle_blocks += 1
+        if self._idle_blocks > self.partitions:
+            # No reference within the filter length: nothing to cancel.
+            self._prev_ref = r
+            return d
+        X = np.fft.rfft(np.concatenate([self._prev_ref, r]))
+        self._prev_ref = r
+        self._X[1:] = self._X[:-1]
+        self._X[0] = X
+        Y = np.einsum("pk,pk->k", self._W, self._X)
+        y = np.fft.irfft(Y, 2 * n)[n:]
+        e = d - y
+        d_pow = float(np.dot(d, d))
+        e_pow = float(np.dot(e, e))
+        if e_pow > 4.0 * d_pow + 1e-9:
+            # Diverged: start over rather than adding noise.
+            self._W[:] = 0
+            return d
+        self._d_pow = 0.95 * self._d_pow + 0.05 * d_pow
+        self._e_pow = 0.95 * self._e_pow + 0.05 * e_pow
+        self._power = 0.9 * self._power + 0.1 * (X.real ** 2 + X.imag ** 2)
+        converged = self.erle_db > 6.0
+        double_talk = converged and e_pow > 0.5 * d_pow
+        if double_talk and self._hold_blocks < self.double_talk_hold_blocks:
+            self._hold_blocks += 1
+            return e
+        self._hold_blocks = 0
+        E = np.fft.rfft(np.concatenate([np.zeros(n), e]))
+        self._W += (self.mu / self.partitions) * np.conj(self._X) * (E / (self._power + 1e-6))
+        # Gradient constraint (zero the circular part), one partition per block.
+        p = self._constrain_next
+        w = np.fft.irfft(self._W[p], 2 * n)
+        w[n:] = 0
+        self._W[p] = np.fft.rfft(w)
+        self._constrain_next = (p + 1) % self.partitions
+        self.adapted_blocks += 1
+        return e
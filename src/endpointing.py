@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+from .audio_frame import AudioFrame
+from .vad import VoiceActivityDetector
+
+UTTERANCE_START = "start"
+UTTERANCE_END = "end"
+
+
+@dataclass(frozen=True)
+class EndpointEvent:
+    kind: str  # UTTERANCE_START or UTTERANCE_END
+    frame: int  # absolute sample index since the last reset
+    time_sec: float  # frame / samplerate
+
+
+class Endpointer:
+    """Streaming utterance endpointer working on 10-30 ms frames.
+
+    Audio of any length is cut into the detector's frames (leftovers are
+    carried to the next call) and classified by a VoiceActivityDetector. An
+    utterance starts after ``start_sec`` of consecutive speech and ends once
+    ``pause_duration`` of silence follows the last speech frame,
+    independently of how the caller chunks the audio for STT.
+    """
+
+    def __init__(
+        self,
+        detector: Optional[VoiceActivityDetector] = None,
+        pause_duration: float = 0.6,
+        start_sec: float = 0.06,
+    ) -> None:
+        """
+        Args:
+            detector: Frame classifier (None = RMS-only defaults at 16 kHz)
+            pause_duration: Silence after the last speech frame that ends an utterance
+            start_sec: Consecutive speech needed to start an utterance
+        """
+        self.detector = detector or VoiceActivityDetector(use_webrtcvad=False)
+        self.samplerate = self.detector.samplerate
+        self.frame_ms = self.detector.frame_ms
+        self.frame_len = self.detector.frame_len
+        self.pause_duration = max(float(pause_duration), self.frame_ms / 1000.0)
+        self.start_frames = max(1, int(round(start_sec * 1000 / self.frame_ms)))
+        self.reset()
+
+    def reset(self) -> None:
+        self.in_speech = False
+        self.speech_start: Optional[int] = None
+        self.speech_end: Optional[int] = None
+        self.detector.reset()
+        self._pos = 0
+        self._pending = AudioFrame(None, self.samplerate)
+        self._run = 0
+        self._run_start = 0
+        self._silence_frames = 0
+
+    @property
+    def position(self) -> int:
+        """Absolute index of the next frame to be classified."""
+        return self._pos
+
+    @property
+    def silence_sec(self) -> float:
+        """Silence since the last speech frame of the current utterance."""
+        return self._silence_frames * self.frame_ms / 1000.0
+
+    def _event(self, kind: str, frame: int) -> EndpointEvent:
+        return EndpointEvent(kind, frame, frame / self.samplerate)
+
+    def process(self, audio: np.ndarray | AudioFrame) -> list[EndpointEvent]:
+        """Classify the next audio (int16 mono or AudioFrame) and return utterance events."""
+        frame = audio if isinstance(audio, AudioFrame) else AudioFrame(audio, self.samplerate)
+        # Convert once on the caller's frame so later joins reuse the float32 data.
+        frame.float32
+        if len(self._pending):
+            frame = AudioFrame.concat([self._pending, frame])
+        n_frames = len(frame) // self.frame_len
+        complete = n_frames * self.frame_len
+        # Copy the short leftover: the block's buffers may be reused in place later.
+        self._pending = frame.slice(complete).copy()
+        if n_frames == 0:
+            return []
+        result = self.detector.analyze(frame.slice(0, complete), in_speech=self.in_speech)
+        events: list[EndpointEvent] = []
+        for speech in result.mask.tolist():
+            start = self._pos
+            self._pos += self.frame_len
+            if speech:
+                self._silence_frames = 0
+                self.speech_end = self._pos
+                if self.in_speech:
+                    continue
+                if self._run == 0:
+                    self._run_start = start
+                self._run += 1
+                if self._run >= self.start_frames:
+                    self.in_speech = True
+                    self.speech_start = self._run_start
+                    self._run = 0
+                    events.append(self._event(UTTERANCE_START, self.speech_start))
+                continue
+            self._run = 0
+            if not self.in_speech:
+                continue
+            self._silence_frames += 1
+            if self.silence_sec >= self.pause_duration:
+                self.in_speech = False
+                self._silence_frames = 0
+                events.append(self._event(UTTERANCE_END, self.speech_end or self._pos))
+        return events
+
+
+def read_until_endpoint(
+    reader: Any,
+    frames: int,
+    endpointer: Endpointer,
+    block_sec: float = 0.1,
+) -> tuple[AudioFrame, list[EndpointEvent]]:
+    """Read up to `frames` from a CaptureReader, stopping early at an utterance end.
+
+    Audio is pulled in short blocks so the end of speech is noticed after
+    about pause_duration even when `frames` spans several seconds.
+    """
+    block = max(endpointer.frame_len, int(endpointer.samplerate * block_sec))
+    parts: list[AudioFrame] = []
+    events: list[EndpointEvent] = []
+    got = 0
+    while got < frames:
+        part = AudioFrame(reader.read(min(block, frames - got)), endpointer.samplerate)
+        if not len(part):
+            break
+        parts.append(part)
+        got += len(part)
+        new_events = endpointer.process(part)
+        events.extend(new_events)
+        if any(e.kind == UTTERANCE_END for e in new_events):
+            break
+    return AudioFrame.concat(parts, endpointer.samplerate), events
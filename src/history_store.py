@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Set, Tuple
+
+
+class HistoryStore:
+    """SQLite index of spoken answers (question, answer, OGG file).
+
+    Every new answer is one INSERT plus an index-driven DELETE of entries
+    beyond max_entries, so the cost per answer does not grow with the history
+    size. Writes are transactional (WAL journal), so a crash leaves the
+    previous state intact.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 50) -> None:
+        self.db_path = db_path
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created REAL NOT NULL,
+                    question TEXT NOT NULL DEFAULT '',
+                    answer TEXT NOT NULL,
+                    ogg_path TEXT NOT NULL
+                )
+                """
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM history").fetchone()
+        return int(row[0]) if row else 0
+
+    def add(self, question: str, answer: str, ogg_path: str) -> List[str]:
+        """Append an entry; returns the OGG files of entries pruned by max_entries."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO history (created, question, answer, ogg_path) VALUES (?, ?, ?, ?)",
+                (time.time(), question or "", answer, ogg_path),
+            )
+            return self._prune_locked()
+
+    def get(self, index: int) -> Optional[Tuple[str, str, str]]:
+        """Return (question, answer, ogg_path) by 1-based index (1 = most recent)."""
+        if index <= 0:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT question, answer, ogg_path FROM history ORDER BY id DESC LIMIT 1 OFFSET ?",
+                (index - 1,),
+            ).fetchone()
+        return (row[0], row[1], row[2]) if row else None
+
+    def ogg_paths(self) -> Set[str]:
+        """OGG files referenced by the index."""
+        with self._lock:
+            return {r[0] for r in self._conn.execute("SELECT ogg_path FROM history")}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _prune_locked(self) -> List[str]:
+        row = self._conn.execute(
+            "SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?",
+            (self.max_entries - 1,),
+        ).fetchone()
+        if not row:
+            return []
+        cutoff = row[0]
+        pruned = [
+            r[0]
+            for r in self._conn.execute("SELECT ogg_path FROM history WHERE id < ?", (cutoff,))
+        ]
+        if pruned:
+            self._conn.execute("DELETE FROM history WHERE id < ?", (cutoff,))
+        return pruned
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import io
+import json
+import re
+import sys
+import threading
+import wave
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+def normalize_phrase(text: str) -> str:
+    """Lower-case, letters/digits only, single spaces (same rules as the command check)."""
+    text = re.sub(r"[^a-z0-9äöüß ]+", " ", (text or "").lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+_models: dict[str, object] = {}
+
+
+def load_grammar_model(model_path: str | None):
+    """Load a small Vosk model for grammar recognition (None if unset or unavailable).
+
+    Models are cached per path, so the wake-word and command stages share one.
+    """
+    if not model_path:
+        return None
+    path = Path(model_path)
+    key = str(path.resolve())
+    if key in _models:
+        return _models[key]
+    if not path.exists():
+        print(f"Grammatik-Erkennung: Modell nicht gefunden ({path}), nutze volle Erkennung.", file=sys.stderr)
+        return None
+    try:
+        from vosk import Model, SetLogLevel
+
+        SetLogLevel(-1)
+        model = Model(str(path))
+    except Exception as e:
+        print(f"Grammatik-Erkennung: Modell nicht ladbar ({e}), nutze volle Erkennung.", file=sys.stderr)
+        return None
+    _models[key] = model
+    return model
+
+
+# "historie N" number words; canonical spellings first, then variants STT may return.
+HISTORY_NUMBER_WORDS = {
+    "eins": 1,
+    "zwei": 2,
+    "drei": 3,
+    "vier": 4,
+    "fünf": 5,
+    "sechs": 6,
+    "sieben": 7,
+    "acht": 8,
+    "neun": 9,
+    "zehn": 10,
+    "ein": 1,
+    "fuenf": 5,
+}
+
+
+def history_phrases() -> list[str]:
+    """Grammar phrases "historie eins" .. "historie zehn" (canonical word per index)."""
+    words: dict[int, str] = {}
+    for word, index in HISTORY_NUMBER_WORDS.items():
+        words.setdefault(index, word)
+    return [f"historie {words[i]}" for i in sorted(words)]
+
+
+def _grammar_phrases(phrases: Iterable[str]) -> list[str]:
+    # Longest first, so "ok google weiter" wins over "ok google".
+    return sorted({normalize_phrase(p) for p in phrases if normalize_phrase(p)}, key=len, reverse=True)
+
+
+class KeywordSpotter:
+    """Wake-word stage: a Vosk recognizer restricted to a small phrase grammar.
+
+    The decoder only has to choose between the given phrases and ``[unk]``,
+    which costs a fraction of a large-vocabulary decode. Use a small model
+    with a runtime graph (e.g. vosk-model-small-de); large models ignore the
+    grammar. Phrases whose words are not in the model's vocabulary can not
+    be spotted.
+    """
+
+    # 4000 Frames * 2 bytes (int16) = ~0.25 Sekunden pro AcceptWaveform
+    FEED_BYTES = 4000 * 2
+
+    def __init__(self, model, phrases: Iterable[str], samplerate: int = 16000) -> None:
+        from vosk import KaldiRecognizer
+
+        self.samplerate = samplerate
+        self.phrases = _grammar_phrases(phrases)
+        grammar = json.dumps(self.phrases + ["[unk]"], ensure_ascii=False)
+        self._rec = KaldiRecognizer(model, samplerate, grammar)
+        self._rec.SetWords(False)
+        self.active = False
+
+    def match(self, text: str) -> Optional[str]:
+        padded = f" {normalize_phrase(text)} "
+        for phrase in self.phrases:
+            if f" {phrase} " in padded:
+                return phrase
+        return None
+
+    def feed(self, audio: np.ndarray | bytes) -> Optional[str]:
+        """Feed int16 mono audio; return the spotted phrase (the decoder is reset then)."""
+        if isinstance(audio, np.ndarray):
+            audio = audio.astype(np.int16, copy=False).tobytes()
+        if not audio:
+            return None
+        self.active = True
+        for i in range(0, len(audio), self.FEED_BYTES):
+            if self._rec.AcceptWaveform(audio[i:i + self.FEED_BYTES]):
+                text = json.loads(self._rec.Result()).get("text", "")
+            else:
+                # Partial results let the wake word through before the pause.
+                text = json.loads(self._rec.PartialResult()).get("partial", "")
+            phrase = self.match(text)
+            if phrase:
+                self.reset()
+                return phrase
+        return None
+
+    def finish(self) -> Optional[str]:
+        """End of utterance: flush the decoder and return a phrase found in the final result."""
+        phrase = self.match(json.loads(self._rec.FinalResult()).get("text", "")) if self.active else None
+        self.reset()
+        return phrase
+
+    def reset(self) -> None:
+        self._rec.Reset()
+        self.active = False
+
+
+class CommandRecognizer:
+    """Local recognizer for short commands (ja/nein, stopp, historie N, ...).
+
+    Decodes a finished utterance against a grammar of the given phrases plus
+    ``[unk]``. Only a result made of known phrases with word confidence of
+    at least ``min_conf`` is accepted; anything else (or audio longer than
+    ``max_sec``) returns None, and the caller uses the full transcription.
+    """
+
+    def __init__(
+        self,
+        model,
+        phrases: Iterable[str],
+        samplerate: int = 16000,
+        min_conf: float = 0.6,
+        max_sec: float = 3.0,
+    ) -> None:
+        from vosk import KaldiRecognizer
+
+        self.samplerate = samplerate
+        self.min_conf = min_conf
+        self.max_sec = max_sec
+        self.phrases = _grammar_phrases(phrases)
+        grammar = json.dumps(self.phrases + ["[unk]"], ensure_ascii=False)
+        self._rec = KaldiRecognizer(model, samplerate, grammar)
+        self._rec.SetWords(True)
+        # One decoder: calls from several threads are serialized.
+        self._lock = threading.Lock()
+
+    def _accept(self, result: dict) -> Optional[str]:
+        text = normalize_phrase(result.get("text", ""))
+        if not text or "unk" in text.split():
+            return None
+        words = result.get("result") or []
+        if any(float(w.get("conf", 1.0)) < self.min_conf for w in words):
+            return None
+        # Results with [unk] were rejected above; the rest consists of known phrases.
+        return text
+
+    def recognize(self, audio: np.ndarray | bytes) -> Optional[str]:
+        """Return the command text for int16 mono audio, or None if it is not a known phrase."""
+        if isinstance(audio, np.ndarray):
+            audio = audio.astype(np.int16, copy=False).tobytes()
+        if not audio or len(audio) > self.max_sec * self.samplerate * 2:
+            return None
+        with self._lock:
+            try:
+                self._rec.AcceptWaveform(audio)
+                return self._accept(json.loads(self._rec.FinalResult()))
+            finally:
+                self._rec.Reset()
+
+    def recognize_wav(self, wav_bytes: bytes) -> Optional[str]:
+        """WAV variant (16-bit mono at the recognizer's rate; other formats return None)."""
+        with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+            if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getframerate() != self.samplerate:
+                return None
+            if wf.getnframes() > self.max_sec * self.samplerate:
+                return None
+            return self.recognize(wf.readframes(wf.getnframes()))
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import threading
+from typing import Callable, Optional
+
+from .tts_cache import cached_synthesize
+
+_lock = threading.Lock()
+_engine = None
+_engine_error: Optional[str] = None
+
+
+def _enabled() -> bool:
+    v = os.getenv("LOCAL_TTS_FALLBACK")
+    return v is None or v.strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def _get_engine():
+    """pyttsx3 engine with a German voice (None if pyttsx3/espeak is unavailable)."""
+    global _engine, _engine_error
+    if _engine is not None or _engine_error is not None:
+        return _engine
+    try:
+        import pyttsx3  # type: ignore
+
+        engine = pyttsx3.init()
+        wanted = (os.getenv("LOCAL_TTS_VOICE") or "").strip().lower()
+        for voice in engine.getProperty("voices"):
+            label = f"{voice.id} {voice.name}".lower()
+            langs = " ".join(str(lang) for lang in (getattr(voice, "languages", None) or [])).lower()
+            if (wanted and wanted in label) or (not wanted and ("german" in label or "de" in langs)):
+                engine.setProperty("voice", voice.id)
+                break
+        _engine = engine
+    except Exception as e:
+        _engine_error = str(e)
+        print(f"Lokale TTS: nicht verfügbar ({e})", file=sys.stderr)
+    return _engine
+
+
+def synthesize_local(text: str) -> bytes:
+    """Synthesize WAV bytes offline with pyttsx3 (raises RuntimeError if unavailable)."""
+    with _lock:
+        engine = _get_engine()
+        if engine is None:
+            raise RuntimeError(f"Lokale TTS nicht verfügbar: {_engine_error}")
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            engine.save_to_file(text, path)
+            engine.runAndWait()
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def synthesize_with_fallback(text: str, model: str, voice: str, synthesize: Callable[[str], bytes]) -> bytes:
+    """Cached OpenAI TTS; if that fails (e.g. breaker open), speak with the local engine.
+
+    Cache hits still use the OpenAI voice while offline. Local audio is
+    never cached, so the OpenAI voice returns once the connection does.
+    """
+    try:
+        return cached_synthesize(text, model, voice, synthesize)
+    except Exception as e:
+        if not _enabled():
+            raise
+        try:
+            return synthesize_local(text)
+        except Exception:
+            raise e
@@ -9,7 +9,34 @@ from . import __version__
 from .gpio_inputs import PushToTalk
 from .led_status import LedStatus, Status
 from .audio_io import record_while_pressed, play_wav_bytes, play_status_listening
-from .whisper_cpp import transcribe_wav_bytes
+from .stt_hedge import make_transcribe_fn
+from .openai_client import breaker, call_timeout, get_client, prewarm
+from .tts_cache import warm_tts_cache
+from .local_tts import synthesize_with_fallback
+from .chat_assistant import CHAT_UNAVAILABLE_MESSAGE
+
+_MODE_PROMPT = (
+    "Willkommen. Bitte sage jetzt entweder: Echo. Oder: Chatbox. "
+    "Halte dazu den Kontakt gedrückt und sprich."
+)
+_MODE_ECHO = "Echo Modus aktiviert."
+_MODE_CHATBOX = "Chatbox Modus aktiviert."
+_MODE_RETRY = "Ich habe das nicht verstanden. Bitte sage Echo oder Chatbox."
+_MODE_AUTO = "Ich wähle automatisch Chatbox."
+
+def _tts_request(client: OpenAI, model_tts: str, voice: str):
+    def _request(text: str) -> bytes:
+        def _call() -> bytes:
+            speech = client.audio.speech.create(
+                model=model_tts,
+                voice=voice,
+                input=text,
+                response_format="wav",
+                timeout=call_timeout("tts"),
+            )
+            return speech.read()
+        return breaker("tts").call(_call)
+    return _request
 
 def _tts_play(
     client: OpenAI,
@@ -19,40 +46,8 @@ def _tts_play(
     output_device: str | int | None = None,
     announce_output: bool = True,
 ) -> None:
-    speech = client.audio.speech.create(
-        model=model_tts,
-        voice=voice,
-        input=text,
-        response_format="wav",
-    )
-    play_wav_bytes(speech.read(), device=output_device, announce=announce_output)
-
-def _stt_transcribe(client: OpenAI, model_stt: str, wav_bytes: bytes) -> str:
-    wav_path = _bytes_to_tempfile(wav_bytes, ".wav")
-    try:
-        with open(wav_path, "rb") as f_audio:
-            stt = client.audio.transcriptions.create(model=model_stt, file=f_audio)
-        return (stt.text or "").strip()
-    finally:
-        try:
-            os.remove(wav_path)
-        except OSError:
-            pass
-
-def _make_transcribe_fn(settings, client: OpenAI):
-    if settings.use_whisper_cpp:
-        def _whispercpp_transcribe(wav_bytes: bytes) -> str:
-            return transcribe_wav_bytes(
-                wav_bytes,
-                bin_path=settings.whisper_cpp_bin,
-                model_path=settings.whisper_cpp_model,
-                language=settings.whisper_cpp_language,
-                threads=settings.whisper_cpp_threads,
-                temperature=settings.whisper_cpp_temperature,
-                extra_args=settings.whisper_cpp_extra_args,
-            )
-        return _whispercpp_transcribe
-    return lambda wav_bytes: _stt_transcribe(client, settings.model_stt, wav_bytes)
+    wav_bytes = synthesize_with_fallback(text, model_tts, voice, _tts_request(client, model_tts, voice))
+    play_wav_bytes(wav_bytes, device=output_device, announce=announce_output)
 
 def test_leds():
     s = load_settings()
@@ -90,20 +85,17 @@ def test_ptt():
         print("\nBeendet.")
 
 def _select_mode_by_voice(transcribe_fn, client: OpenAI, settings, ptt: PushToTalk, leds: LedStatus) -> str:
-    prompt = (
-        "Willkommen. Bitte sage jetzt entweder: Echo. Oder: Chatbox. "
-        "Halte dazu den Kontakt gedrückt und sprich."
-    )
     _tts_play(
         client,
         settings.model_tts,
         settings.tts_voice,
-        prompt,
+        _MODE_PROMPT,
         output_device=settings.audio_output_device,
     )
 
     for _ in range(3):
         ptt.wait_for_press()
+        prewarm()
         leds.set(Status.LISTENING)
         wav_bytes = record_while_pressed(lambda: ptt.is_pressed, device=settings.audio_input_device)
         leds.set(Status.THINKING)
@@ -114,7 +106,7 @@ def _select_mode_by_voice(transcribe_fn, client: OpenAI, settings, ptt: PushToTa
                 client,
                 settings.model_tts,
                 settings.tts_voice,
-                "Echo Modus aktiviert.",
+                _MODE_ECHO,
                 output_device=settings.audio_output_device,
                 announce_output=False,
             )
@@ -124,7 +116,7 @@ def _select_mode_by_voice(transcribe_fn, client: OpenAI, settings, ptt: PushToTa
                 client,
                 settings.model_tts,
                 settings.tts_voice,
-                "Chatbox Modus aktiviert.",
+                _MODE_CHATBOX,
                 output_device=settings.audio_output_device,
                 announce_output=False,
             )
@@ -134,7 +126,7 @@ def _select_mode_by_voice(transcribe_fn, client: OpenAI, settings, ptt: PushToTa
             client,
             settings.model_tts,
             settings.tts_voice,
-            "Ich habe das nicht verstanden. Bitte sage Echo oder Chatbox.",
+            _MODE_RETRY,
             output_device=settings.audio_output_device,
             announce_output=False,
         )
@@ -143,7 +135,7 @@ def _select_mode_by_voice(transcribe_fn, client: OpenAI, settings, ptt: PushToTa
         client,
         settings.model_tts,
         settings.tts_voice,
-        "Ich wähle automatisch Chatbox.",
+        _MODE_AUTO,
         output_device=settings.audio_output_device,
         announce_output=False,
     )
@@ -259,8 +251,14 @@ def main():
         print("USE_GPIO=false – dieser Build nutzt GPIO für Kontakt/LEDs. Bitte USE_GPIO=true setzen.")
         return
 
-    client = OpenAI(api_key=settings.openai_api_key)
-    transcribe_fn = _make_transcribe_fn(settings, client)
+    client = get_client(settings)
+    transcribe_fn = make_transcribe_fn(settings, client)
+    warm_tts_cache(
+        (_MODE_PROMPT, _MODE_ECHO, _MODE_CHATBOX, _MODE_RETRY, _MODE_AUTO, CHAT_UNAVAILABLE_MESSAGE),
+        settings.model_tts,
+        settings.tts_voice,
+        _tts_request(client, settings.model_tts, settings.tts_voice),
+    )
 
     leds = LedStatus(settings.gpio_led_red, settings.gpio_led_yellow, settings.gpio_led_green, enabled=True)
     leds.set(Status.IDLE)
@@ -279,6 +277,7 @@ def main():
     while True:
         try:
             ptt.wait_for_press()
+            prewarm()
             leds.set(Status.LISTENING)
 
             wav_bytes = record_while_pressed(lambda: ptt.is_pressed, device=settings.audio_input_device)
@@ -298,14 +297,20 @@ def main():
             if mode == "echo":
                 answer = user_text
             else:
-                chat = client.chat.completions.create(
-                    model=settings.model_chat,
-                    messages=[
-                        {"role": "system", "content": "Du bist ein hilfreicher, knapper Sprachassistent."},
-                        {"role": "user", "content": user_text},
-                    ],
-                )
-                answer = (chat.choices[0].message.content or "").strip()
+                try:
+                    chat = breaker("chat").call(
+                        client.chat.completions.create,
+                        model=settings.model_chat,
+                        messages=[
+                            {"role": "system", "content": "Du bist ein hilfreicher, knapper Sprachassistent."},
+                            {"role": "user", "content": user_text},
+                        ],
+                        timeout=call_timeout("chat"),
+                    )
+                    answer = (chat.choices[0].message.content or "").strip()
+                except Exception as e:
+                    print(f"ChatGPT-Fehler: {e}")
+                    answer = CHAT_UNAVAILABLE_MESSAGE
 
             leds.set(Status.SPEAKING)
             _tts_play(
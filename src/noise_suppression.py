@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+import numpy as np
+
+from .audio_frame import AudioFrame
+
+
+class SpectralNoiseSuppressor:
+    """Streaming STFT noise suppression (Wiener gain, running noise estimate).
+
+    Float32 blocks of any length are cut into 50 % overlapping sqrt-Hann
+    frames; all complete frames of a block go through one batched rfft/irfft.
+    The noise power spectrum is an EMA over frames that count as noise: all
+    frames of a block the VAD calls silent, otherwise only frames whose
+    energy stays near the current estimate. Each call returns whole hops:
+    blocks that are multiples of the hop give exactly as many samples back,
+    otherwise the unfinished part of the last hop is held for the next call.
+    The signal itself is delayed by one hop (output sample i belongs to input
+    sample i - hop; the first hop is the start-up from silence).
+
+    The per-frame processing time is tracked, see realtime_factor.
+    """
+
+    def __init__(
+        self,
+        samplerate: int = 16000,
+        hop_ms: float = 16.0,
+        noise_alpha: float = 0.9,
+        oversubtraction: float = 1.5,
+        gain_floor: float = 0.1,
+        update_ratio: float = 2.0,
+        budget_rtf: float = 0.3,
+    ) -> None:
+        """
+        Args:
+            hop_ms: Frame hop (the FFT is two hops long; latency is one hop)
+            noise_alpha: EMA factor per noise frame (higher = slower tracking)
+            oversubtraction: Noise power multiplier in the gain
+            gain_floor: Minimum gain per bin (0.1 = -20 dB), limits musical noise
+            update_ratio: Frame energy below ratio * noise energy updates the estimate
+            budget_rtf: Processing time / audio time considered acceptable
+        """
+        self.samplerate = int(samplerate)
+        self.hop = max(16, int(self.samplerate * hop_ms / 1000))
+        self.n_fft = 2 * self.hop
+        self.noise_alpha = max(0.0, min(noise_alpha, 0.999))
+        self.oversubtraction = oversubtraction
+        self.gain_floor = gain_floor
+        self.update_ratio = update_ratio
+        self.budget_rtf = budget_rtf
+        # sqrt-Hann analysis + synthesis sums to one at 50 % overlap
+        self._window = np.sqrt(np.hanning(self.n_fft + 1)[:-1]).astype(np.float32)
+        self.reset()
+
+    @property
+    def latency_sec(self) -> float:
+        return self.hop / self.samplerate
+
+    def reset(self) -> None:
+        self.noise_psd: Optional[np.ndarray] = None
+        self._in = np.zeros(self.hop, dtype=np.float32)
+        self._ola = np.zeros(self.hop, dtype=np.float32)
+        self.frames_processed = 0
+        self.cost_sec = 0.0
+        self.last_frame_ms = 0.0
+
+    @property
+    def avg_frame_ms(self) -> float:
+        return self.cost_sec * 1000.0 / self.frames_processed if self.frames_processed else 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        """Processing time per second of audio (must stay well below 1)."""
+        audio_sec = self.frames_processed * self.hop / self.samplerate
+        return self.cost_sec / audio_sec if audio_sec else 0.0
+
+    @property
+    def over_budget(self) -> bool:
+        return self.realtime_factor > self.budget_rtf
+
+    def cost_summary(self) -> str:
+        return (
+            f"frame={self.last_frame_ms:.3f}ms avg={self.avg_frame_ms:.3f}ms "
+            f"rtf={self.realtime_factor:.3f} frames={self.frames_processed}"
+        )
+
+    def _update_noise(self, psd: np.ndarray, speech: Optional[bool]) -> None:
+        if self.noise_psd is None:
+            # Per-bin minimum is a conservative first estimate even if the
+            # stream starts with speech.
+            self.noise_psd = psd.mean(axis=0) if speech is False else psd.min(axis=0)
+            return
+        if speech is False:
+            noise = psd
+        else:
+            energy = psd.sum(axis=1)
+            noise = psd[energy < self.update_ratio * float(self.noise_psd.sum())]
+        m = noise.shape[0]
+        if not m:
+            return
+        a = self.noise_alpha
+        # Closed form of m sequential EMA steps
+        weights = (1.0 - a) * a ** np.arange(m - 1, -1, -1, dtype=np.float64)
+        self.noise_psd = a ** m * self.noise_psd + weights @ noise
+
+    def process(self, x: np.ndarray, speech: Optional[bool] = None) -> np.ndarray:
+        """Feed a float32 block and return the denoised samples completed so far.
+
+        Args:
+            speech: VAD decision for the block (False = noise only, None = unknown)
+        """
+        if x.size == 0:
+            return x
+        t0 = time.perf_counter()
+        buf = np.concatenate([self._in, x])
+        k = (buf.size - self.hop) // self.hop
+        out = np.zeros(0, dtype=np.float32)
+        if k:
+            frames = np.lib.stride_tricks.sliding_window_view(buf, self.n_fft)[:: self.hop][:k]
+            spec = np.fft.rfft(frames * self._window, axis=1)
+            psd = spec.real ** 2 + spec.imag ** 2
+            self._update_noise(psd, speech)
+            gain = 1.0 - self.oversubtraction * self.noise_psd / np.maximum(psd, 1e-12)
+            np.maximum(gain, self.gain_floor, out=gain)
+            y = np.fft.irfft(spec * gain, n=self.n_fft, axis=1).astype(np.float32)
+            y *= self._window
+            # Overlap-add: first half of each frame plus second half of the previous
+            out = y[:, : self.hop].copy()
+            out[0] += self._ola
+            out[1:] += y[:-1, self.hop :]
+            self._ola = y[-1, self.hop :].copy()
+            self._in = buf[k * self.hop :].copy()
+            self.frames_processed += k
+            out = out.reshape(-1)
+        else:
+            self._in = buf
+        cost = time.perf_counter() - t0
+        self.cost_sec += cost
+        if k:
+            self.last_frame_ms = cost * 1000.0 / k
+        return out
+
+    def process_frame(self, frame: AudioFrame, speech: Optional[bool] = None) -> AudioFrame:
+        """AudioFrame variant; uses frame.vad as the speech hint if none is given."""
+        if speech is None and frame.vad is not None:
+            speech = frame.vad.is_speech
+        return AudioFrame.from_float(self.process(frame.float32, speech), self.samplerate)
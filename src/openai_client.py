@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from typing import Optional
+
+import httpx
+from openai import DefaultHttpxClient, OpenAI
+
+from .circuit_breaker import CircuitBreaker
+
+# Per-call timeouts (seconds); overridden from the settings in get_client()
+_timeouts = {"stt": 15.0, "chat": 30.0, "tts": 30.0}
+
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+_keepalive_sec = 60.0
+_last_warm = 0.0
+_warming = False
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def _is_outage(error: BaseException) -> bool:
+    """Errors that mean the endpoint is unhealthy: transport, timeout, 429 and 5xx.
+
+    Client errors (bad request, authentication, ...) are deterministic and
+    must not trip the breaker.
+    """
+    import openai
+
+    if isinstance(error, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(error, (OSError, TimeoutError))
+
+
+def get_client(settings) -> OpenAI:
+    """Process-wide OpenAI client with a keep-alive connection pool.
+
+    All entry points share one client, so a connection opened by one call
+    (or by prewarm()) is reused by the next instead of paying DNS, TCP and
+    TLS setup again.
+    """
+    global _client, _keepalive_sec
+    with _client_lock:
+        if _client is not None:
+            return _client
+        _keepalive_sec = max(5.0, settings.openai_keepalive_sec)
+        _timeouts.update(
+            stt=settings.openai_timeout_stt_sec,
+            chat=settings.openai_timeout_chat_sec,
+            tts=settings.openai_timeout_tts_sec,
+        )
+        http_client = DefaultHttpxClient(
+            limits=httpx.Limits(
+                max_connections=8,
+                max_keepalive_connections=4,
+                keepalive_expiry=_keepalive_sec,
+            ),
+            timeout=httpx.Timeout(max(_timeouts.values()), connect=5.0),
+        )
+        client = OpenAI(api_key=settings.openai_api_key, http_client=http_client, max_retries=1)
+
+        def _probe() -> None:
+            client.with_options(timeout=5.0, max_retries=0).models.list()
+
+        for kind in _timeouts:
+            _breakers[kind] = CircuitBreaker(
+                f"OpenAI-{kind.upper()}",
+                failure_threshold=settings.openai_breaker_failures,
+                slo_sec=settings.openai_breaker_slo_sec or None,
+                probe=_probe,
+                probe_sec=settings.openai_breaker_probe_sec,
+                is_failure=_is_outage,
+            )
+        _client = client
+        return _client
+
+
+def call_timeout(kind: str) -> float:
+    """Timeout for one call type: "stt", "chat" or "tts"."""
+    return _timeouts.get(kind, 30.0)
+
+
+def breaker(kind: str) -> CircuitBreaker:
+    """Circuit breaker of one endpoint: "stt", "chat" or "tts".
+
+    Before get_client() has configured them, a disabled breaker is returned.
+    """
+    with _client_lock:
+        b = _breakers.get(kind)
+        if b is None:
+            b = _breakers[kind] = CircuitBreaker(f"OpenAI-{kind.upper()}", failure_threshold=0)
+        return b
+
+
+def prewarm() -> None:
+    """Open a pooled connection in the background (wake word / PTT press).
+
+    The handshake then overlaps with the user still speaking. No-op without
+    a shared client, while a warm-up runs, or shortly after the previous
+    warm-up (its connection is still kept alive).
+    """
+    global _warming
+    client = _client
+    if client is None or _warming:
+        return
+    if any(b.is_open for b in _breakers.values()):
+        # The breakers' own probes test the connection meanwhile.
+        return
+    if time.monotonic() - _last_warm < _keepalive_sec / 2:
+        return
+    _warming = True
+
+    def _warm() -> None:
+        global _warming, _last_warm
+        try:
+            # Cheapest authenticated request; leaves the connection in the pool
+            client.with_options(timeout=5.0, max_retries=0).models.list()
+            _last_warm = time.monotonic()
+        except Exception as e:
+            print(f"OpenAI: Vorwärmen fehlgeschlagen ({e})", file=sys.stderr)
+        finally:
+            _warming = False
+
+    threading.Thread(target=_warm, daemon=True).start()
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class StageQueue:
+    """Bounded queue between two pipeline stages with backpressure metrics.
+
+    A full queue blocks the producer (backpressure) instead of dropping
+    items; the time producers spent blocked shows which stage is too slow.
+    """
+
+    def __init__(self, name: str, maxsize: int) -> None:
+        self.name = name
+        self.maxsize = max(1, int(maxsize))
+        self._q: queue.Queue = queue.Queue(self.maxsize)
+        self.puts = 0
+        self.max_depth = 0
+        self.blocked_puts = 0
+        self.blocked_sec = 0.0
+
+    @property
+    def depth(self) -> int:
+        return self._q.qsize()
+
+    def put(self, item: Any, stop: Optional[threading.Event] = None) -> bool:
+        """Enqueue an item, waiting while the queue is full. False if stopped meanwhile."""
+        try:
+            self._q.put_nowait(item)
+        except queue.Full:
+            self.blocked_puts += 1
+            t0 = time.monotonic()
+            while True:
+                if stop is not None and stop.is_set():
+                    self.blocked_sec += time.monotonic() - t0
+                    return False
+                try:
+                    self._q.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            self.blocked_sec += time.monotonic() - t0
+        self.puts += 1
+        self.max_depth = max(self.max_depth, self._q.qsize())
+        return True
+
+    def get(self, timeout: float) -> Any:
+        """Dequeue an item (raises queue.Empty after timeout)."""
+        return self._q.get(timeout=timeout)
+
+    def task_done(self) -> None:
+        self._q.task_done()
+
+    def drain(self, timeout: float) -> bool:
+        """Wait until every queued item has been processed. False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._q.all_tasks_done:
+            while self._q.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._q.all_tasks_done.wait(remaining)
+        return True
+
+    def clear(self) -> None:
+        while True:
+            try:
+                self._q.get_nowait()
+            except queue.Empty:
+                return
+            self._q.task_done()
+
+    def summary(self) -> str:
+        return (
+            f"{self.name}: {self.depth}/{self.maxsize} max={self.max_depth} "
+            f"blocked={self.blocked_puts}x/{self.blocked_sec:.2f}s"
+        )
+
+
+class Stage:
+    """One pipeline thread: pulls items from its input queue and runs ``fn``.
+
+    ``fn(item, emit)`` processes one item and passes results on with
+    ``emit(result)`` (blocking while the output queue is full). A stage
+    without input queue is a source: ``fn(None, emit)`` is called in a loop.
+    ``idle()`` runs whenever no input arrived for ``poll_sec``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[Any, Callable[[Any], bool]], None],
+        inq: Optional[StageQueue] = None,
+        outq: Optional[StageQueue] = None,
+        idle: Optional[Callable[[], None]] = None,
+        poll_sec: float = 0.1,
+    ) -> None:
+        self.name = name
+        self.fn = fn
+        self.inq = inq
+        self.outq = outq
+        self.idle = idle
+        self.poll_sec = poll_sec
+        self.items = 0
+        self.errors = 0
+        self.busy_sec = 0.0
+        self.last_item_ms = 0.0
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def avg_item_ms(self) -> float:
+        return self.busy_sec * 1000.0 / self.items if self.items else 0.0
+
+    def emit(self, item: Any) -> bool:
+        if self.outq is None:
+            return False
+        return self.outq.put(item, self._stop)
+
+    def start(self, stop: threading.Event) -> None:
+        self._stop = stop
+        self._thread = threading.Thread(target=self._run, name=f"pipeline-{self.name}", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: float) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        stop = self._stop
+        while not stop.is_set():
+            item = None
+            if self.inq is not None:
+                try:
+                    item = self.inq.get(timeout=self.poll_sec)
+                except queue.Empty:
+                    if self.idle is not None:
+                        self._call(self.idle)
+                    continue
+            t0 = time.perf_counter()
+            try:
+                self._call(self.fn, item, self.emit)
+            finally:
+                cost = time.perf_counter() - t0
+                self.busy_sec += cost
+                self.last_item_ms = cost * 1000.0
+                self.items += 1
+                if self.inq is not None:
+                    self.inq.task_done()
+
+    def _call(self, fn: Callable, *args: Any) -> None:
+        try:
+            fn(*args)
+        except Exception as e:
+            self.errors += 1
+            print(f"Pipeline {self.name}: Fehler: {e}", file=sys.stderr)
+
+    def summary(self) -> str:
+        return (
+            f"{self.name}: n={self.items} avg={self.avg_item_ms:.1f}ms "
+            f"busy={self.busy_sec:.2f}s err={self.errors}"
+        )
+
+
+class Pipeline:
+    """Chain of stages connected by bounded queues, one thread per stage."""
+
+    def __init__(self) -> None:
+        self.stages: list[Stage] = []
+        self.queues: list[StageQueue] = []
+        self._stop = threading.Event()
+        self._started = 0.0
+
+    def queue(self, name: str, maxsize: int) -> StageQueue:
+        q = StageQueue(name, maxsize)
+        self.queues.append(q)
+        return q
+
+    def stage(self, name: str, fn: Callable, inq: Optional[StageQueue] = None,
+              outq: Optional[StageQueue] = None, idle: Optional[Callable[[], None]] = None) -> Stage:
+        stage = Stage(name, fn, inq, outq, idle)
+        self.stages.append(stage)
+        return stage
+
+    @property
+    def stop_event(self) -> threading.Event:
+        """Set on stop(); pass to StageQueue.put() from threads outside the stages."""
+        return self._stop
+
+    @property
+    def running(self) -> bool:
+        return self._started > 0 and not self._stop.is_set()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._started = time.monotonic()
+        for stage in self.stages:
+            stage.start(self._stop)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop all stages; items still queued are discarded."""
+        self._stop.set()
+        deadline = time.monotonic() + timeout
+        for stage in self.stages:
+            stage.join(max(0.0, deadline - time.monotonic()))
+        for q in self.queues:
+            q.clear()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until stopped (True) or timeout (False)."""
+        return self._stop.wait(timeout)
+
+    def summary(self) -> str:
+        """Queue depths/backpressure and per-stage utilisation, one line."""
+        elapsed = max(time.monotonic() - self._started, 1e-6) if self._started else 0.0
+        parts = [q.summary() for q in self.queues]
+        for stage in self.stages:
+            load = f" load={stage.busy_sec / elapsed:.0%}" if elapsed else ""
+            parts.append(stage.summary() + load)
+        return " | ".join(parts)
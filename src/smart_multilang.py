@@ -1,11 +1,10 @@
 from __future__ import annotations
-import io
-import wave
 import json
 import re
 import time
 import numpy as np
 import sounddevice as sd
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
 from typing import Callable, Optional, Dict, List, Tuple
 from pathlib import Path
 
@@ -13,12 +12,22 @@ from .audio_io import (
     _resolve_device_id,
     select_input_device,
     wait_for_playback_end,
+    is_playback_active,
+    barge_in_active,
     play_beep_sequence,
     play_hangup_tone,
     stop_playback,
     record_audio_chunk,
+    open_capture_reader,
+    release_capture_engine,
 )
+from .audio_capture import CaptureReader
+from .audio_frame import AudioFrame
+from .audio_preprocess import PreprocessChain
+from .vad import VoiceActivityDetector
+from .endpointing import UTTERANCE_END, UTTERANCE_START, Endpointer, EndpointEvent, read_until_endpoint
 from .chat_assistant import ChatAssistant
+from .openai_client import get_client, prewarm
 from .sentence_detection import (
     SemanticSpeechRecognition,
     should_send_to_chatgpt,
@@ -65,7 +74,9 @@ class SmartMultiLanguageVoskRecognition:
                  confirm_phrases: tuple[str, ...] | None = None,
                  reject_phrases: tuple[str, ...] | None = None,
                  confirm_timeout_sec: float = 6.0,
-                 ready_hold_sec: float = 10.0):
+                 ready_hold_sec: float = 10.0,
+                 enable_noise_suppression: bool = False,
+                 en_deadline_sec: float = 1.0):
         """
         Initialisiere intelligente mehrsprachige Spracherkennung.
         
@@ -76,6 +87,9 @@ class SmartMultiLanguageVoskRecognition:
             chunk_duration: Dauer pro Chunk in Sekunden
             enable_audio_processing: Audio-Vorverarbeitung aktivieren
             enable_semantic: Semantische Satzerkennung aktivieren
+            enable_noise_suppression: Spektrale Rauschunterdrückung vor Vosk (nur mit Vorverarbeitung)
+            en_deadline_sec: Längste Wartezeit auf das englische Modell ab Chunk-Beginn;
+                danach wird nur das deutsche Ergebnis verwendet
         """
         self.model_path_de = Path(model_path_de)
         self.model_path_en = Path(model_path_en) if model_path_en else None
@@ -84,6 +98,11 @@ class SmartMultiLanguageVoskRecognition:
         self.samplerate = 16000
         self.chunk_duration = chunk_duration
         self.enable_audio_processing = enable_audio_processing
+        # Kausaler High-Pass (+ Rauschunterdrückung) + AGC mit Zustand über Chunk-Grenzen hinweg
+        self._preprocess = (
+            PreprocessChain(self.samplerate, noise_suppression=enable_noise_suppression)
+            if enable_audio_processing else None
+        )
         self.enable_semantic = enable_semantic
         self.vad_rms_threshold = vad_rms_threshold
         self.vad_noise_multiplier = vad_noise_multiplier
@@ -91,20 +110,22 @@ class SmartMultiLanguageVoskRecognition:
         self.vad_hangover_factor = max(0.1, min(vad_hangover_factor, 1.0))
         self.vad_preroll_sec = max(0.0, vad_preroll_sec)
         self._preroll_samples = int(self.samplerate * self.vad_preroll_sec)
-        self._preroll_tail = np.zeros(0, dtype=np.int16)
+        self._preroll_tail = AudioFrame(None, self.samplerate)
         self.vad_use_webrtcvad = vad_use_webrtcvad
         self.vad_webrtcvad_mode = max(0, min(int(vad_webrtcvad_mode), 3))
         self.vad_webrtcvad_frame_ms = 30 if int(vad_webrtcvad_frame_ms) not in (10, 20, 30) else int(vad_webrtcvad_frame_ms)
-        self._webrtcvad = None
-        if self.vad_use_webrtcvad:
-            try:
-                import webrtcvad  # type: ignore
-                self._webrtcvad = webrtcvad.Vad(self.vad_webrtcvad_mode)
-            except Exception as e:
-                if self.debug_logs:
-                    self._debug(f"webrtcvad: unavailable ({e})")
-                self._webrtcvad = None
-        self._noise_floor = 0.0
+        self._vad = VoiceActivityDetector(
+            samplerate=self.samplerate,
+            frame_ms=self.vad_webrtcvad_frame_ms,
+            rms_threshold=self.vad_rms_threshold if self.vad_rms_threshold > 0 else 0.005,
+            noise_multiplier=self.vad_noise_multiplier,
+            noise_alpha=self.vad_noise_alpha,
+            hangover_factor=self.vad_hangover_factor,
+            use_webrtcvad=self.vad_use_webrtcvad,
+            webrtcvad_mode=self.vad_webrtcvad_mode,
+            # VAD_NOISE_ALPHA is specified per VOSK_CHUNK_DURATION
+            noise_alpha_sec=chunk_duration,
+        )
         self.chat_assistant = chat_assistant
         self._last_chat_text: Optional[str] = None
         self.listening_active = False
@@ -121,9 +142,11 @@ class SmartMultiLanguageVoskRecognition:
         self.pause_duration = pause_duration if pause_duration is not None else 0.0
         if self.pause_duration <= 0:
             self.pause_duration = None
-        self._silence_sec = 0.0
-        self._speech_active = False
+        # Äußerungsende auf 10-30-ms-Frames, unabhängig von der Chunk-Länge
+        self._endpointer = Endpointer(self._vad, pause_duration=self.pause_duration or 0.6)
         self.debug_logs = debug_logs
+        if self._vad.webrtcvad_error and self.debug_logs:
+            self._debug(f"webrtcvad: unavailable ({self._vad.webrtcvad_error})")
         self.audio_output_device = audio_output_device
         self.confirm_before_chat = confirm_before_chat
         self.confirm_phrases = confirm_phrases or ("ok", "okay", "ja", "yes")
@@ -170,6 +193,11 @@ class SmartMultiLanguageVoskRecognition:
         self.oled: Optional[OledDisplay] = None
         self.text_callback: Optional[Callable[[str], None]] = None
         self.semantic_processor = SemanticSpeechRecognition(language="de") if enable_semantic else None
+        self._capture: Optional[CaptureReader] = None
+        # Englisches Modell parallel zum deutschen (Kaldi gibt die GIL frei)
+        self.en_deadline_sec = max(0.0, en_deadline_sec)
+        self._en_executor: Optional[ThreadPoolExecutor] = None
+        self._en_future: Optional[Future] = None
         
         self._init_models()
     
@@ -205,62 +233,19 @@ class SmartMultiLanguageVoskRecognition:
         except Exception as e:
             raise RuntimeError(f"Fehler beim Laden der Vosk-Modelle: {e}")
     
-    def _transcribe_audio_de(self, audio_data: np.ndarray) -> str:
-        """Transkribiere Audio mit deutschem Modell."""
+    def _transcribe_pcm(self, model, pcm: bytes) -> str:
+        """Transkribiere int16-PCM (mono, 16 kHz) mit dem gegebenen Modell."""
         from vosk import KaldiRecognizer
         
-        rec = KaldiRecognizer(self.model_de, self.samplerate)
+        rec = KaldiRecognizer(model, self.samplerate)
         rec.SetWords(False)
         
-        # Konvertiere numpy-Array zu WAV-Bytes
-        wav_bytes = self._audio_to_wav_bytes(audio_data)
-        wav_file = wave.open(io.BytesIO(wav_bytes))
-        
+        # Ganzer Chunk in einem Aufruf: kein WAV-Umweg, keine Teilkopien
         text_parts = []
-        while True:
-            data = wav_file.readframes(4000)
-            if len(data) == 0:
-                break
-            
-            if rec.AcceptWaveform(data):
-                result = json.loads(rec.Result())
-                if result.get("text"):
-                    text_parts.append(result["text"])
-        
-        final_result = json.loads(rec.FinalResult())
-        if final_result.get("text"):
-            text_parts.append(final_result["text"])
-        
-        result_text = " ".join(text_parts).strip()
-        # Stelle sicher, dass Leerzeichen zwischen Wörtern vorhanden sind
-        # Normalisiere mehrfache Leerzeichen zu einem
-        result_text = re.sub(r'\s+', ' ', result_text)
-        return result_text
-    
-    def _transcribe_audio_en(self, audio_data: np.ndarray) -> str:
-        """Transkribiere Audio mit englischem Modell (nur wenn verfügbar)."""
-        if not self.model_en:
-            return ""
-        
-        from vosk import KaldiRecognizer
-        
-        rec = KaldiRecognizer(self.model_en, self.samplerate)
-        rec.SetWords(False)
-        
-        # Konvertiere numpy-Array zu WAV-Bytes
-        wav_bytes = self._audio_to_wav_bytes(audio_data)
-        wav_file = wave.open(io.BytesIO(wav_bytes))
-        
-        text_parts = []
-        while True:
-            data = wav_file.readframes(4000)
-            if len(data) == 0:
-                break
-            
-            if rec.AcceptWaveform(data):
-                result = json.loads(rec.Result())
-                if result.get("text"):
-                    text_parts.append(result["text"])
+        if rec.AcceptWaveform(pcm):
+            result = json.loads(rec.Result())
+            if result.get("text"):
+                text_parts.append(result["text"])
         
         final_result = json.loads(rec.FinalResult())
         if final_result.get("text"):
@@ -272,79 +257,36 @@ class SmartMultiLanguageVoskRecognition:
         result_text = re.sub(r'\s+', ' ', result_text)
         return result_text
     
-    def _audio_to_wav_bytes(self, audio_data: np.ndarray) -> bytes:
-        """Konvertiere numpy-Array zu WAV-Bytes."""
-        buf = io.BytesIO()
-        with wave.open(buf, "wb") as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(self.samplerate)
-            wf.writeframes(audio_data.tobytes())
-        return buf.getvalue()
-    
-    def _normalize_audio(self, audio: np.ndarray) -> np.ndarray:
-        """Normalisiere Audio (DC-Offset entfernen, Normalisierung)."""
-        # Konvertiere zu float
-        audio_float = audio.astype(np.float32) / 32768.0
-        
-        # Entferne DC-Offset
-        audio_float = audio_float - np.mean(audio_float)
+    def _transcribe_both(self, audio_data: np.ndarray) -> tuple[str, str]:
+        """DE und EN gleichzeitig auf demselben PCM-Puffer; EN höchstens bis zur Deadline.
+
+        Ein noch laufender EN-Auftrag eines früheren Chunks wird nicht
+        nachbestellt, damit sich bei einem langsamen Modell nichts aufstaut.
+        """
+        t0 = time.monotonic()
+        pcm = audio_data.astype(np.int16, copy=False).tobytes()
+        en_future = None
+        if self.model_en:
+            if self._en_future is not None and not self._en_future.done():
+                self._debug("transcribe(en): busy, skip")
+            else:
+                if self._en_executor is None:
+                    self._en_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vosk-en")
+                en_future = self._en_future = self._en_executor.submit(self._transcribe_pcm, self.model_en, pcm)
         
-        # Normalisiere auf -1.0 bis 1.0
-        max_val = np.max(np.abs(audio_float))
-        if max_val > 0:
-            audio_float = audio_float / (max_val * 1.1)
+        text_de = self._transcribe_pcm(self.model_de, pcm)
+        t_de = time.monotonic() - t0
         
-        # Konvertiere zurück zu int16
-        audio_normalized = (audio_float * 32767.0).astype(np.int16)
-        return audio_normalized
-    
-    def _detect_speech(self, audio: np.ndarray, threshold: float = 0.01) -> bool:
-        """Voice Activity Detection (VAD)."""
-        if self._webrtcvad is not None:
-            return self._detect_speech_webrtcvad(audio)
-        audio_float = audio.astype(np.float32) / 32768.0
-        rms = np.sqrt(np.mean(audio_float ** 2))
-        base_threshold = self.vad_rms_threshold if self.vad_rms_threshold > 0 else threshold
-        if self.vad_noise_alpha > 0 and rms < base_threshold:
-            if self._noise_floor <= 0:
-                self._noise_floor = rms
-            else:
-                self._noise_floor = (1.0 - self.vad_noise_alpha) * self._noise_floor + self.vad_noise_alpha * rms
-        effective_threshold = max(base_threshold, self._noise_floor * self.vad_noise_multiplier)
-        if self._speech_active:
-            effective_threshold *= self.vad_hangover_factor
-        if self.debug_logs:
-            self._debug(
-                f"vad: rms={rms:.6f} base={base_threshold:.6f} "
-                f"noise={self._noise_floor:.6f} mult={self.vad_noise_multiplier:.2f} "
-                f"hangover={self.vad_hangover_factor:.2f} th={effective_threshold:.6f}"
-            )
-        return rms > effective_threshold
-
-    def _detect_speech_webrtcvad(self, audio: np.ndarray) -> bool:
-        if audio.size == 0:
-            return False
-        if audio.dtype != np.int16:
-            audio = audio.astype(np.int16)
-        frame_len = int(self.samplerate * (self.vad_webrtcvad_frame_ms / 1000.0))
-        if frame_len <= 0:
-            return False
-        total_frames = 0
-        speech_frames = 0
-        data = audio.tobytes()
-        bytes_per_frame = frame_len * 2  # int16 mono
-        for i in range(0, len(data) - bytes_per_frame + 1, bytes_per_frame):
-            frame = data[i:i + bytes_per_frame]
-            total_frames += 1
+        text_en = ""
+        if en_future is not None:
             try:
-                if self._webrtcvad.is_speech(frame, self.samplerate):
-                    speech_frames += 1
-            except Exception:
-                continue
-        if self.debug_logs:
-            self._debug(f"vad: webrtcvad frames={total_frames} speech={speech_frames}")
-        return speech_frames > 0
+                text_en = en_future.result(timeout=max(0.0, t0 + self.en_deadline_sec - time.monotonic()))
+            except FutureTimeout:
+                self._debug(f"transcribe(en): deadline {self.en_deadline_sec:.2f}s missed")
+            except Exception as e:
+                self._debug(f"transcribe(en): error {e}")
+        self._debug(f"transcribe: de={t_de * 1000:.0f}ms total={(time.monotonic() - t0) * 1000:.0f}ms")
+        return text_de, text_en
     
     def _merge_texts(self, text_de: str, text_en: str) -> str:
         """
@@ -403,22 +345,34 @@ class SmartMultiLanguageVoskRecognition:
         from difflib import SequenceMatcher
         return SequenceMatcher(None, word1.lower(), word2.lower()).ratio()
     
-    def _record_chunk(self) -> np.ndarray:
-        """Nimmt einen Audio-Chunk auf."""
+    def _record_chunk(self) -> tuple[AudioFrame, list[EndpointEvent]]:
+        """Nimmt einen Audio-Chunk auf (endet vorzeitig beim Äußerungsende)."""
         frames_to_record = int(self.samplerate * self.chunk_duration)
         
-        recording = record_audio_chunk(
-            frames_to_record,
-            samplerate=self.samplerate,
-            device_id=self.device_id,
-            channels=1,
-            dtype="int16",
-        )
-        
-        if self.enable_audio_processing:
-            recording = self._normalize_audio(recording)
-        
-        return recording.flatten()
+        if self._capture is not None:
+            # Lückenlos aus der Daueraufnahme lesen
+            recording, events = read_until_endpoint(self._capture, frames_to_record, self._endpointer)
+        else:
+            recording = record_audio_chunk(
+                frames_to_record,
+                samplerate=self.samplerate,
+                device_id=self.device_id,
+                channels=1,
+                dtype="int16",
+            )
+            recording = AudioFrame(recording[:, 0] if recording.ndim > 1 else recording, self.samplerate)
+            events = self._endpointer.process(recording)
+        
+        if self._preprocess is not None:
+            # Rauschschätzung nur in Pausen nachführen
+            speech = bool(events) or self._endpointer.in_speech
+            recording = self._preprocess.process(recording, speech=speech)
+            denoise = self._preprocess.denoise
+            if denoise is not None and self.debug_logs:
+                budget = " (über Budget!)" if denoise.over_budget else ""
+                self._debug(f"denoise: {denoise.cost_summary()}{budget}")
+        
+        return recording, events
     
     def _update_display(self, text: str) -> None:
         """Aktualisiere OLED-Display."""
@@ -445,6 +399,8 @@ class SmartMultiLanguageVoskRecognition:
         print(f"STATUS: {status_text} ({reason})")
         if active:
             self._last_activity_ts = time.time()
+            # Wake-Word: Verbindung zur API aufbauen, während die Frage gesprochen wird
+            prewarm()
             if announce:
                 play_beep_sequence(device=self.audio_output_device, announce=False)
         elif prev_active and not active:
@@ -616,8 +572,6 @@ class SmartMultiLanguageVoskRecognition:
         if self._awaiting_confirm:
             return
         if not self.listening_active:
-            self._speech_active = False
-            self._silence_sec = 0.0
             return
         text = (self.current_text or "").strip()
         if self._pending_prefix:
@@ -626,8 +580,6 @@ class SmartMultiLanguageVoskRecognition:
             else:
                 text = self._pending_prefix
         if not text:
-            self._speech_active = False
-            self._silence_sec = 0.0
             return
         if self.chat_assistant and self._last_chat_text != text:
             allowed, reason = chatgpt_filter_decision(text, self.min_chat_words, self.trivial_words)
@@ -649,8 +601,6 @@ class SmartMultiLanguageVoskRecognition:
         self._pending_prefix = ""
         if self.semantic_processor:
             self.semantic_processor.reset()
-        self._speech_active = False
-        self._silence_sec = 0.0
 
     def _check_commands(self, text: str) -> str | None:
         norm = self._normalize_command_text(text)
@@ -669,6 +619,12 @@ class SmartMultiLanguageVoskRecognition:
         return None
 
     def _should_process_text(self, text: str) -> bool:
+        if barge_in_active() and is_playback_active():
+            # Barge-in: während der Ausgabe zählt nur STOPP
+            if self._check_commands(text) == "stop":
+                stop_playback()
+                self._set_listening(False, "STOPP erkannt", context_mode=False)
+            return False
         if self._handle_history_command(text):
             return False
         cmd = self._check_commands(text)
@@ -693,50 +649,44 @@ class SmartMultiLanguageVoskRecognition:
         """Verarbeite einen Audio-Chunk."""
         chunk_audio = None
         preroll_tail = self._preroll_tail
+        ended = False
         try:
-            # Während Ausgabe nichts aufnehmen
-            wait_for_playback_end()
+            # Während Ausgabe nichts aufnehmen (außer mit Echokompensation: Barge-in)
+            if not barge_in_active():
+                wait_for_playback_end()
             if self._awaiting_confirm and self._confirm_deadline and time.time() > self._confirm_deadline:
                 self._cancel_confirmation()
                 return
             # Audio aufnehmen
+            speech_was_active = self._endpointer.in_speech
             self._debug("record_chunk: start")
-            audio_data = self._record_chunk()
-            chunk_audio = audio_data
+            chunk_audio, events = self._record_chunk()
+            audio_data = chunk_audio.pcm
             self._debug(f"record_chunk: done len={len(audio_data)}")
             
             if not self.is_running:
                 return
             
-            # Voice Activity Detection
-            speech_was_active = self._speech_active
-            if not self._detect_speech(audio_data, threshold=0.005):
-                if self.pause_duration:
-                    self._silence_sec += self.chunk_duration
-                    if self._speech_active and self._silence_sec >= self.pause_duration:
-                        self._finalize_current_text()
+            # Voice Activity Detection (Äußerungsende → Abschluss im finally)
+            ended = any(e.kind == UTTERANCE_END for e in events)
+            if self.debug_logs:
+                for e in events:
+                    self._debug(f"endpoint: {e.kind} t={e.time_sec:.2f}s")
+            if not events and not self._endpointer.in_speech:
                 self._debug("vad: no speech")
                 return
-            else:
-                if self.pause_duration:
-                    self._speech_active = True
-                    self._silence_sec = 0.0
-                if not speech_was_active and self._preroll_samples > 0 and preroll_tail.size:
-                    audio_data = np.concatenate([preroll_tail, audio_data])
-                    if self.debug_logs:
-                        self._debug(f"vad: preroll {len(preroll_tail)} samples prepended")
+            started = any(e.kind == UTTERANCE_START for e in events)
+            if started and not speech_was_active and self._preroll_samples > 0 and len(preroll_tail):
+                audio_data = AudioFrame.concat([preroll_tail, chunk_audio]).pcm
+                if self.debug_logs:
+                    self._debug(f"vad: preroll {len(preroll_tail)} samples prepended")
             
-            # Transkribiere mit deutschem Modell (Hauptsprache)
-            text_de = self._transcribe_audio_de(audio_data)
+            # Deutsch (Hauptsprache) und Englisch (Ergänzungen) parallel transkribieren
+            text_de, text_en = self._transcribe_both(audio_data)
             if text_de:
                 self._debug(f"transcribe(de): '{text_de}'")
-            
-            # Transkribiere mit englischem Modell (nur wenn verfügbar)
-            text_en = ""
-            if self.model_en:
-                text_en = self._transcribe_audio_en(audio_data)
-                if text_en:
-                    self._debug(f"transcribe(en): '{text_en}'")
+            if text_en:
+                self._debug(f"transcribe(en): '{text_en}'")
             
             # Kombiniere Texte intelligent
             text = self._merge_texts(text_de, text_en)
@@ -747,7 +697,7 @@ class SmartMultiLanguageVoskRecognition:
                     text = f"{self._pending_prefix} {text}".strip()
                     self._pending_prefix = ""
                     self._debug(f"pending_prefix merged: '{text}'")
-                if time.time() < self._ignore_until:
+                if time.time() < self._ignore_until and not barge_in_active():
                     if self.chat_filter_debug:
                         print("ChatGPT-Filter: blockiert (nach TTS)")
                     self._debug("ignore: after tts")
@@ -892,10 +842,10 @@ class SmartMultiLanguageVoskRecognition:
             print(f"Fehler bei Verarbeitung: {e}")
         finally:
             if chunk_audio is not None and self._preroll_samples > 0:
-                if chunk_audio.size > self._preroll_samples:
-                    self._preroll_tail = chunk_audio[-self._preroll_samples:].copy()
-                else:
-                    self._preroll_tail = chunk_audio.copy()
+                # Frames werden nicht mehr verändert: Ansicht statt Kopie
+                self._preroll_tail = chunk_audio.tail(self._preroll_samples)
+            if ended:
+                self._finalize_current_text()
     
     def start(self, oled: Optional[OledDisplay] = None) -> None:
         """Starte die Live-Spracherkennung."""
@@ -911,6 +861,10 @@ class SmartMultiLanguageVoskRecognition:
 
         # Geräteauswahl anzeigen + Fallback
         self.device_id = select_input_device(self.device_spec, announce=True)
+        self._capture = open_capture_reader(self.device_id, self.samplerate)
+        self._endpointer.reset()
+        if self._preprocess is not None:
+            self._preprocess.reset()
         
         if self.oled:
             self.oled.show_listening()
@@ -947,6 +901,12 @@ class SmartMultiLanguageVoskRecognition:
         self._paused_notice = False
         self._status_text = None
         self.context_mode = False
+        self._capture = None
+        if self._en_executor is not None:
+            self._en_executor.shutdown(wait=False, cancel_futures=True)
+            self._en_executor = None
+            self._en_future = None
+        release_capture_engine()
         if self.oled:
             self.oled.clear()
         print("Spracherkennung gestoppt.")
@@ -971,14 +931,14 @@ def run_smart_multilang_recognition(
     # ChatGPT-Assistent (optional)
     chat_assistant = None
     if enable_chatgpt:
-        from openai import OpenAI
-        client = OpenAI(api_key=settings.openai_api_key)
+        client = get_client(settings)
         kwargs = dict(
             client=client,
             model_chat=settings.model_chat,
             model_tts=settings.model_tts,
             tts_voice=settings.tts_voice,
             audio_output_device=settings.audio_output_device,
+            stream_responses=settings.chat_streaming,
             echo_input_before_chat=settings.echo_input_before_chat,
             echo_input_local_tts=settings.echo_input_local_tts,
             announce_chat_request=settings.announce_chat_request,
@@ -1014,6 +974,7 @@ def run_smart_multilang_recognition(
         vad_use_webrtcvad=settings.vad_use_webrtcvad,
         vad_webrtcvad_mode=settings.vad_webrtcvad_mode,
         vad_webrtcvad_frame_ms=settings.vad_webrtcvad_frame_ms,
+        enable_noise_suppression=settings.enable_noise_suppression,
         wake_phrases=tuple(settings.wake_phrases),
         context_phrases=tuple(settings.context_phrases),
         stop_phrases=tuple(settings.stop_phrases),
@@ -1033,6 +994,7 @@ def run_smart_multilang_recognition(
         pause_duration=settings.vosk_pause_duration,
         confirm_timeout_sec=settings.confirm_timeout_sec,
         ready_hold_sec=settings.ready_hold_sec,
+        en_deadline_sec=settings.smart_multilang_en_deadline_sec,
     )
 
     if chat_assistant and hasattr(chat_assistant, "set_on_tts_done"):
@@ -6,6 +6,8 @@ import numpy as np
 import sounddevice as sd
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from typing import Callable, Optional
 from openai import OpenAI
 
@@ -15,13 +17,20 @@ from .audio_io import (
     select_input_device,
     wait_for_playback_end,
     is_playback_active,
+    barge_in_active,
     play_beep_sequence,
     play_hangup_tone,
     stop_playback,
     record_audio_chunk,
+    open_capture_reader,
+    release_capture_engine,
     play_wav_bytes,
     play_status_listening,
 )
+from .audio_capture import CaptureReader
+from .vad import VoiceActivityDetector
+from .audio_frame import AudioFrame
+from .noise_suppression import SpectralNoiseSuppressor
 from .oled_display import OledDisplay
 from .sentence_detection import (
     SemanticSpeechRecognition,
@@ -30,6 +39,10 @@ from .sentence_detection import (
     chatgpt_filter_message,
 )
 from .chat_assistant import ChatAssistant
+from .keyword_spotting import HISTORY_NUMBER_WORDS, CommandRecognizer, history_phrases, load_grammar_model
+from .stt_upload import transcribe_upload
+from .stt_hedge import make_transcribe_fn
+from .openai_client import get_client, prewarm
 
 
 class LiveSpeechRecognition:
@@ -59,22 +72,44 @@ class LiveSpeechRecognition:
                  transcribe_fn: Optional[Callable[[bytes], str]] = None,
                  min_speech_sec: float = 0.6,
                  play_input_before_stt: bool = False,
-                 confirm_min_speech_sec: float = 0.2):
+                 confirm_min_speech_sec: float = 0.2,
+                 enable_noise_suppression: bool = False,
+                 command_model_path: str | None = None,
+                 speculative_stt: bool = False,
+                 segment_min_sec: float = 2.0):
         self.client = client
         self.model_stt = model_stt
-        self.transcribe_fn = transcribe_fn
+        # Ohne eigene Funktion: OpenAI-STT direkt aus dem Speicher
+        self.transcribe_fn = transcribe_fn or partial(transcribe_upload, client, model_stt)
         self.device_spec = device
         self.device_id = _resolve_device_id(device)
         self.samplerate = 16000
         self.chunk_duration = 0.5  # Sekunden pro Chunk
         self.pause_duration = pause_duration if pause_duration is not None else 0.9
         self.silence_threshold = 0.02  # RMS-Schwellwert (0..1)
-        self.noise_floor = 0.0
-        self.noise_alpha = 0.95
+        # Chunk-Pegel gegen adaptiven Rauschpegel (EMA über leise Frames)
+        self._vad = VoiceActivityDetector(
+            samplerate=self.samplerate,
+            rms_threshold=self.silence_threshold,
+            noise_multiplier=3.0,
+            noise_alpha=0.05,
+            hangover_factor=1.0,
+            use_webrtcvad=False,
+            noise_alpha_sec=self.chunk_duration,
+        )
+        # Optionale spektrale Rauschunterdrückung vor der Transkription
+        self._denoise = SpectralNoiseSuppressor(self.samplerate) if enable_noise_suppression else None
         self.min_speech_sec = min_speech_sec
         self.play_input_before_stt = play_input_before_stt
         self.confirm_min_speech_sec = confirm_min_speech_sec
         self.max_buffer_sec = 20.0
+        # Lange Äußerungen: abgeschlossene Segmente (an kurzen Pausen) schon
+        # während des Sprechens im Hintergrund transkribieren
+        self.speculative_stt = speculative_stt
+        self.segment_min_sec = max(self.chunk_duration, segment_min_sec)
+        self._segments: list[Future] = []
+        self._segment_sec = 0.0
+        self._stt_executor: Optional[ThreadPoolExecutor] = None
         self.is_running = False
         self.current_text = ""
         self.oled: Optional[OledDisplay] = None
@@ -118,46 +153,54 @@ class LiveSpeechRecognition:
         self.context_mode = False
         self.prompt_new = prompt_new
         self.prompt_context = prompt_context
+        self._capture: Optional[CaptureReader] = None
+        # Kurzbefehle lokal erkennen, STT nur für alles andere
+        self._commands = self._init_commands(command_model_path)
         
     def set_text_callback(self, callback: Callable[[str], None]) -> None:
         """Setze Callback-Funktion, die bei neuem Text aufgerufen wird."""
         self.text_callback = callback
     
-    def _transcribe_audio(self, wav_bytes: bytes) -> str:
-        """Transkribiere Audio-Daten zu Text."""
-        if self.play_input_before_stt:
+    def _init_commands(self, model_path: str | None) -> Optional[CommandRecognizer]:
+        """Lokale Grammatik für Kurzbefehle (ja/nein, stopp, historie N, Wake-Phrasen)."""
+        model = load_grammar_model(model_path)
+        if model is None:
+            return None
+        phrases = (
+            *self.confirm_phrases, *self.reject_phrases, *self.stop_phrases,
+            *self.wake_phrases, *self.context_phrases, *history_phrases(),
+        )
+        try:
+            return CommandRecognizer(model, phrases, self.samplerate)
+        except Exception as e:
+            print(f"Lokale Befehlserkennung nicht verfügbar ({e}).")
+            return None
+
+    def _transcribe_audio(self, wav_bytes: bytes, play_input: bool = True, commands: bool = True) -> str:
+        """Transkribiere Audio-Daten zu Text (Kurzbefehle lokal, sonst STT).
+
+        Teil-Segmente einer Äußerung laufen mit commands=False: Kurzbefehle
+        werden nur für die ganze Äußerung erkannt.
+        """
+        if self.play_input_before_stt and play_input:
             try:
                 play_wav_bytes(wav_bytes, device=self.audio_output_device, announce=False)
             except Exception as e:
                 print(f"Audio-Playback-Fehler: {e}")
-        if self.transcribe_fn:
+        if commands and self._commands is not None:
             try:
-                return (self.transcribe_fn(wav_bytes) or "").strip()
+                command = self._commands.recognize_wav(wav_bytes)
             except Exception as e:
-                print(f"Whisper.cpp Fehler: {e}")
-                return ""
-        import tempfile
-        import os
-        
-        wav_path = None
+                command = None
+                self._debug(f"commands: error {e}")
+            if command:
+                self._debug(f"commands: local '{command}'")
+                return command
         try:
-            fd, wav_path = tempfile.mkstemp(suffix=".wav")
-            os.close(fd)
-            with open(wav_path, "wb") as f:
-                f.write(wav_bytes)
-            
-            with open(wav_path, "rb") as f_audio:
-                stt = self.client.audio.transcriptions.create(
-                    model=self.model_stt,
-                    file=f_audio
-                )
-            return (stt.text or "").strip()
-        finally:
-            if wav_path:
-                try:
-                    os.remove(wav_path)
-                except OSError:
-                    pass
+            return (self.transcribe_fn(wav_bytes) or "").strip()
+        except Exception as e:
+            print(f"STT-Fehler: {e}")
+            return ""
     
     def _record_chunk(self) -> np.ndarray:
         """Nimmt einen Audio-Chunk auf und gibt Audio-Frames zurück."""
@@ -165,6 +208,9 @@ class LiveSpeechRecognition:
         dtype = "int16"
         frames_to_record = int(self.samplerate * self.chunk_duration)
         
+        if self._capture is not None:
+            # Lückenlos aus der Daueraufnahme lesen
+            return self._capture.read(frames_to_record)
         recording = record_audio_chunk(
             frames_to_record,
             samplerate=self.samplerate,
@@ -184,6 +230,47 @@ class LiveSpeechRecognition:
             wf.writeframes(audio.tobytes())
         return buf.getvalue()
     
+    def _buffer_sec(self) -> float:
+        return sum(len(a) for a in self._audio_buffer) / self.samplerate
+
+    def _submit_segment(self, reason: str) -> None:
+        """Gepuffertes Audio als Segment im Hintergrund transkribieren."""
+        if self._stt_executor is None:
+            self._stt_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="stt-segment")
+        sec = self._buffer_sec()
+        wav_bytes = self._audio_to_wav(np.concatenate(self._audio_buffer))
+        self._audio_buffer.clear()
+        self._segment_sec += sec
+        self._segments.append(self._stt_executor.submit(self._transcribe_audio, wav_bytes, False, False))
+        self._debug(f"segment {len(self._segments)}: {sec:.1f}s submitted ({reason})")
+
+    def _finish_utterance(self) -> str:
+        """Letztes Segment transkribieren und mit den Hintergrund-Segmenten zusammensetzen."""
+        segments, self._segments = self._segments, []
+        self._segment_sec = 0.0
+        last = ""
+        if self._audio_buffer:
+            wav_bytes = self._audio_to_wav(np.concatenate(self._audio_buffer))
+            self._audio_buffer.clear()
+            # Wiedergabe und Befehlserkennung nur, wenn die Äußerung nicht in Segmenten lief
+            last = self._transcribe_audio(wav_bytes, play_input=not segments, commands=not segments)
+        parts = []
+        for i, future in enumerate(segments, 1):
+            try:
+                parts.append(future.result())
+            except Exception as e:
+                print(f"STT-Fehler (Segment {i}): {e}")
+        parts.append(last)
+        if segments:
+            self._debug(f"segments: {len(segments)} + final stitched")
+        return " ".join(p.strip() for p in parts if p and p.strip())
+
+    def _discard_segments(self) -> None:
+        for future in self._segments:
+            future.cancel()
+        self._segments = []
+        self._segment_sec = 0.0
+
     def _update_display(self, text: str) -> None:
         """Aktualisiere OLED-Display mit Laufband-Text."""
         if self.oled and self.oled.device:
@@ -210,6 +297,8 @@ class LiveSpeechRecognition:
         print(f"STATUS: {status_text} ({reason})")
         if active:
             self._last_activity_ts = time.time()
+            # Wake-Word: Verbindung zur API aufbauen, während die Frage gesprochen wird
+            prewarm()
             if announce:
                 play_beep_sequence(device=self.audio_output_device, announce=False)
         elif prev_active and not active:
@@ -269,21 +358,7 @@ class LiveSpeechRecognition:
         if not match:
             return None
         word = match.group(1)
-        mapping = {
-            "eins": 1,
-            "ein": 1,
-            "zwei": 2,
-            "drei": 3,
-            "vier": 4,
-            "fuenf": 5,
-            "fünf": 5,
-            "sechs": 6,
-            "sieben": 7,
-            "acht": 8,
-            "neun": 9,
-            "zehn": 10,
-        }
-        return mapping.get(word)
+        return HISTORY_NUMBER_WORDS.get(word)
 
     def _handle_history_command(self, text: str) -> bool:
         if not self.chat_assistant:
@@ -398,8 +473,16 @@ class LiveSpeechRecognition:
         if not text:
             return
         self._last_activity_ts = time.time()
+        if barge_in_active() and is_playback_active():
+            # Barge-in: während der Ausgabe zählt nur STOPP
+            if self._check_commands(text) == "stop":
+                stop_playback()
+                self._set_listening(False, "STOPP erkannt", context_mode=False)
+                self._debug("command: stop (barge-in)")
+            return
         now = time.time()
-        if now < self._ignore_until:
+        # Mit Echokompensation ist keine Sperrzeit nach der Ausgabe nötig
+        if now < self._ignore_until and not barge_in_active():
             if self.chat_filter_debug:
                 print("ChatGPT-Filter: blockiert (nach TTS)")
             self._debug("ignore: after tts")
@@ -559,8 +642,9 @@ class LiveSpeechRecognition:
     def _process_chunk(self) -> None:
         """Nimmt einen Chunk auf, erkennt Ende der Aussage, transkribiert und aktualisiert das Display."""
         try:
-            # Während Ausgabe nichts aufnehmen
-            wait_for_playback_end()
+            # Während Ausgabe nichts aufnehmen (außer mit Echokompensation: Barge-in)
+            if not barge_in_active():
+                wait_for_playback_end()
             if self._awaiting_confirm and self._confirm_deadline and time.time() > self._confirm_deadline:
                 self._cancel_confirmation()
                 return
@@ -568,9 +652,10 @@ class LiveSpeechRecognition:
             audio = self._record_chunk()
             self._debug(f"record_chunk: done len={len(audio)}")
 
-            # Falls währenddessen Ausgabe startet, Chunk verwerfen
-            if is_playback_active():
+            # Falls währenddessen Ausgabe startet, Chunk verwerfen (ohne Echokompensation)
+            if is_playback_active() and not barge_in_active():
                 self._audio_buffer.clear()
+                self._discard_segments()
                 self._silence_sec = 0.0
                 self._speech_active = False
                 self._speech_sec = 0.0
@@ -581,29 +666,30 @@ class LiveSpeechRecognition:
                 return
 
             # RMS für einfache Sprachaktivität
-            rms = float(np.sqrt(np.mean(audio.astype(np.float32) ** 2)) / 32768.0) if audio.size else 0.0
-            if not self._speech_active:
-                # Rauschpegel lernen (EMA)
-                if self.noise_floor == 0.0:
-                    self.noise_floor = rms
-                else:
-                    self.noise_floor = (self.noise_alpha * self.noise_floor) + ((1 - self.noise_alpha) * rms)
-            dynamic_threshold = max(self.silence_threshold, self.noise_floor * 3.0)
-            is_speech = rms > dynamic_threshold
+            frame = AudioFrame(audio, self.samplerate)
+            vad = self._vad.analyze(frame, in_speech=self._speech_active)
+            is_speech = vad.rms > vad.threshold
+            if self._denoise is not None:
+                # Jeder Chunk läuft durch (Rauschschätzung in Pausen), Latenz ein Hop
+                audio = self._denoise.process_frame(frame, speech=is_speech).pcm
+                if self.debug_logs:
+                    budget = " (über Budget!)" if self._denoise.over_budget else ""
+                    self._debug(f"denoise: {self._denoise.cost_summary()}{budget}")
 
             if is_speech:
                 self._audio_buffer.append(audio)
                 self._silence_sec = 0.0
                 self._speech_active = True
                 self._speech_sec += self.chunk_duration
-                total_sec = (sum(len(a) for a in self._audio_buffer) / self.samplerate)
-                if total_sec >= self.max_buffer_sec:
-                    wav_bytes = self._audio_to_wav(np.concatenate(self._audio_buffer))
-                    self._audio_buffer.clear()
+                if self._buffer_sec() >= self.max_buffer_sec:
+                    if self.speculative_stt:
+                        # Äußerung läuft weiter: nur das Segment abschicken
+                        self._submit_segment("max_buffer")
+                        return
                     self._speech_active = False
                     self._speech_sec = 0.0
                     self._debug("max_buffer reached: transcribe")
-                    text = self._transcribe_audio(wav_bytes)
+                    text = self._finish_utterance()
                     self._process_text(text)
                 return
 
@@ -613,24 +699,31 @@ class LiveSpeechRecognition:
 
             # Stille nach Sprache erkennen
             self._silence_sec += self.chunk_duration
-            if self._silence_sec >= self.pause_duration and self._audio_buffer:
-                total_sec = (sum(len(a) for a in self._audio_buffer) / self.samplerate)
+            if (
+                self.speculative_stt
+                and self._silence_sec < self.pause_duration
+                and self._buffer_sec() >= self.segment_min_sec
+            ):
+                # Kurze Pause mitten in der Äußerung: Segment schon transkribieren
+                self._submit_segment("pause")
+                return
+            if self._silence_sec >= self.pause_duration and (self._audio_buffer or self._segments):
+                total_sec = self._segment_sec + self._buffer_sec()
                 min_sec = self.confirm_min_speech_sec if self._awaiting_confirm else self.min_speech_sec
                 if total_sec < min_sec:
                     # Zu kurz -> verwerfen (verhindert Rauschen/Artefakte)
                     self._audio_buffer.clear()
+                    self._discard_segments()
                     self._speech_active = False
                     self._silence_sec = 0.0
                     self._speech_sec = 0.0
                     self._debug("speech too short: drop")
                     return
-                wav_bytes = self._audio_to_wav(np.concatenate(self._audio_buffer))
-                self._audio_buffer.clear()
                 self._speech_active = False
                 self._silence_sec = 0.0
                 self._speech_sec = 0.0
                 self._debug("silence: transcribe")
-                text = self._transcribe_audio(wav_bytes)
+                text = self._finish_utterance()
                 self._process_text(text)
         except Exception as e:
             print(f"Fehler bei Verarbeitung: {e}")
@@ -675,6 +768,7 @@ class LiveSpeechRecognition:
             except sd.PortAudioError as e:
                 print(f"Audio-Fehler: {e}")
                 return
+            self._capture = open_capture_reader(self.device_id, self.samplerate)
 
             # Kontinuierliche Verarbeitung
             while self.is_running:
@@ -693,6 +787,10 @@ class LiveSpeechRecognition:
         """Stoppe die Live-Spracherkennung."""
         self.is_running = False
         self._audio_buffer.clear()
+        self._discard_segments()
+        if self._stt_executor is not None:
+            self._stt_executor.shutdown(wait=False, cancel_futures=True)
+            self._stt_executor = None
         self._silence_sec = 0.0
         self._speech_active = False
         self._speech_sec = 0.0
@@ -700,6 +798,8 @@ class LiveSpeechRecognition:
         self.listening_active = False
         self._paused_notice = False
         self._status_text = None
+        self._capture = None
+        release_capture_engine()
         if self.oled:
             self.oled.clear()
         print("Spracherkennung gestoppt.")
@@ -710,21 +810,8 @@ def run_live_recognition(enable_chatgpt: bool = False):
     import sys
     
     settings = load_settings()
-    client = OpenAI(api_key=settings.openai_api_key)
-    transcribe_fn = None
-    if settings.use_whisper_cpp:
-        from .whisper_cpp import transcribe_wav_bytes
-        def _whispercpp_transcribe(wav_bytes: bytes) -> str:
-            return transcribe_wav_bytes(
-                wav_bytes,
-                bin_path=settings.whisper_cpp_bin,
-                model_path=settings.whisper_cpp_model,
-                language=settings.whisper_cpp_language,
-                threads=settings.whisper_cpp_threads,
-                temperature=settings.whisper_cpp_temperature,
-                extra_args=settings.whisper_cpp_extra_args,
-            )
-        transcribe_fn = _whispercpp_transcribe
+    client = get_client(settings)
+    transcribe_fn = make_transcribe_fn(settings, client)
     
     # OLED initialisieren
     oled = None
@@ -749,6 +836,7 @@ def run_live_recognition(enable_chatgpt: bool = False):
             model_tts=settings.model_tts,
             tts_voice=settings.tts_voice,
             audio_output_device=settings.audio_output_device,
+            stream_responses=settings.chat_streaming,
             echo_input_before_chat=settings.echo_input_before_chat,
             echo_input_local_tts=settings.echo_input_local_tts,
             announce_chat_request=settings.announce_chat_request,
@@ -798,6 +886,10 @@ def run_live_recognition(enable_chatgpt: bool = False):
         min_speech_sec=settings.min_speech_sec,
         play_input_before_stt=settings.play_input_before_stt,
         confirm_min_speech_sec=settings.confirm_min_speech_sec,
+        enable_noise_suppression=settings.enable_noise_suppression,
+        command_model_path=settings.vosk_command_model_path,
+        speculative_stt=settings.live_speculative_stt,
+        segment_min_sec=settings.live_segment_min_sec,
     )
 
     if chat_assistant and hasattr(chat_assistant, "set_on_tts_done"):
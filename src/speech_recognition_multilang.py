@@ -13,14 +13,22 @@ from .audio_io import (
     _resolve_device_id,
     select_input_device,
     wait_for_playback_end,
+    is_playback_active,
+    barge_in_active,
     play_beep_sequence,
     play_hangup_tone,
     stop_playback,
     record_audio_chunk,
+    open_capture_reader,
+    release_capture_engine,
     play_status_listening,
 )
+from .audio_capture import CaptureReader
+from .vad import VoiceActivityDetector
+from .endpointing import UTTERANCE_END, Endpointer, EndpointEvent, read_until_endpoint
 from .oled_display import OledDisplay
 from .chat_assistant import ChatAssistant
+from .openai_client import get_client, prewarm
 from .sentence_detection import should_send_to_chatgpt, chatgpt_filter_decision, chatgpt_filter_message
 
 
@@ -227,8 +235,11 @@ class LiveMultiLanguageVoskRecognition:
         self.pause_duration = pause_duration if pause_duration is not None else 0.0
         if self.pause_duration <= 0:
             self.pause_duration = None
-        self._silence_sec = 0.0
-        self._speech_active = False
+        # Äußerungsende auf 30-ms-Frames (RMS), unabhängig von der Chunk-Länge
+        self._endpointer = Endpointer(
+            VoiceActivityDetector(samplerate=self.samplerate, use_webrtcvad=False),
+            pause_duration=self.pause_duration or 0.6,
+        )
         self.debug_logs = debug_logs
         self.audio_output_device = audio_output_device
         self.confirm_before_chat = confirm_before_chat
@@ -248,17 +259,22 @@ class LiveMultiLanguageVoskRecognition:
         self.context_mode = False
         self.prompt_new = prompt_new
         self.prompt_context = prompt_context
+        self._capture: Optional[CaptureReader] = None
     
     def set_text_callback(self, callback: Callable[[str], None]) -> None:
         """Setze Callback-Funktion, die bei neuem Text aufgerufen wird."""
         self.text_callback = callback
     
-    def _record_chunk(self) -> np.ndarray:
-        """Nimmt einen Audio-Chunk auf."""
+    def _record_chunk(self) -> tuple[np.ndarray, list[EndpointEvent]]:
+        """Nimmt einen Audio-Chunk auf (endet vorzeitig beim Äußerungsende)."""
         channels = 1
         dtype = "int16"
         frames_to_record = int(self.samplerate * self.chunk_duration)
         
+        if self._capture is not None:
+            # Lückenlos aus der Daueraufnahme lesen
+            frame, events = read_until_endpoint(self._capture, frames_to_record, self._endpointer)
+            return frame.pcm, events
         recording = record_audio_chunk(
             frames_to_record,
             samplerate=self.samplerate,
@@ -270,7 +286,7 @@ class LiveMultiLanguageVoskRecognition:
         if len(recording.shape) > 1:
             recording = recording[:, 0]
         
-        return recording
+        return recording, self._endpointer.process(recording)
     
     def _audio_to_wav_bytes(self, audio_data: np.ndarray) -> bytes:
         """Konvertiere numpy-Array zu WAV-Bytes."""
@@ -307,6 +323,8 @@ class LiveMultiLanguageVoskRecognition:
         print(f"STATUS: {status_text} ({reason})")
         if active:
             self._last_activity_ts = time.time()
+            # Wake-Word: Verbindung zur API aufbauen, während die Frage gesprochen wird
+            prewarm()
             if announce:
                 play_beep_sequence(device=self.audio_output_device, announce=False)
         elif prev_active and not active:
@@ -474,8 +492,6 @@ class LiveMultiLanguageVoskRecognition:
         if self._awaiting_confirm:
             return
         if not self.listening_active:
-            self._speech_active = False
-            self._silence_sec = 0.0
             return
         text = (self.current_text or "").strip()
         if self._pending_prefix:
@@ -484,8 +500,6 @@ class LiveMultiLanguageVoskRecognition:
             else:
                 text = self._pending_prefix
         if not text:
-            self._speech_active = False
-            self._silence_sec = 0.0
             return
         if self.chat_assistant and self._last_chat_text != text:
             allowed, reason = chatgpt_filter_decision(text, self.min_chat_words, self.trivial_words)
@@ -505,8 +519,6 @@ class LiveMultiLanguageVoskRecognition:
                 self._announce_chat_filter_block(reason)
         self.current_text = ""
         self._pending_prefix = ""
-        self._speech_active = False
-        self._silence_sec = 0.0
 
     def _check_commands(self, text: str) -> str | None:
         norm = self._normalize_command_text(text)
@@ -525,6 +537,12 @@ class LiveMultiLanguageVoskRecognition:
         return None
 
     def _should_process_text(self, text: str) -> bool:
+        if barge_in_active() and is_playback_active():
+            # Barge-in: während der Ausgabe zählt nur STOPP
+            if self._check_commands(text) == "stop":
+                stop_playback()
+                self._set_listening(False, "STOPP erkannt", context_mode=False)
+            return False
         if self._handle_history_command(text):
             return False
         cmd = self._check_commands(text)
@@ -547,18 +565,25 @@ class LiveMultiLanguageVoskRecognition:
     
     def _process_chunk(self) -> None:
         """Verarbeite einen Audio-Chunk."""
+        ended = False
         try:
-            # Während Ausgabe nichts aufnehmen
-            wait_for_playback_end()
+            # Während Ausgabe nichts aufnehmen (außer mit Echokompensation: Barge-in)
+            if not barge_in_active():
+                wait_for_playback_end()
             if self._awaiting_confirm and self._confirm_deadline and time.time() > self._confirm_deadline:
                 self._cancel_confirmation()
                 return
             self._debug("record_chunk: start")
-            audio_data = self._record_chunk()
+            audio_data, events = self._record_chunk()
             self._debug(f"record_chunk: done len={len(audio_data)}")
             
             if not self.is_running:
                 return
+            # Äußerungsende → Abschluss im finally
+            ended = any(e.kind == UTTERANCE_END for e in events)
+            if self.debug_logs:
+                for e in events:
+                    self._debug(f"endpoint: {e.kind} t={e.time_sec:.2f}s")
             
             wav_bytes = self._audio_to_wav_bytes(audio_data)
             
@@ -566,18 +591,11 @@ class LiveMultiLanguageVoskRecognition:
             if self.mode == "best":
                 lang, text = self.vosk.transcribe_audio_best(wav_bytes)
                 if not text:
-                    if self.pause_duration:
-                        self._silence_sec += self.chunk_duration
-                        if self._speech_active and self._silence_sec >= self.pause_duration:
-                            self._finalize_current_text()
                     return
-                if self.pause_duration:
-                    self._speech_active = True
-                    self._silence_sec = 0.0
                 if text:
                     self._debug(f"transcribe(best): '{text}'")
                     self._last_activity_ts = time.time()
-                    if time.time() < self._ignore_until:
+                    if time.time() < self._ignore_until and not barge_in_active():
                         if self.chat_filter_debug:
                             print("ChatGPT-Filter: blockiert (nach TTS)")
                         self._debug("ignore: after tts")
@@ -623,18 +641,11 @@ class LiveMultiLanguageVoskRecognition:
             elif self.mode == "combined":
                 text = self.vosk.transcribe_audio_combined(wav_bytes)
                 if not text:
-                    if self.pause_duration:
-                        self._silence_sec += self.chunk_duration
-                        if self._speech_active and self._silence_sec >= self.pause_duration:
-                            self._finalize_current_text()
                     return
-                if self.pause_duration:
-                    self._speech_active = True
-                    self._silence_sec = 0.0
                 if text:
                     self._debug(f"transcribe(combined): '{text}'")
                     self._last_activity_ts = time.time()
-                    if time.time() < self._ignore_until:
+                    if time.time() < self._ignore_until and not barge_in_active():
                         if self.chat_filter_debug:
                             print("ChatGPT-Filter: blockiert (nach TTS)")
                         self._debug("ignore: after tts")
@@ -680,14 +691,7 @@ class LiveMultiLanguageVoskRecognition:
             elif self.mode == "all":
                 results = self.vosk.transcribe_audio(wav_bytes)
                 if not results:
-                    if self.pause_duration:
-                        self._silence_sec += self.chunk_duration
-                        if self._speech_active and self._silence_sec >= self.pause_duration:
-                            self._finalize_current_text()
                     return
-                if self.pause_duration:
-                    self._speech_active = True
-                    self._silence_sec = 0.0
                 if results:
                     for lang, text in results.items():
                         print(f"[{lang.upper()}] {text}")
@@ -696,7 +700,7 @@ class LiveMultiLanguageVoskRecognition:
                     text = results[best_lang]
                     self._debug(f"transcribe(all best={best_lang}): '{text}'")
                     self._last_activity_ts = time.time()
-                    if time.time() < self._ignore_until:
+                    if time.time() < self._ignore_until and not barge_in_active():
                         if self.chat_filter_debug:
                             print("ChatGPT-Filter: blockiert (nach TTS)")
                         self._debug("ignore: after tts")
@@ -745,6 +749,9 @@ class LiveMultiLanguageVoskRecognition:
                 
         except Exception as e:
             print(f"Fehler bei Verarbeitung: {e}")
+        finally:
+            if ended:
+                self._finalize_current_text()
     
     def start(self, oled: Optional[OledDisplay] = None) -> None:
         """Starte die Live-Spracherkennung."""
@@ -759,6 +766,8 @@ class LiveMultiLanguageVoskRecognition:
 
         # Geräteauswahl anzeigen + Fallback
         self.vosk.device_id = select_input_device(self.vosk.device_spec, announce=True)
+        self._capture = open_capture_reader(self.vosk.device_id, self.samplerate)
+        self._endpointer.reset()
         
         if self.oled:
             self.oled.show_listening()
@@ -797,6 +806,8 @@ class LiveMultiLanguageVoskRecognition:
         self.context_mode = False
         self.listening_active = False
         self._paused_notice = False
+        self._capture = None
+        release_capture_engine()
         if self.oled:
             self.oled.clear()
         print("Spracherkennung gestoppt.")
@@ -851,14 +862,14 @@ def run_multilang_vosk_recognition(
     # ChatGPT-Assistent (optional)
     chat_assistant = None
     if enable_chatgpt:
-        from openai import OpenAI
-        client = OpenAI(api_key=settings.openai_api_key)
+        client = get_client(settings)
         kwargs = dict(
             client=client,
             model_chat=settings.model_chat,
             model_tts=settings.model_tts,
             tts_voice=settings.tts_voice,
             audio_output_device=settings.audio_output_device,
+            stream_responses=settings.chat_streaming,
             echo_input_before_chat=settings.echo_input_before_chat,
             echo_input_local_tts=settings.echo_input_local_tts,
             announce_chat_request=settings.announce_chat_request,
@@ -5,6 +5,7 @@ import numpy as np
 import sounddevice as sd
 import time
 import re
+from functools import partial
 from typing import Callable, Optional
 from openai import OpenAI
 
@@ -15,6 +16,10 @@ from .gpio_inputs import PushToTalk
 from .led_status import LedStatus, Status
 from .sentence_detection import SemanticSpeechRecognition
 from .chat_assistant import ChatAssistant
+from .keyword_spotting import HISTORY_NUMBER_WORDS, CommandRecognizer, history_phrases, load_grammar_model
+from .stt_upload import transcribe_upload
+from .stt_hedge import make_transcribe_fn
+from .openai_client import get_client, prewarm
 
 
 class PTTLiveRecognition:
@@ -29,10 +34,12 @@ class PTTLiveRecognition:
                  reject_phrases: tuple[str, ...] | None = None,
                  confirm_timeout_sec: float = 6.0,
                  transcribe_fn: Optional[Callable[[bytes], str]] = None,
-                 play_input_before_stt: bool = False):
+                 play_input_before_stt: bool = False,
+                 command_model_path: str | None = None):
         self.client = client
         self.model_stt = model_stt
-        self.transcribe_fn = transcribe_fn
+        # Ohne eigene Funktion: OpenAI-STT direkt aus dem Speicher
+        self.transcribe_fn = transcribe_fn or partial(transcribe_upload, client, model_stt)
         self.play_input_before_stt = play_input_before_stt
         self.ptt = ptt
         self.leds = leds
@@ -50,46 +57,41 @@ class PTTLiveRecognition:
         self.confirm_phrases = confirm_phrases or ("ok", "okay", "ja", "yes")
         self.reject_phrases = reject_phrases or ("nein", "no", "falsch", "abbruch")
         self.confirm_timeout_sec = confirm_timeout_sec
+        # Kurzbefehle (ja/nein, historie N) lokal erkennen, STT nur für alles andere
+        self._commands: Optional[CommandRecognizer] = None
+        model = load_grammar_model(command_model_path)
+        if model is not None:
+            try:
+                self._commands = CommandRecognizer(
+                    model, (*self.confirm_phrases, *self.reject_phrases, *history_phrases()), self.samplerate
+                )
+            except Exception as e:
+                print(f"Lokale Befehlserkennung nicht verfügbar ({e}).")
     
     def set_text_callback(self, callback: Callable[[str], None]) -> None:
         """Setze Callback-Funktion, die bei neuem Text aufgerufen wird."""
         self.text_callback = callback
     
     def _transcribe_audio(self, wav_bytes: bytes) -> str:
-        """Transkribiere Audio-Daten zu Text."""
+        """Transkribiere Audio-Daten zu Text (Kurzbefehle lokal, sonst STT)."""
         if self.play_input_before_stt:
             try:
                 play_wav_bytes(wav_bytes, device=self.device_id, announce=False)
             except Exception as e:
                 print(f"Audio-Playback-Fehler: {e}")
-        if self.transcribe_fn:
+        if self._commands is not None:
             try:
-                return (self.transcribe_fn(wav_bytes) or "").strip()
+                command = self._commands.recognize_wav(wav_bytes)
             except Exception as e:
-                print(f"Whisper.cpp Fehler: {e}")
-                return ""
-        import tempfile
-        import os
-        
-        wav_path = None
+                command = None
+                print(f"Lokale Befehlserkennung fehlgeschlagen: {e}")
+            if command:
+                return command
         try:
-            fd, wav_path = tempfile.mkstemp(suffix=".wav")
-            os.close(fd)
-            with open(wav_path, "wb") as f:
-                f.write(wav_bytes)
-            
-            with open(wav_path, "rb") as f_audio:
-                stt = self.client.audio.transcriptions.create(
-                    model=self.model_stt,
-                    file=f_audio
-                )
-            return (stt.text or "").strip()
-        finally:
-            if wav_path:
-                try:
-                    os.remove(wav_path)
-                except OSError:
-                    pass
+            return (self.transcribe_fn(wav_bytes) or "").strip()
+        except Exception as e:
+            print(f"STT-Fehler: {e}")
+            return ""
     
     def _update_display(self, text: str) -> None:
         """Aktualisiere OLED-Display mit Laufband-Text."""
@@ -117,21 +119,7 @@ class PTTLiveRecognition:
         if not match:
             return None
         word = match.group(1)
-        mapping = {
-            "eins": 1,
-            "ein": 1,
-            "zwei": 2,
-            "drei": 3,
-            "vier": 4,
-            "fuenf": 5,
-            "fünf": 5,
-            "sechs": 6,
-            "sieben": 7,
-            "acht": 8,
-            "neun": 9,
-            "zehn": 10,
-        }
-        return mapping.get(word)
+        return HISTORY_NUMBER_WORDS.get(word)
 
     def _handle_history_command(self, text: str) -> bool:
         if not self.chat_assistant:
@@ -156,6 +144,7 @@ class PTTLiveRecognition:
         deadline = time.time() + timeout_sec
         while time.time() < deadline:
             if self.ptt.is_pressed:
+                prewarm()
                 return True
             time.sleep(0.05)
         return False
@@ -207,6 +196,8 @@ class PTTLiveRecognition:
             while self.is_running:
                 # Warte auf Taster-Druck
                 self.ptt.wait_for_press()
+                # Verbindung zur API aufbauen, während noch gesprochen wird
+                prewarm()
                 
                 if not self.is_running:
                     break
@@ -408,6 +399,7 @@ class PTTLiveVoskRecognition:
         deadline = time.time() + timeout_sec
         while time.time() < deadline:
             if self.ptt.is_pressed:
+                prewarm()
                 return True
             time.sleep(0.05)
         return False
@@ -457,6 +449,8 @@ class PTTLiveVoskRecognition:
             while self.is_running:
                 # Warte auf Taster-Druck
                 self.ptt.wait_for_press()
+                # Verbindung zur API aufbauen, während noch gesprochen wird
+                prewarm()
                 
                 if not self.is_running:
                     break
@@ -627,13 +621,14 @@ def run_ptt_live_recognition(use_vosk: bool = False, enable_chatgpt: bool = Fals
     # ChatGPT-Assistent (optional)
     chat_assistant = None
     if enable_chatgpt:
-        client = OpenAI(api_key=settings.openai_api_key)
+        client = get_client(settings)
         kwargs = dict(
             client=client,
             model_chat=settings.model_chat,
             model_tts=settings.model_tts,
             tts_voice=settings.tts_voice,
             audio_output_device=settings.audio_output_device,
+            stream_responses=settings.chat_streaming,
             echo_input_before_chat=settings.echo_input_before_chat,
             echo_input_local_tts=settings.echo_input_local_tts,
             announce_chat_request=settings.announce_chat_request,
@@ -715,6 +710,7 @@ def run_ptt_live_recognition(use_vosk: bool = False, enable_chatgpt: bool = Fals
                     deadline = time.time() + timeout_sec
                     while time.time() < deadline:
                         if self.ptt.is_pressed:
+                            prewarm()
                             return True
                         time.sleep(0.05)
                     return False
@@ -762,6 +758,8 @@ def run_ptt_live_recognition(use_vosk: bool = False, enable_chatgpt: bool = Fals
                     try:
                         while self.is_running:
                             self.ptt.wait_for_press()
+                            # Verbindung zur API aufbauen, während noch gesprochen wird
+                            prewarm()
                             
                             if not self.is_running:
                                 break
@@ -860,21 +858,8 @@ def run_ptt_live_recognition(use_vosk: bool = False, enable_chatgpt: bool = Fals
             recognizer.start(oled=oled)
     else:
         # OpenAI (Cloud) oder whisper.cpp (lokal)
-        client = OpenAI(api_key=settings.openai_api_key)
-        transcribe_fn = None
-        if settings.use_whisper_cpp:
-            from .whisper_cpp import transcribe_wav_bytes
-            def _whispercpp_transcribe(wav_bytes: bytes) -> str:
-                return transcribe_wav_bytes(
-                    wav_bytes,
-                    bin_path=settings.whisper_cpp_bin,
-                    model_path=settings.whisper_cpp_model,
-                    language=settings.whisper_cpp_language,
-                    threads=settings.whisper_cpp_threads,
-                    temperature=settings.whisper_cpp_temperature,
-                    extra_args=settings.whisper_cpp_extra_args,
-                )
-            transcribe_fn = _whispercpp_transcribe
+        client = get_client(settings)
+        transcribe_fn = make_transcribe_fn(settings, client)
         
         recognizer = PTTLiveRecognition(
             client=client,
@@ -889,6 +874,7 @@ def run_ptt_live_recognition(use_vosk: bool = False, enable_chatgpt: bool = Fals
             confirm_timeout_sec=settings.confirm_timeout_sec,
             transcribe_fn=transcribe_fn,
             play_input_before_stt=settings.play_input_before_stt,
+            command_model_path=settings.vosk_command_model_path,
         )
         recognizer.start(oled=oled)
 
@@ -14,10 +14,14 @@ from .audio_io import (
     _resolve_device_id,
     select_input_device,
     wait_for_playback_end,
+    is_playback_active,
+    barge_in_active,
     play_beep_sequence,
     play_hangup_tone,
     stop_playback,
     record_audio_chunk,
+    open_capture_reader,
+    release_capture_engine,
     play_status_listening,
 )
 from .oled_display import OledDisplay
@@ -27,7 +31,15 @@ from .sentence_detection import (
     chatgpt_filter_decision,
     chatgpt_filter_message,
 )
+from .audio_capture import CaptureReader
+from .audio_frame import AudioFrame
+from .audio_preprocess import PreprocessChain
+from .vad import VoiceActivityDetector
+from .endpointing import UTTERANCE_END, UTTERANCE_START, Endpointer, EndpointEvent, read_until_endpoint
+from .keyword_spotting import HISTORY_NUMBER_WORDS, KeywordSpotter, history_phrases, load_grammar_model
+from .pipeline import Pipeline, StageQueue
 from .chat_assistant import ChatAssistant
+from .openai_client import get_client, prewarm
 
 
 class VoskSpeechRecognition:
@@ -149,50 +161,126 @@ class VoskSpeechRecognition:
             Erkannten Text
         """
         try:
-            from vosk import KaldiRecognizer
-            
-            # Erstelle Recognizer mit optimierten Einstellungen
-            rec = KaldiRecognizer(self.recognizer, self.samplerate)
-            rec.SetWords(False)  # Nur Text, keine Wort-Timestamps
-            
-            # Alternative: SetWords(True) für mehr Kontext, aber langsamer
-            # rec.SetWords(True)
-            
-            # Konvertiere zu bytes
-            audio_bytes = audio_data.tobytes()
-            
-            # Verarbeite in kleineren Chunks für bessere Erkennung
-            # Kleinere Chunks = häufigeres Processing = bessere Ergebnisse
-            chunk_size = 4000 * 2  # 4000 Frames * 2 bytes (int16) = ~0.5 Sekunden
-            text_parts = []
-            
-            for i in range(0, len(audio_bytes), chunk_size):
-                chunk = audio_bytes[i:i + chunk_size]
-                if len(chunk) == 0:
-                    break
-                    
-                if rec.AcceptWaveform(chunk):
-                    result = json.loads(rec.Result())
-                    if result.get("text"):
-                        text_parts.append(result["text"])
-            
-            # Finale Erkennung (wichtig für letzten Teil)
-            final_result = json.loads(rec.FinalResult())
-            if final_result.get("text"):
-                text_parts.append(final_result["text"])
-            
-            result_text = " ".join(text_parts).strip()
-            # Stelle sicher, dass Leerzeichen zwischen Wörtern vorhanden sind
-            # Normalisiere mehrfache Leerzeichen zu einem
-            result_text = re.sub(r'\s+', ' ', result_text)
-            return result_text
+            session = self.create_stream()
+            session.feed(audio_data)
+            return session.finish()
         except Exception as e:
             print(f"Fehler bei Vosk-Stream-Transkription: {e}")
             return ""
 
+    def create_stream(
+        self,
+        on_partial: Optional[Callable[[str], None]] = None,
+        on_final: Optional[Callable[[str], None]] = None,
+    ) -> "VoskStreamSession":
+        """Erzeuge eine Streaming-Sitzung auf dem geladenen Modell."""
+        return VoskStreamSession(
+            self.recognizer,
+            samplerate=self.samplerate,
+            on_partial=on_partial,
+            on_final=on_final,
+        )
+
+
+class VoskStreamSession:
+    """
+    Streaming-Erkennung mit einem dauerhaften KaldiRecognizer.
+    
+    Audio wird fortlaufend eingespeist; der Decoder behält den Kontext über
+    Chunk-Grenzen hinweg. Zwischenergebnisse (PartialResult) und finale
+    Ergebnisse werden über Callbacks gemeldet.
+    """
+
+    # 4000 Frames * 2 bytes (int16) = ~0.25 Sekunden pro AcceptWaveform
+    FEED_BYTES = 4000 * 2
+
+    def __init__(self, model, samplerate: int = 16000,
+                 on_partial: Optional[Callable[[str], None]] = None,
+                 on_final: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            model: Geladenes vosk.Model
+            samplerate: Abtastrate der eingespeisten Daten (int16, mono)
+            on_partial: Callback für geänderte Zwischenergebnisse
+            on_final: Callback für jedes finale Teilergebnis
+        """
+        from vosk import KaldiRecognizer
+
+        self.samplerate = samplerate
+        self.on_partial = on_partial
+        self.on_final = on_final
+        self._rec = KaldiRecognizer(model, samplerate)
+        self._rec.SetWords(False)  # Nur Text, keine Wort-Timestamps
+        self._parts: list[str] = []
+        self._partial = ""
+        self.active = False
+
+    @staticmethod
+    def _clean(text: str) -> str:
+        # Normalisiere mehrfache Leerzeichen zu einem
+        return re.sub(r'\s+', ' ', text or "").strip()
+
+    @property
+    def text(self) -> str:
+        """Bisher final erkannter Text der laufenden Äußerung."""
+        return " ".join(self._parts)
+
+    @property
+    def partial(self) -> str:
+        """Letztes Zwischenergebnis (noch nicht final)."""
+        return self._partial
+
+    def feed(self, audio: np.ndarray | bytes) -> None:
+        """Speise Audio ein (int16 mono); löst ggf. Callbacks aus."""
+        if isinstance(audio, np.ndarray):
+            audio = audio.astype(np.int16, copy=False).tobytes()
+        if not audio:
+            return
+        self.active = True
+        for i in range(0, len(audio), self.FEED_BYTES):
+            if self._rec.AcceptWaveform(audio[i:i + self.FEED_BYTES]):
+                self._emit_final(self._rec.Result())
+            else:
+                partial = self._clean(json.loads(self._rec.PartialResult()).get("partial", ""))
+                if partial != self._partial:
+                    self._partial = partial
+                    if partial and self.on_partial:
+                        self.on_partial(partial)
+
+    def finish(self) -> str:
+        """Schließe die Äußerung ab und gib den gesamten Text zurück."""
+        if self.active:
+            self._emit_final(self._rec.FinalResult())
+        text = self.text
+        self.reset()
+        return text
+
+    def reset(self) -> None:
+        """Verwerfe den Zustand, der Recognizer bleibt erhalten."""
+        self._rec.Reset()
+        self._parts = []
+        self._partial = ""
+        self.active = False
+
+    def _emit_final(self, result_json: str) -> None:
+        self._partial = ""
+        text = self._clean(json.loads(result_json).get("text", ""))
+        if not text:
+            return
+        self._parts.append(text)
+        if self.on_final:
+            self.on_final(text)
+
 
 class LiveVoskRecognition:
     """Live Spracherkennung mit Vosk (lokal, offline)."""
+
+    # Pipeline: Blocklänge der Aufnahme-Stufe und Queue-Größen zwischen den Stufen
+    PIPELINE_BLOCK_SEC = 0.1
+    PIPELINE_AUDIO_BLOCKS = 50  # 5 s Audio, danach wartet die Aufnahme (Ringpuffer fängt auf)
+    PIPELINE_CHUNKS = 8
+    PIPELINE_DIALOG_ITEMS = 32
+    PIPELINE_REPORT_SEC = 10.0
     
     def __init__(self, model_path: str, device: Optional[str | int] = None,
                  chunk_duration: float = 3.0, enable_audio_processing: bool = True,
@@ -223,7 +311,12 @@ class LiveVoskRecognition:
                  ready_hold_sec: float = 10.0,
                  vad_use_webrtcvad: bool = True,
                  vad_webrtcvad_mode: int = 2,
-                 vad_webrtcvad_frame_ms: int = 30):
+                 vad_webrtcvad_frame_ms: int = 30,
+                 streaming: bool = True,
+                 stream_chunk_duration: float = 0.3,
+                 enable_noise_suppression: bool = False,
+                 kws_model_path: str | None = None,
+                 pipeline: bool = True):
         """
         Initialisiere Live-Vosk-Spracherkennung.
         
@@ -234,6 +327,11 @@ class LiveVoskRecognition:
             enable_audio_processing: Audio-Vorverarbeitung aktivieren (Normalisierung, etc.)
             enable_semantic: Semantische Satzerkennung aktivieren
             language: Sprache für semantische Analyse
+            streaming: Ein Recognizer pro Äußerung, kleine Blöcke, Zwischenergebnisse
+            stream_chunk_duration: Blocklänge im Streaming-Modus in Sekunden
+            enable_noise_suppression: Spektrale Rauschunterdrückung vor Vosk (nur mit Vorverarbeitung)
+            kws_model_path: Kleines Vosk-Modell für die Wake-Word-Stufe (None = immer volle Erkennung)
+            pipeline: Aufnahme, VAD, Erkennung und Dialog in eigenen Threads (sonst eine Schleife)
         """
         self.debug_logs = debug_logs
         self.audio_output_device = audio_output_device
@@ -241,6 +339,11 @@ class LiveVoskRecognition:
         self.samplerate = 16000
         self.chunk_duration = chunk_duration  # Längere Chunks = besserer Kontext
         self.enable_audio_processing = enable_audio_processing
+        # Kausaler High-Pass (+ Rauschunterdrückung) + AGC mit Zustand über Chunk-Grenzen hinweg
+        self._preprocess = (
+            PreprocessChain(self.samplerate, noise_suppression=enable_noise_suppression)
+            if enable_audio_processing else None
+        )
         self.is_running = False
         self.current_text = ""
         self.oled: Optional[OledDisplay] = None
@@ -263,8 +366,6 @@ class LiveVoskRecognition:
         self.pause_duration = pause_duration if pause_duration is not None else 0.0
         if self.pause_duration <= 0:
             self.pause_duration = None
-        self._silence_sec = 0.0
-        self._speech_active = False
         self._ignore_until = 0.0
         self._last_tts_text = ""
         self._pending_prefix = ""
@@ -288,146 +389,111 @@ class LiveVoskRecognition:
         self.vad_hangover_factor = max(0.1, min(vad_hangover_factor, 1.0))
         self.vad_preroll_sec = max(0.0, vad_preroll_sec)
         self._preroll_samples = int(self.samplerate * self.vad_preroll_sec)
-        self._preroll_tail = np.zeros(0, dtype=np.int16)
+        self._preroll_tail = AudioFrame(None, self.samplerate)
         self.vad_use_webrtcvad = vad_use_webrtcvad
         self.vad_webrtcvad_mode = max(0, min(int(vad_webrtcvad_mode), 3))
         self.vad_webrtcvad_frame_ms = 30 if int(vad_webrtcvad_frame_ms) not in (10, 20, 30) else int(vad_webrtcvad_frame_ms)
-        self._webrtcvad = None
-        if self.vad_use_webrtcvad:
+        self._vad = VoiceActivityDetector(
+            samplerate=self.samplerate,
+            frame_ms=self.vad_webrtcvad_frame_ms,
+            rms_threshold=self.vad_rms_threshold if self.vad_rms_threshold > 0 else 0.005,
+            noise_multiplier=self.vad_noise_multiplier,
+            noise_alpha=self.vad_noise_alpha,
+            hangover_factor=self.vad_hangover_factor,
+            use_webrtcvad=self.vad_use_webrtcvad,
+            webrtcvad_mode=self.vad_webrtcvad_mode,
+            # VAD_NOISE_ALPHA is specified per VOSK_CHUNK_DURATION
+            noise_alpha_sec=chunk_duration,
+        )
+        if self._vad.webrtcvad_error and self.debug_logs:
+            self._debug(f"webrtcvad: unavailable ({self._vad.webrtcvad_error})")
+        # Äußerungsende auf 10-30-ms-Frames, unabhängig von der Chunk-Länge
+        self._endpointer = Endpointer(self._vad, pause_duration=self.pause_duration or 0.6)
+        self._capture: Optional[CaptureReader] = None
+        self.streaming = streaming
+        self.stream_chunk_duration = max(0.05, stream_chunk_duration)
+        self._stream: Optional[VoskStreamSession] = None
+        # Wake-Word-Stufe: solange nicht aktiv, nur eine kleine Grammatik dekodieren
+        self._kws: Optional[KeywordSpotter] = None
+        kws_model = load_grammar_model(kws_model_path)
+        if kws_model is not None:
+            phrases = (*self.wake_phrases, *self.context_phrases, *self.stop_phrases, *history_phrases())
             try:
-                import webrtcvad  # type: ignore
-                self._webrtcvad = webrtcvad.Vad(self.vad_webrtcvad_mode)
+                self._kws = KeywordSpotter(kws_model, phrases, self.samplerate)
             except Exception as e:
-                if self.debug_logs:
-                    self._debug(f"webrtcvad: unavailable ({e})")
-                self._webrtcvad = None
-        self._noise_floor = 0.0
+                print(f"Keyword-Spotting nicht verfügbar ({e}), nutze volle Erkennung.")
+        self._kws_reset_pending = False
+        self.use_pipeline = pipeline
+        self._pipeline: Optional[Pipeline] = None
+        self._dialog_q: Optional[StageQueue] = None
+        self._chunk_parts: list[AudioFrame] = []
+        self._chunk_events: list[EndpointEvent] = []
+        self._chunk_len = 0
+        self._chunk_target = 0
+        self._chunk_was_speech = False
     
+    def _kws_gated(self) -> bool:
+        """True, solange nur die Wake-Word-Stufe läuft."""
+        return self._kws is not None and not self.listening_active and not self._awaiting_confirm
+
     def set_text_callback(self, callback: Callable[[str], None]) -> None:
         """Setze Callback-Funktion, die bei neuem Text aufgerufen wird."""
         self.text_callback = callback
     
-    def _normalize_audio(self, audio: np.ndarray) -> np.ndarray:
-        """Normalisiere Audio für bessere Erkennung."""
-        # Konvertiere zu float32 für Verarbeitung
-        audio_float = audio.astype(np.float32) / 32768.0
-        
-        # Entferne DC-Offset
-        audio_float = audio_float - np.mean(audio_float)
-        
-        # Normalisiere auf -1.0 bis 1.0 (verhindert Clipping)
-        max_val = np.max(np.abs(audio_float))
-        if max_val > 0:
-            # Leichte Normalisierung (nicht zu aggressiv, sonst Verzerrung)
-            audio_float = audio_float / (max_val * 1.1)  # 10% Headroom
-        
-        # Konvertiere zurück zu int16
-        audio_normalized = (audio_float * 32767.0).astype(np.int16)
-        return audio_normalized
-    
-    def _apply_highpass_filter(self, audio: np.ndarray, cutoff: float = 80.0) -> np.ndarray:
-        """Einfacher High-Pass Filter um tiefe Frequenzen zu entfernen."""
-        try:
-            from scipy import signal
-            nyquist = self.samplerate / 2
-            normal_cutoff = cutoff / nyquist
-            b, a = signal.butter(2, normal_cutoff, btype='high', analog=False)
-            audio_float = audio.astype(np.float32) / 32768.0
-            filtered = signal.filtfilt(b, a, audio_float)
-            return (filtered * 32767.0).astype(np.int16)
-        except ImportError:
-            # Falls scipy nicht verfügbar, keine Filterung
-            return audio
-    
-    def _detect_speech(self, audio: np.ndarray, threshold: float = 0.01) -> bool:
-        """Voice Activity Detection (VAD)."""
-        if self._webrtcvad is not None:
-            return self._detect_speech_webrtcvad(audio)
-        # Berechne RMS (Root Mean Square) für Signalpegel
-        audio_float = audio.astype(np.float32) / 32768.0
-        rms = np.sqrt(np.mean(audio_float ** 2))
-        base_threshold = self.vad_rms_threshold if self.vad_rms_threshold > 0 else threshold
-        # Update noise floor with a slow EMA when below base threshold
-        if self.vad_noise_alpha > 0 and rms < base_threshold:
-            if self._noise_floor <= 0:
-                self._noise_floor = rms
-            else:
-                self._noise_floor = (1.0 - self.vad_noise_alpha) * self._noise_floor + self.vad_noise_alpha * rms
-        effective_threshold = max(base_threshold, self._noise_floor * self.vad_noise_multiplier)
-        if self._speech_active:
-            effective_threshold *= self.vad_hangover_factor
-        if self.debug_logs:
-            self._debug(
-                f"vad: rms={rms:.6f} base={base_threshold:.6f} "
-                f"noise={self._noise_floor:.6f} mult={self.vad_noise_multiplier:.2f} "
-                f"hangover={self.vad_hangover_factor:.2f} th={effective_threshold:.6f}"
-            )
-        return rms > effective_threshold
+    def _record_chunk(
+        self, duration: float | None = None
+    ) -> tuple[AudioFrame, list[EndpointEvent]]:
+        """Nimmt einen Audio-Chunk auf und gibt (verarbeiteter Frame, Endpunkt-Events) zurück.
 
-    def _detect_speech_webrtcvad(self, audio: np.ndarray) -> bool:
-        if audio.size == 0:
-            return False
-        if audio.dtype != np.int16:
-            audio = audio.astype(np.int16)
-        frame_len = int(self.samplerate * (self.vad_webrtcvad_frame_ms / 1000.0))
-        if frame_len <= 0:
-            return False
-        total_frames = 0
-        speech_frames = 0
-        data = audio.tobytes()
-        bytes_per_frame = frame_len * 2  # int16 mono
-        for i in range(0, len(data) - bytes_per_frame + 1, bytes_per_frame):
-            frame = data[i:i + bytes_per_frame]
-            total_frames += 1
-            try:
-                if self._webrtcvad.is_speech(frame, self.samplerate):
-                    speech_frames += 1
-            except Exception:
-                continue
-        if self.debug_logs:
-            self._debug(f"vad: webrtcvad frames={total_frames} speech={speech_frames}")
-        return speech_frames > 0
-    
-    def _record_chunk(self) -> tuple[np.ndarray, np.ndarray]:
-        """Nimmt einen Audio-Chunk auf und gibt (raw, processed) zurück."""
+        Aus der Daueraufnahme wird in kurzen Blöcken gelesen und beim
+        Äußerungsende vorzeitig abgebrochen. int16→float32 wird pro Chunk
+        nur einmal umgerechnet (VAD, Statistik und Vorverarbeitung teilen sich
+        den Frame).
+        """
         channels = 1
         dtype = "int16"
-        frames_to_record = int(self.samplerate * self.chunk_duration)
+        frames_to_record = int(self.samplerate * (duration or self.chunk_duration))
         
-        recording = record_audio_chunk(
-            frames_to_record,
-            samplerate=self.samplerate,
-            device_id=self.vosk.device_id,
-            channels=channels,
-            dtype=dtype,
-        )
-        
-        # Konvertiere zu mono (falls stereo)
-        if len(recording.shape) > 1:
-            recording = recording[:, 0]
+        if self._capture is not None:
+            # Lückenlos aus der Daueraufnahme lesen
+            recording, events = read_until_endpoint(self._capture, frames_to_record, self._endpointer)
+        else:
+            recording = record_audio_chunk(
+                frames_to_record,
+                samplerate=self.samplerate,
+                device_id=self.vosk.device_id,
+                channels=channels,
+                dtype=dtype,
+            )
+            # Konvertiere zu mono (falls stereo)
+            if len(recording.shape) > 1:
+                recording = recording[:, 0]
+            recording = AudioFrame(recording, self.samplerate)
+            events = self._endpointer.process(recording)
+        return self._finish_chunk(recording, events), events
+
+    def _finish_chunk(self, recording: AudioFrame, events: list[EndpointEvent]) -> AudioFrame:
+        """Statistik + Vorverarbeitung eines aufgenommenen Chunks."""
         if self.debug_logs:
-            audio_float = recording.astype(np.float32) / 32768.0
-            rms = float(np.sqrt(np.mean(audio_float ** 2)))
-            peak = float(np.max(np.abs(audio_float))) if audio_float.size else 0.0
+            rms = recording.rms
+            peak = recording.peak
             self._debug(
                 f"audio: frames={len(recording)} sr={self.samplerate} rms={rms:.6f} peak={peak:.6f}"
             )
             if peak >= 0.98:
                 self._debug("audio: clipping detected (peak >= 0.98)")
-        
-        raw_recording = recording.copy()
 
-        # Audio-Vorverarbeitung für bessere Erkennung
-        if self.enable_audio_processing:
-            # High-Pass Filter (entfernt tiefe Frequenzen/Rauschen)
-            recording = self._apply_highpass_filter(recording, cutoff=80.0)
-            
-            # Normalisierung
-            recording = self._normalize_audio(recording)
-        else:
-            recording = raw_recording
-        
-        return raw_recording, recording
+        # Audio-Vorverarbeitung für bessere Erkennung: High-Pass (entfernt
+        # tiefe Frequenzen/Rauschen) + gleitende Verstärkungsregelung
+        if self._preprocess is not None:
+            # Rauschschätzung nur in Pausen nachführen
+            speech = bool(events) or self._endpointer.in_speech
+            recording = self._preprocess.process(recording, speech=speech)
+            denoise = self._preprocess.denoise
+            if denoise is not None and self.debug_logs:
+                budget = " (über Budget!)" if denoise.over_budget else ""
+                self._debug(f"denoise: {denoise.cost_summary()}{budget}")
+        return recording
     
     def _update_display(self, text: str) -> None:
         """Aktualisiere OLED-Display mit Laufband-Text."""
@@ -448,12 +514,17 @@ class LiveVoskRecognition:
         if self.listening_active == active and self._status_text == status_text:
             return
         self.listening_active = active
+        if not active and self._kws is not None:
+            # Zurücksetzen übernimmt die Erkennung (ggf. eigener Thread) vor dem nächsten Block
+            self._kws_reset_pending = True
         self._paused_notice = not active
         self._status_text = status_text
         self._update_display(status_text)
         print(f"STATUS: {status_text} ({reason})")
         if active:
             self._last_activity_ts = time.time()
+            # Wake-Word: Verbindung zur API aufbauen, während die Frage gesprochen wird
+            prewarm()
             if announce:
                 play_beep_sequence(device=self.audio_output_device, announce=False)
         elif prev_active and not active:
@@ -529,21 +600,7 @@ class LiveVoskRecognition:
         if not match:
             return None
         word = match.group(1)
-        mapping = {
-            "eins": 1,
-            "ein": 1,
-            "zwei": 2,
-            "drei": 3,
-            "vier": 4,
-            "fuenf": 5,
-            "fünf": 5,
-            "sechs": 6,
-            "sieben": 7,
-            "acht": 8,
-            "neun": 9,
-            "zehn": 10,
-        }
-        return mapping.get(word)
+        return HISTORY_NUMBER_WORDS.get(word)
 
     def _handle_history_command(self, text: str) -> bool:
         if not self.chat_assistant:
@@ -642,8 +699,6 @@ class LiveVoskRecognition:
         if self._awaiting_confirm:
             return
         if not self.listening_active:
-            self._speech_active = False
-            self._silence_sec = 0.0
             return
         text = (self.current_text or "").strip()
         if self._pending_prefix:
@@ -652,8 +707,6 @@ class LiveVoskRecognition:
             else:
                 text = self._pending_prefix
         if not text:
-            self._speech_active = False
-            self._silence_sec = 0.0
             return
         if self.chat_assistant and self._last_chat_text != text:
             allowed, reason = chatgpt_filter_decision(text, self.min_chat_words, self.trivial_words)
@@ -675,8 +728,6 @@ class LiveVoskRecognition:
         self._pending_prefix = ""
         if self.semantic_processor:
             self.semantic_processor.reset()
-        self._speech_active = False
-        self._silence_sec = 0.0
 
     def _check_commands(self, text: str) -> str | None:
         norm = self._normalize_command_text(text)
@@ -694,229 +745,394 @@ class LiveVoskRecognition:
             print("[DEBUG] cmd: no match")
         return None
     
-    def _process_chunk(self) -> None:
-        """Nimmt einen Chunk auf, transkribiert ihn und aktualisiert das Display."""
-        chunk_audio = None
-        preroll_tail = self._preroll_tail
-        try:
-            # Während Ausgabe nichts aufnehmen
-            wait_for_playback_end()
-            if self._awaiting_confirm and self._confirm_deadline and time.time() > self._confirm_deadline:
-                self._cancel_confirmation()
+    def _process_text(self, text: str) -> None:
+        """Verarbeitet einen erkannten Textabschnitt (Befehle, Anzeige, ChatGPT)."""
+        if not text:
+            return
+        self._last_activity_ts = time.time()
+        # Stelle sicher, dass Text Leerzeichen hat
+        text = re.sub(r'\s+', ' ', text).strip()
+        if barge_in_active() and is_playback_active():
+            # Barge-in: während der Ausgabe zählt nur STOPP
+            if self._check_commands(text) == "stop":
+                stop_playback()
+                self._set_listening(False, "STOPP erkannt", context_mode=False)
+                self._debug("command: stop (barge-in)")
+            return
+
+        now = time.time()
+        # Mit Echokompensation ist keine Sperrzeit nach der Ausgabe nötig
+        if now < self._ignore_until and not barge_in_active():
+            if self.chat_filter_debug:
+                print("ChatGPT-Filter: blockiert (nach TTS)")
+            return
+        norm_text = self._normalize_command_text(text)
+        if self._last_tts_text and norm_text:
+            if norm_text in self._last_tts_text or self._last_tts_text in norm_text:
+                if self.chat_filter_debug:
+                    print("ChatGPT-Filter: blockiert (Echo von TTS)")
                 return
-            # Audio aufnehmen
-            self._debug("record_chunk: start")
-            raw_audio, audio_data = self._record_chunk()
-            chunk_audio = audio_data
-            self._debug(f"record_chunk: done len={len(audio_data)}")
-            
-            if not self.is_running:
+
+        if self._awaiting_confirm:
+            if self._handle_confirmation(text):
                 return
+
+        if self._handle_history_command(text):
+            return
+        cmd = self._check_commands(text)
+        if cmd == "stop":
+            stop_playback()
+            self._set_listening(False, "STOPP erkannt", context_mode=False)
+            self._debug("command: stop")
+            return
+        if cmd == "wake":
+            self._set_listening(True, "OK GOOGLE erkannt", context_mode=False)
+            self._debug("command: wake")
+            return
+        if cmd == "wake_context":
+            self._set_listening(True, "OK GOOGLE WEITER erkannt", context_mode=True)
+            self._debug("command: wake_context")
+            return
+
+        if not self.listening_active:
+            self._set_listening(False, "Warte auf Wake")
+            self._debug("listening inactive: skip")
+            return
+
+        if self._pending_prefix:
+            text = f"{self._pending_prefix} {text}".strip()
+            self._pending_prefix = ""
+        
+        # Semantische Satzerkennung mit kontext-basierter Korrektur
+        if self.semantic_processor:
+            # Text temporär hinzufügen für Verarbeitung
+            temp_text = self.current_text + " " + text if self.current_text else text
+            result = self.semantic_processor.process_text(temp_text)
             
-            # Voice Activity Detection - überspringe leise Chunks
-            speech_was_active = self._speech_active
-            if not self._detect_speech(raw_audio, threshold=0.005):
-                if self.pause_duration:
-                    self._silence_sec += self.chunk_duration
-                    if self._speech_active and self._silence_sec >= self.pause_duration:
-                        self._finalize_current_text()
-                self._debug("vad: no speech")
-                return
-            else:
-                if self.pause_duration:
-                    self._speech_active = True
-                    self._silence_sec = 0.0
-                if not speech_was_active and self._preroll_samples > 0 and preroll_tail.size:
-                    audio_data = np.concatenate([preroll_tail, audio_data])
-                    if self.debug_logs:
-                        self._debug(f"vad: preroll {len(preroll_tail)} samples prepended")
+            # Verwende korrigierten Text
+            corrected_text = result.get('corrected_text', temp_text)
+            self.current_text = corrected_text
             
-            # Transkribieren (direkt mit numpy-Array)
-            self._debug("transcribe: start")
-            text = self.vosk.transcribe_audio_stream(audio_data)
-            self._debug(f"transcribe: done text='{text}'")
+            # Zeige Korrekturen an
+            corrections = result.get('corrections', [])
+            if corrections:
+                print(f"🔧 {len(corrections)} Korrektur(en) angewendet")
             
-            if text:
-                self._last_activity_ts = time.time()
-                # Stelle sicher, dass Text Leerzeichen hat
-                text = re.sub(r'\s+', ' ', text).strip()
-
-                now = time.time()
-                if now < self._ignore_until:
-                    if self.chat_filter_debug:
-                        print("ChatGPT-Filter: blockiert (nach TTS)")
-                    return
-                norm_text = self._normalize_command_text(text)
-                if self._last_tts_text and norm_text:
-                    if norm_text in self._last_tts_text or self._last_tts_text in norm_text:
-                        if self.chat_filter_debug:
-                            print("ChatGPT-Filter: blockiert (Echo von TTS)")
-                        return
-
-                if self._awaiting_confirm:
-                    if self._handle_confirmation(text):
-                        return
-
-                if self._handle_history_command(text):
-                    return
-                cmd = self._check_commands(text)
-                if cmd == "stop":
-                    stop_playback()
-                    self._set_listening(False, "STOPP erkannt", context_mode=False)
-                    self._debug("command: stop")
-                    return
-                if cmd == "wake":
-                    self._set_listening(True, "OK GOOGLE erkannt", context_mode=False)
-                    self._debug("command: wake")
-                    return
-                if cmd == "wake_context":
-                    self._set_listening(True, "OK GOOGLE WEITER erkannt", context_mode=True)
-                    self._debug("command: wake_context")
-                    return
-
-                if not self.listening_active:
-                    self._set_listening(False, "Warte auf Wake")
-                    self._debug("listening inactive: skip")
-                    return
-
-                if self._pending_prefix:
-                    text = f"{self._pending_prefix} {text}".strip()
-                    self._pending_prefix = ""
+            # Zeige Kontext-Info
+            context = result.get('context')
+            if context and context.domain:
+                print(f"📋 Kontext: {context.domain} (Themen: {', '.join(context.topics)})")
+            
+            # Zeige neue Sätze mit semantischer Info
+            for info in result['semantic_info']:
+                sentence = info['sentence']
+                analysis = info['analysis']
+                sentence_type = info['type']
                 
-                # Prüfe, ob Text bereits vorhanden ist (verhindert Doppel-Ausgabe)
-                if self.current_text and text.lower() in self.current_text.lower():
-                    # Überspringe, wenn bereits vorhanden
-                    return
+                type_emoji = {
+                    'question': '❓',
+                    'imperative': '❗',
+                    'exclamation': '❗',
+                    'statement': '💬'
+                }
+                emoji = type_emoji.get(sentence_type, '💬')
                 
-                # Semantische Satzerkennung mit kontext-basierter Korrektur
-                if self.semantic_processor:
-                    # Text temporär hinzufügen für Verarbeitung
-                    temp_text = self.current_text + " " + text if self.current_text else text
-                    result = self.semantic_processor.process_text(temp_text)
-                    
-                    # Verwende korrigierten Text
-                    corrected_text = result.get('corrected_text', temp_text)
-                    self.current_text = corrected_text
-                    
-                    # Zeige Korrekturen an
-                    corrections = result.get('corrections', [])
-                    if corrections:
-                        print(f"🔧 {len(corrections)} Korrektur(en) angewendet")
-                    
-                    # Zeige Kontext-Info
-                    context = result.get('context')
-                    if context and context.domain:
-                        print(f"📋 Kontext: {context.domain} (Themen: {', '.join(context.topics)})")
-                    
-                    # Zeige neue Sätze mit semantischer Info
-                    for info in result['semantic_info']:
-                        sentence = info['sentence']
-                        analysis = info['analysis']
-                        sentence_type = info['type']
-                        
-                        type_emoji = {
-                            'question': '❓',
-                            'imperative': '❗',
-                            'exclamation': '❗',
-                            'statement': '💬'
-                        }
-                        emoji = type_emoji.get(sentence_type, '💬')
-                        
-                        print(f"{emoji} [{sentence_type.upper()}] {sentence.text}")
-                        if analysis['sentiment'] != 'neutral':
-                            print(f"   Sentiment: {analysis['sentiment']}")
-                    
-                    # Verwende satz-basierte Anzeige für Display
-                    display_text = self.semantic_processor.get_display_text(max_sentences=2)
-                    if display_text:
-                        self._update_display(display_text)
-                    else:
-                        self._update_display(self.current_text)
-
-                    # Neue vollständige Sätze an ChatGPT senden
-                    if self.chat_assistant and not self.pause_duration:
-                        sent_any = False
-                        for sentence in result.get("new_sentences", []):
-                            if sentence and sentence.text:
-                                allowed, reason = chatgpt_filter_decision(
-                                    sentence.text, self.min_chat_words, self.trivial_words
+                print(f"{emoji} [{sentence_type.upper()}] {sentence.text}")
+                if analysis['sentiment'] != 'neutral':
+                    print(f"   Sentiment: {analysis['sentiment']}")
+            
+            # Verwende satz-basierte Anzeige für Display
+            display_text = self.semantic_processor.get_display_text(max_sentences=2)
+            if display_text:
+                self._update_display(display_text)
+            else:
+                self._update_display(self.current_text)
+
+            # Neue vollständige Sätze an ChatGPT senden
+            if self.chat_assistant and not self.pause_duration:
+                sent_any = False
+                for sentence in result.get("new_sentences", []):
+                    if sentence and sentence.text:
+                        allowed, reason = chatgpt_filter_decision(
+                            sentence.text, self.min_chat_words, self.trivial_words
+                        )
+                        if allowed:
+                            if self.debug_logs:
+                                print(f"[DEBUG] prompt=NEW" if not self.context_mode else "[DEBUG] prompt=KONTEXT")
+                            if self.confirm_before_chat and self._request_confirmation(
+                                sentence.text, self._current_prompt()
+                            ):
+                                pass
+                            else:
+                                self.chat_assistant.handle_text(
+                                    sentence.text,
+                                    system_prompt_override=self._current_prompt(),
                                 )
-                                if allowed:
-                                    if self.debug_logs:
-                                        print(f"[DEBUG] prompt=NEW" if not self.context_mode else "[DEBUG] prompt=KONTEXT")
-                                    if self.confirm_before_chat and self._request_confirmation(
-                                        sentence.text, self._current_prompt()
-                                    ):
-                                        pass
-                                    else:
-                                        self.chat_assistant.handle_text(
-                                            sentence.text,
-                                            system_prompt_override=self._current_prompt(),
-                                        )
-                                        sent_any = True
-                                else:
-                                    self._pending_prefix = sentence.text
-                                    self._announce_chat_filter_block(reason)
-                                    if self.chat_filter_debug:
-                                        print(f"ChatGPT-Filter: '{sentence.text}' → blockiert ({reason})")
-                        if sent_any:
+                                sent_any = True
+                        else:
+                            self._pending_prefix = sentence.text
+                            self._announce_chat_filter_block(reason)
+                            if self.chat_filter_debug:
+                                print(f"ChatGPT-Filter: '{sentence.text}' → blockiert ({reason})")
+                if sent_any:
+                    self.current_text = ""
+                    self._pending_prefix = ""
+                    if self.semantic_processor:
+                        self.semantic_processor.reset()
+        else:
+            # Standard: Einfache Text-Anzeige (ohne Korrektur)
+            if self.current_text:
+                self.current_text += " " + text
+            else:
+                self.current_text = text
+            self._update_display(self.current_text)
+
+            # Fallback: gesamten Text senden (ohne Semantik)
+            if self.chat_assistant and not self.pause_duration:
+                if self._last_chat_text != text:
+                    allowed, reason = chatgpt_filter_decision(
+                        text, self.min_chat_words, self.trivial_words
+                    )
+                    if allowed:
+                        self._last_chat_text = text
+                        if self.debug_logs:
+                            print(f"[DEBUG] prompt=NEW" if not self.context_mode else "[DEBUG] prompt=KONTEXT")
+                        if self.confirm_before_chat and self._request_confirmation(
+                            text, self._current_prompt()
+                        ):
+                            pass
+                        else:
+                            self.chat_assistant.handle_text(
+                                text,
+                                system_prompt_override=self._current_prompt(),
+                            )
                             self.current_text = ""
                             self._pending_prefix = ""
-                            if self.semantic_processor:
-                                self.semantic_processor.reset()
-                else:
-                    # Standard: Einfache Text-Anzeige (ohne Korrektur)
-                    if self.current_text:
-                        self.current_text += " " + text
                     else:
-                        self.current_text = text
-                    self._update_display(self.current_text)
-
-                    # Fallback: gesamten Text senden (ohne Semantik)
-                    if self.chat_assistant and not self.pause_duration:
-                        if self._last_chat_text != text:
-                            allowed, reason = chatgpt_filter_decision(
-                                text, self.min_chat_words, self.trivial_words
-                            )
-                            if allowed:
-                                self._last_chat_text = text
-                                if self.debug_logs:
-                                    print(f"[DEBUG] prompt=NEW" if not self.context_mode else "[DEBUG] prompt=KONTEXT")
-                                if self.confirm_before_chat and self._request_confirmation(
-                                    text, self._current_prompt()
-                                ):
-                                    pass
-                                else:
-                                    self.chat_assistant.handle_text(
-                                        text,
-                                        system_prompt_override=self._current_prompt(),
-                                    )
-                                    self.current_text = ""
-                                    self._pending_prefix = ""
-                            else:
-                                self._pending_prefix = text
-                                self._announce_chat_filter_block(reason)
-                                if self.chat_filter_debug:
-                                    print(f"ChatGPT-Filter: '{text}' → blockiert ({reason})")
-                
-                # Callback aufrufen
-                if self.text_callback:
-                    self.text_callback(self.current_text)
-                
-                print(f"Erkannt: {text}")
-                print(f"Gesamt: {self.current_text}")
-            else:
-                # Kein Text erkannt - könnte auf schlechte Audio-Qualität hindeuten
+                        self._pending_prefix = text
+                        self._announce_chat_filter_block(reason)
+                        if self.chat_filter_debug:
+                            print(f"ChatGPT-Filter: '{text}' → blockiert ({reason})")
+        
+        # Callback aufrufen
+        if self.text_callback:
+            self.text_callback(self.current_text)
+        
+        print(f"Erkannt: {text}")
+        print(f"Gesamt: {self.current_text}")
+
+    def _on_partial(self, partial: str) -> None:
+        """Zwischenergebnis des Streaming-Recognizers anzeigen."""
+        self._debug(f"stream: partial='{partial}'")
+        if barge_in_active() and is_playback_active() and self._check_commands(partial) == "stop":
+            # Ausgabe sofort abbrechen, das Endergebnis setzt den Status
+            stop_playback()
+            self._debug("barge-in: stop (partial)")
+            return
+        if not self.listening_active or self._awaiting_confirm:
+            return
+        self._update_display(f"{self.current_text} {partial}".strip())
+
+    def _chunk_duration(self) -> float:
+        if self._stream is not None or self._kws_gated():
+            return self.stream_chunk_duration
+        return self.chunk_duration
+
+    def _speech_audio(
+        self,
+        chunk_audio: AudioFrame,
+        events: list[EndpointEvent],
+        speech_was_active: bool,
+        preroll_tail: AudioFrame,
+    ) -> tuple[Optional[np.ndarray], bool]:
+        """Gibt (Audio für die Erkennung, Äußerungsende) zurück; None bei Stille."""
+        ended = any(e.kind == UTTERANCE_END for e in events)
+        if self.debug_logs:
+            for e in events:
+                self._debug(f"endpoint: {e.kind} t={e.time_sec:.2f}s")
+        # Voice Activity Detection - überspringe leise Chunks
+        if not events and not self._endpointer.in_speech:
+            self._debug("vad: no speech")
+            return None, ended
+        audio_data = chunk_audio.pcm
+        started = any(e.kind == UTTERANCE_START for e in events)
+        if started and not speech_was_active and self._preroll_samples > 0 and len(preroll_tail):
+            audio_data = AudioFrame.concat([preroll_tail, chunk_audio]).pcm
+            if self.debug_logs:
+                self._debug(f"vad: preroll {len(preroll_tail)} samples prepended")
+        return audio_data, ended
+
+    def _recognize(self, audio_data: np.ndarray, ended: bool) -> None:
+        """Erkennung eines Chunks; Ergebnisse gehen über _dialog an die Textverarbeitung."""
+        if self._kws_gated():
+            # Nicht aktiv: nur die Wake-Word-Stufe, die große Erkennung ruht
+            if self._stream is not None and self._stream.active:
+                self._stream.reset()
+            if self._kws_reset_pending:
+                self._kws_reset_pending = False
+                self._kws.reset()
+            phrase = self._kws.feed(audio_data)
+            if phrase is None and ended:
+                phrase = self._kws.finish()
+            if phrase:
+                self._debug(f"kws: '{phrase}'")
+                self._dialog("text", phrase)
+                # Aktivierung abwarten, damit der nächste Chunk schon voll erkannt wird
+                self._dialog_sync()
+            return
+
+        if self._stream is not None:
+            # Streaming: Ergebnisse kommen über die Callbacks (partial/final);
+            # Stille bis zum Endpunkt wird mit eingespeist, damit Vosk das
+            # Wortende sauber erkennt
+            self._stream.feed(audio_data)
+            if ended:
+                self._debug("stream: endpoint")
+                self._stream.finish()
+                self._dialog("end")
+            return
+
+        # Transkribieren (direkt mit numpy-Array)
+        self._debug("transcribe: start")
+        text = self.vosk.transcribe_audio_stream(audio_data)
+        self._debug(f"transcribe: done text='{text}'")
+        self._dialog("text", text)
+        if ended:
+            self._dialog("end")
+
+    def _dialog(self, kind: str, payload: str = "") -> None:
+        """Erkennungsergebnis an die Textverarbeitung (Pipeline: über die Dialog-Queue)."""
+        if self._pipeline is not None and self._dialog_q is not None:
+            self._dialog_q.put((kind, payload), self._pipeline.stop_event)
+        else:
+            self._handle_dialog((kind, payload))
+
+    def _dialog_sync(self, timeout: float = 2.0) -> None:
+        if self._pipeline is not None and self._dialog_q is not None:
+            self._dialog_q.drain(timeout)
+
+    def _handle_dialog(self, item: tuple[str, str]) -> None:
+        kind, payload = item
+        if kind == "partial":
+            self._on_partial(payload)
+        elif kind == "end":
+            self._finalize_current_text()
+        else:
+            self._process_text(payload)
+
+    def _check_auto_pause(self) -> None:
+        if self.listening_active and self.auto_pause_after_sec > 0:
+            if self._force_ready_until and time.time() < self._force_ready_until:
                 pass
+            elif (time.time() - self._last_activity_ts) >= self.auto_pause_after_sec:
+                self._set_listening(False, "Inaktivität")
+
+    def _confirm_expired(self) -> bool:
+        if self._awaiting_confirm and self._confirm_deadline and time.time() > self._confirm_deadline:
+            self._cancel_confirmation()
+            return True
+        return False
+
+    def _process_chunk(self) -> None:
+        """Nimmt einen Chunk auf, transkribiert ihn und aktualisiert das Display."""
+        chunk_audio = None
+        preroll_tail = self._preroll_tail
+        try:
+            # Während Ausgabe nichts aufnehmen (außer mit Echokompensation: Barge-in)
+            if not barge_in_active():
+                wait_for_playback_end()
+            if self._confirm_expired():
+                return
+            speech_was_active = self._endpointer.in_speech
+            # Audio aufnehmen (endet vorzeitig, sobald die Äußerung vorbei ist)
+            self._debug("record_chunk: start")
+            chunk_audio, events = self._record_chunk(self._chunk_duration())
+            self._debug(f"record_chunk: done len={len(chunk_audio)}")
+            
+            if not self.is_running:
+                return
+            
+            audio_data, ended = self._speech_audio(chunk_audio, events, speech_was_active, preroll_tail)
+            if audio_data is not None:
+                self._recognize(audio_data, ended)
         except Exception as e:
             print(f"Fehler bei Verarbeitung: {e}")
         finally:
             if chunk_audio is not None and self._preroll_samples > 0:
-                if chunk_audio.size > self._preroll_samples:
-                    self._preroll_tail = chunk_audio[-self._preroll_samples:].copy()
-                else:
-                    self._preroll_tail = chunk_audio.copy()
-    
+                # Frames werden nicht mehr verändert: Ansicht statt Kopie
+                self._preroll_tail = chunk_audio.tail(self._preroll_samples)
+
+    # -- Pipeline: Aufnahme → VAD/Endpunkt → Erkennung → Dialog ------------
+
+    def _capture_stage(self, _item, emit: Callable) -> None:
+        """Liest lückenlos kurze Blöcke aus der Daueraufnahme."""
+        if not barge_in_active():
+            wait_for_playback_end()
+        frames = max(self._endpointer.frame_len, int(self.samplerate * self.PIPELINE_BLOCK_SEC))
+        try:
+            block = self._capture.read(frames)
+        except TimeoutError:
+            if is_playback_active():
+                # Ausgabe begann während des Lesens: markierte Frames werden übersprungen
+                return
+            raise
+        emit(AudioFrame(block, self.samplerate))
+
+    def _vad_stage(self, block: AudioFrame, emit: Callable) -> None:
+        """Sammelt Blöcke zu Chunks bis zur Chunk-Länge oder zum Äußerungsende."""
+        if not self._chunk_parts:
+            self._chunk_was_speech = self._endpointer.in_speech
+            self._chunk_target = int(self.samplerate * self._chunk_duration())
+        self._chunk_parts.append(block)
+        self._chunk_len += len(block)
+        events = self._endpointer.process(block)
+        self._chunk_events.extend(events)
+        if self._chunk_len < self._chunk_target and not any(e.kind == UTTERANCE_END for e in events):
+            return
+        parts, events = self._chunk_parts, self._chunk_events
+        self._chunk_parts, self._chunk_events, self._chunk_len = [], [], 0
+        preroll_tail = self._preroll_tail
+        chunk_audio = self._finish_chunk(AudioFrame.concat(parts, self.samplerate), events)
+        if self._preroll_samples > 0:
+            self._preroll_tail = chunk_audio.tail(self._preroll_samples)
+        audio_data, ended = self._speech_audio(chunk_audio, events, self._chunk_was_speech, preroll_tail)
+        if audio_data is not None:
+            emit((audio_data, ended))
+
+    def _stt_stage(self, item: tuple[np.ndarray, bool], _emit: Callable) -> None:
+        self._recognize(*item)
+
+    def _dialog_stage(self, item: tuple[str, str], _emit: Callable) -> None:
+        self._dialog_tick()
+        self._handle_dialog(item)
+
+    def _dialog_tick(self) -> None:
+        self._check_auto_pause()
+        self._confirm_expired()
+
+    def _start_pipeline(self) -> Pipeline:
+        pipeline = Pipeline()
+        audio_q = pipeline.queue("audio", self.PIPELINE_AUDIO_BLOCKS)
+        chunk_q = pipeline.queue("chunks", self.PIPELINE_CHUNKS)
+        self._dialog_q = pipeline.queue("dialog", self.PIPELINE_DIALOG_ITEMS)
+        pipeline.stage("capture", self._capture_stage, outq=audio_q)
+        pipeline.stage("vad", self._vad_stage, audio_q, chunk_q)
+        pipeline.stage("stt", self._stt_stage, chunk_q, self._dialog_q)
+        pipeline.stage("dialog", self._dialog_stage, self._dialog_q, idle=self._dialog_tick)
+        self._chunk_parts, self._chunk_events, self._chunk_len = [], [], 0
+        self._pipeline = pipeline
+        pipeline.start()
+        return pipeline
+
+    def _pipeline_summary(self) -> str:
+        summary = self._pipeline.summary() if self._pipeline is not None else ""
+        reader = self._capture
+        if reader is not None:
+            # Rückstand der Aufnahme-Stufe im Ringpuffer (wächst, wenn Stufen nicht nachkommen)
+            lag = (reader.engine.position - reader.position) / self.samplerate
+            summary += f" | capture lag={lag:.2f}s overruns={reader.engine.overruns}"
+        return summary
+
     def start(self, oled: Optional[OledDisplay] = None) -> None:
         """Starte die Live-Spracherkennung."""
         self.oled = oled
@@ -931,6 +1147,15 @@ class LiveVoskRecognition:
         # Geräteauswahl anzeigen + Fallback
         self.vosk.device_id = select_input_device(self.vosk.device_spec, announce=True)
         self._log_input_device()
+        self._capture = open_capture_reader(self.vosk.device_id, self.samplerate)
+        if self.streaming:
+            self._stream = self.vosk.create_stream(
+                on_partial=lambda partial: self._dialog("partial", partial),
+                on_final=lambda text: self._dialog("final", text),
+            )
+        self._endpointer.reset()
+        if self._preprocess is not None:
+            self._preprocess.reset()
         
         if self.oled:
             self.oled.show_listening()
@@ -947,14 +1172,17 @@ class LiveVoskRecognition:
         print("Sprich jetzt...")
         
         try:
-            # Kontinuierliche Verarbeitung
-            while self.is_running:
-                if self.listening_active and self.auto_pause_after_sec > 0:
-                    if self._force_ready_until and time.time() < self._force_ready_until:
-                        pass
-                    elif (time.time() - self._last_activity_ts) >= self.auto_pause_after_sec:
-                        self._set_listening(False, "Inaktivität")
-                self._process_chunk()
+            if self.use_pipeline and self._capture is not None:
+                # Aufnahme läuft weiter, während Vosk oder die Textverarbeitung arbeiten;
+                # ein langsamer Schritt zeigt sich als Queue-Tiefe statt als Audioverlust
+                pipeline = self._start_pipeline()
+                while self.is_running and not pipeline.wait(self.PIPELINE_REPORT_SEC):
+                    self._debug(f"pipeline: {self._pipeline_summary()}")
+            else:
+                # Kontinuierliche Verarbeitung in einer Schleife
+                while self.is_running:
+                    self._check_auto_pause()
+                    self._process_chunk()
         except KeyboardInterrupt:
             print("\nBeendet.")
         finally:
@@ -963,10 +1191,18 @@ class LiveVoskRecognition:
     def stop(self) -> None:
         """Stoppe die Live-Spracherkennung."""
         self.is_running = False
+        if self._pipeline is not None:
+            self._pipeline.stop()
+            self._debug(f"pipeline: {self._pipeline_summary()}")
+            self._pipeline = None
+            self._dialog_q = None
         self.listening_active = False
         self._paused_notice = False
         self._status_text = None
         self.context_mode = False
+        self._capture = None
+        self._stream = None
+        release_capture_engine()
         if self.oled:
             self.oled.clear()
         print("Spracherkennung gestoppt.")
@@ -1003,14 +1239,14 @@ def run_live_vosk_recognition(model_path: Optional[str] = None, enable_chatgpt:
     # ChatGPT-Assistent (optional)
     chat_assistant = None
     if enable_chatgpt:
-        from openai import OpenAI
-        client = OpenAI(api_key=settings.openai_api_key)
+        client = get_client(settings)
         kwargs = dict(
             client=client,
             model_chat=settings.model_chat,
             model_tts=settings.model_tts,
             tts_voice=settings.tts_voice,
             audio_output_device=settings.audio_output_device,
+            stream_responses=settings.chat_streaming,
             echo_input_before_chat=settings.echo_input_before_chat,
             echo_input_local_tts=settings.echo_input_local_tts,
             announce_chat_request=settings.announce_chat_request,
@@ -1038,6 +1274,10 @@ def run_live_vosk_recognition(model_path: Optional[str] = None, enable_chatgpt:
         model_path=model_path,
         device=settings.audio_input_device,
         chunk_duration=settings.vosk_chunk_duration,
+        streaming=settings.vosk_streaming,
+        stream_chunk_duration=settings.vosk_stream_chunk_duration,
+        kws_model_path=settings.vosk_kws_model_path,
+        pipeline=settings.vosk_pipeline,
         wake_phrases=tuple(settings.wake_phrases),
         context_phrases=tuple(settings.context_phrases),
         stop_phrases=tuple(settings.stop_phrases),
@@ -1056,6 +1296,7 @@ def run_live_vosk_recognition(model_path: Optional[str] = None, enable_chatgpt:
         reject_phrases=tuple(settings.reject_phrases),
         confirm_timeout_sec=settings.confirm_timeout_sec,
         enable_audio_processing=settings.enable_audio_processing,
+        enable_noise_suppression=settings.enable_noise_suppression,
         pause_duration=settings.vosk_pause_duration,
         vad_rms_threshold=settings.vad_rms_threshold,
         vad_noise_multiplier=settings.vad_noise_multiplier,
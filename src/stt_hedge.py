@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import io
+import json
+import sys
+import threading
+import time
+import wave
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .circuit_breaker import CircuitOpenError
+from .keyword_spotting import load_grammar_model, normalize_phrase
+from .stt_upload import transcribe_upload
+
+# Whisper-style models "hear" these in silence or noise.
+_HALLUCINATIONS = ("untertitel", "amara org", "vielen dank fürs zuschauen", "thanks for watching")
+
+
+@dataclass(frozen=True)
+class HedgeEngine:
+    """One transcriber taking part in the race; started ``delay_sec`` after the audio arrives."""
+
+    name: str
+    fn: Callable[[bytes], str]
+    delay_sec: float = 0.0
+
+
+def _wav_seconds(wav_bytes: bytes) -> float:
+    try:
+        with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+            return wf.getnframes() / float(wf.getframerate() or 1)
+    except Exception:
+        return 0.0
+
+
+class HedgedTranscriber:
+    """Race several transcribers; the first plausible result wins.
+
+    Engines run in parallel (each after its own delay, so the cloud can be
+    held back a little to save requests when the local engine is quick). The
+    first result that passes check() is returned at once; engines still
+    waiting for their delay never start, running ones finish in the
+    background and are ignored. If no result passes, the longest one that
+    was only rejected as too short is returned (else ""), so tail latency is
+    bounded by the slowest engine's own timeout, never by the network alone.
+    """
+
+    def __init__(
+        self,
+        engines: list[HedgeEngine],
+        max_words_per_sec: float = 6.0,
+        min_words_per_sec: float = 0.25,
+        long_audio_sec: float = 4.0,
+        debug: bool = False,
+    ) -> None:
+        """
+        Args:
+            engines: Transcribers in order of preference (ties go to the first)
+            max_words_per_sec: More words per second of audio is a hallucination
+            min_words_per_sec: Fewer words for audio of at least ``long_audio_sec`` is too short
+            long_audio_sec: Audio length from which the minimum word rate applies
+            debug: Print which engine won and how long it took
+        """
+        if not engines:
+            raise ValueError("STT-Hedge: mindestens eine Engine nötig")
+        self.engines = list(engines)
+        self.max_words_per_sec = max_words_per_sec
+        self.min_words_per_sec = min_words_per_sec
+        self.long_audio_sec = long_audio_sec
+        self.debug = debug
+        # Losers may still be running, so leave room for the next utterance.
+        self._pool = ThreadPoolExecutor(max_workers=2 * len(self.engines), thread_name_prefix="stt-hedge")
+        self.wins = {e.name: 0 for e in self.engines}
+        self.skipped = {e.name: 0 for e in self.engines}
+        self.failures = {e.name: 0 for e in self.engines}
+
+    def check(self, text: str, audio_sec: float) -> Optional[str]:
+        """Rejection reason for a transcription ("leer", "halluziniert", "zu kurz"), None if plausible."""
+        norm = normalize_phrase(text)
+        if not norm:
+            return "leer"
+        if any(h in norm for h in _HALLUCINATIONS):
+            return "halluziniert"
+        words = len(norm.split())
+        if audio_sec > 0 and words > max(2.0, self.max_words_per_sec * audio_sec):
+            return "halluziniert"
+        if audio_sec >= self.long_audio_sec and words < self.min_words_per_sec * audio_sec:
+            return "zu kurz"
+        return None
+
+    def _run(self, engine: HedgeEngine, wav_bytes: bytes, decided: threading.Event) -> Optional[str]:
+        if engine.delay_sec > 0 and decided.wait(engine.delay_sec):
+            self.skipped[engine.name] += 1
+            return None
+        if decided.is_set():
+            self.skipped[engine.name] += 1
+            return None
+        return engine.fn(wav_bytes)
+
+    def __call__(self, wav_bytes: bytes) -> str:
+        if not wav_bytes:
+            return ""
+        audio_sec = _wav_seconds(wav_bytes)
+        t0 = time.monotonic()
+        decided = threading.Event()
+        order: dict[Future, int] = {}
+        for i, engine in enumerate(self.engines):
+            order[self._pool.submit(self._run, engine, wav_bytes, decided)] = i
+        pending = set(order)
+        fallback = ""
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in sorted(done, key=order.get):
+                    engine = self.engines[order[fut]]
+                    try:
+                        text = (fut.result() or "").strip()
+                    except CircuitOpenError:
+                        self.skipped[engine.name] += 1
+                        continue
+                    except Exception as e:
+                        self.failures[engine.name] += 1
+                        print(f"STT-Hedge: {engine.name} fehlgeschlagen ({e})", file=sys.stderr)
+                        continue
+                    reason = self.check(text, audio_sec)
+                    if reason is None:
+                        self.wins[engine.name] += 1
+                        if self.debug:
+                            print(
+                                f"STT-Hedge: {engine.name} gewinnt nach {time.monotonic() - t0:.2f}s",
+                                file=sys.stderr,
+                            )
+                        return text
+                    if self.debug:
+                        print(f"STT-Hedge: {engine.name} verworfen ({reason}): '{text}'", file=sys.stderr)
+                    if reason == "zu kurz" and len(text) > len(fallback):
+                        fallback = text
+            return fallback
+        finally:
+            decided.set()
+            for fut in pending:
+                fut.cancel()
+
+    def summary(self) -> str:
+        return " | ".join(
+            f"{e.name}: wins={self.wins[e.name]} skipped={self.skipped[e.name]} err={self.failures[e.name]}"
+            for e in self.engines
+        )
+
+
+def make_vosk_transcribe_fn(model) -> Callable[[bytes], str]:
+    """Full-vocabulary Vosk transcription of WAV bytes (one recognizer per call, thread-safe)."""
+    from vosk import KaldiRecognizer
+
+    def _transcribe(wav_bytes: bytes) -> str:
+        with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+            if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                raise ValueError("Vosk: nur 16-bit-PCM mono wird unterstützt")
+            rec = KaldiRecognizer(model, wf.getframerate())
+            rec.SetWords(False)
+            rec.AcceptWaveform(wf.readframes(wf.getnframes()))
+        return json.loads(rec.FinalResult()).get("text", "")
+
+    return _transcribe
+
+
+def _local_engine(settings) -> Optional[tuple[str, Callable[[bytes], str]]]:
+    """(name, transcribe fn) of the local engine selected by STT_HEDGE_LOCAL, None if unavailable."""
+    local = settings.stt_hedge_local
+    if local == "auto":
+        local = "whisper_cpp" if settings.use_whisper_cpp else "vosk"
+    if local == "whisper_cpp":
+        from .whisper_cpp import make_whisper_cpp_transcribe_fn
+
+        return local, make_whisper_cpp_transcribe_fn(settings)
+    model = load_grammar_model(settings.stt_hedge_vosk_model or settings.vosk_model_path)
+    if model is None:
+        return None
+    return local, make_vosk_transcribe_fn(model)
+
+
+def _cloud_fn(settings, client) -> Callable[[bytes], str]:
+    def _cloud(wav_bytes: bytes) -> str:
+        return transcribe_upload(
+            client,
+            settings.model_stt,
+            wav_bytes,
+            fmt=settings.stt_upload_format,
+            trim=settings.stt_trim_silence,
+        )
+
+    return _cloud
+
+
+def make_hedged_transcribe_fn(settings, client) -> Optional[HedgedTranscriber]:
+    """Local engine plus OpenAI STT as a HedgedTranscriber (None if STT_HEDGE is off or no local engine)."""
+    if not settings.stt_hedge:
+        return None
+    local = _local_engine(settings)
+    if local is None:
+        print("STT-Hedge: kein lokales Vosk-Modell, nutze nur eine Engine.", file=sys.stderr)
+        return None
+    return HedgedTranscriber(
+        [
+            HedgeEngine(*local),
+            HedgeEngine("openai", _cloud_fn(settings, client), delay_sec=max(0.0, settings.stt_hedge_cloud_delay_sec)),
+        ],
+        debug=settings.debug_logs,
+    )
+
+
+def make_transcribe_fn(settings, client) -> Callable[[bytes], str]:
+    """STT as configured: hedged, whisper.cpp, or OpenAI with a local fallback.
+
+    The fallback engine (STT_HEDGE_LOCAL) is only loaded when OpenAI STT
+    first fails; while its circuit breaker is open, utterances go straight
+    to the local engine.
+    """
+    hedged = make_hedged_transcribe_fn(settings, client)
+    if hedged is not None:
+        return hedged
+    if settings.use_whisper_cpp:
+        from .whisper_cpp import make_whisper_cpp_transcribe_fn
+
+        return make_whisper_cpp_transcribe_fn(settings)
+    cloud = _cloud_fn(settings, client)
+    if not settings.stt_local_fallback:
+        return cloud
+    lock = threading.Lock()
+    fallback: list = []
+
+    def _transcribe(wav_bytes: bytes) -> str:
+        try:
+            return cloud(wav_bytes)
+        except Exception as e:
+            with lock:
+                if not fallback:
+                    fallback.append(_local_engine(settings))
+            local = fallback[0]
+            if local is None:
+                raise
+            if not isinstance(e, CircuitOpenError):
+                print(f"STT: OpenAI fehlgeschlagen ({e}), nutze {local[0]}.", file=sys.stderr)
+            return local[1](wav_bytes)
+
+    return _transcribe
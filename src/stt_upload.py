@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import io
+import sys
+import wave
+from typing import Optional
+
+import numpy as np
+
+from .openai_client import breaker, call_timeout
+
+# Upload format -> (file name for the API, soundfile format, soundfile subtype)
+_FORMATS = {
+    "wav": ("audio.wav", None, None),
+    "flac": ("audio.flac", "FLAC", "PCM_16"),
+    "opus": ("audio.ogg", "OGG", "OPUS"),
+}
+
+_soundfile_error: Optional[str] = None
+
+
+def _soundfile():
+    """soundfile (libsndfile) for in-process FLAC/Opus encoding; None if unavailable."""
+    global _soundfile_error
+    if _soundfile_error is not None:
+        return None
+    try:
+        import soundfile  # type: ignore
+        return soundfile
+    except Exception as e:
+        _soundfile_error = str(e)
+        print(f"STT-Upload: soundfile nicht verfügbar ({e}), sende WAV.", file=sys.stderr)
+        return None
+
+
+def read_wav(wav_bytes: bytes) -> tuple[np.ndarray, int]:
+    """Return (int16 mono samples, samplerate) of 16-bit PCM WAV bytes (first channel)."""
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+        channels = wf.getnchannels()
+        if wf.getsampwidth() != 2:
+            raise ValueError("STT-Upload: nur 16-bit-PCM wird unterstützt")
+        samplerate = wf.getframerate()
+        audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    if channels > 1:
+        audio = audio[::channels]
+    return audio, samplerate
+
+
+def trim_silence(
+    audio: np.ndarray,
+    samplerate: int,
+    frame_ms: int = 20,
+    min_rms: float = 0.005,
+    noise_ratio: float = 3.0,
+    keep_sec: float = 0.2,
+) -> np.ndarray:
+    """Cut leading/trailing silence from int16 mono audio (returns a view).
+
+    A frame is speech if its RMS exceeds both ``min_rms`` and ``noise_ratio``
+    times the noise floor (10th percentile of all frame levels). The floor
+    is capped at half the peak level, so clips without any pause (the live
+    recognizer buffers only speech chunks) and quiet onsets survive.
+    ``keep_sec`` of context stays on both sides. Only audio whose loudest
+    frame stays below ``min_rms`` returns an empty array.
+    """
+    frame = max(1, int(samplerate * frame_ms / 1000))
+    n_frames = audio.size // frame
+    if n_frames == 0:
+        return audio
+    x = audio[: n_frames * frame].astype(np.float32).reshape(n_frames, frame) / 32768.0
+    levels = np.sqrt(np.mean(x * x, axis=1))
+    peak = float(levels.max())
+    if peak < min_rms:
+        return audio[:0]
+    floor = min(noise_ratio * float(np.percentile(levels, 10)), 0.5 * peak)
+    speech = np.flatnonzero(levels > max(min_rms, floor))
+    if speech.size == 0:
+        return audio
+    keep = int(samplerate * keep_sec)
+    start = max(0, int(speech[0]) * frame - keep)
+    end = min(audio.size, (int(speech[-1]) + 1) * frame + keep)
+    return audio[start:end]
+
+
+def encode_upload(audio: np.ndarray, samplerate: int, fmt: str = "wav") -> tuple[str, bytes]:
+    """Encode int16 mono audio in memory; returns (file name, data) for the STT API.
+
+    FLAC (lossless) and Opus need the optional soundfile package; without it,
+    or for an unknown format, WAV is sent.
+    """
+    name, sf_format, subtype = _FORMATS.get((fmt or "wav").lower(), _FORMATS["wav"])
+    buf = io.BytesIO()
+    sf = _soundfile() if sf_format else None
+    if sf is not None:
+        try:
+            sf.write(buf, audio, samplerate, format=sf_format, subtype=subtype)
+            return name, buf.getvalue()
+        except Exception as e:
+            # e.g. libsndfile without Opus support
+            print(f"STT-Upload: {fmt} nicht kodierbar ({e}), sende WAV.", file=sys.stderr)
+            buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(samplerate)
+        wf.writeframes(audio.astype(np.int16, copy=False).tobytes())
+    return _FORMATS["wav"][0], buf.getvalue()
+
+
+def transcribe_upload(
+    client,
+    model_stt: str,
+    wav_bytes: bytes,
+    fmt: str = "wav",
+    trim: bool = True,
+) -> str:
+    """Transcribe WAV bytes with the OpenAI STT API without temp files.
+
+    Silence at both ends is trimmed first (nothing is uploaded if only
+    silence is left) and the audio is sent in the requested format. Raises
+    CircuitOpenError without a request while the STT endpoint is down.
+    """
+    audio, samplerate = read_wav(wav_bytes)
+    if trim:
+        audio = trim_silence(audio, samplerate)
+        if audio.size == 0:
+            return ""
+    name, data = encode_upload(audio, samplerate, fmt)
+    stt = breaker("stt").call(
+        client.audio.transcriptions.create,
+        model=model_stt,
+        file=(name, data),
+        timeout=call_timeout("stt"),
+    )
+    return (stt.text or "").strip()
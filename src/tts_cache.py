@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+
+class TtsCache:
+    """Content-addressed cache for synthesized speech (WAV bytes).
+
+    Entries are keyed by normalized text + TTS model + voice and stored
+    gzip-compressed on disk. The disk tier is bounded in bytes and evicts the
+    least recently used files (access time is kept in the file mtime); a small
+    in-memory tier keeps the most recent clips decompressed.
+    """
+
+    SUFFIX = ".wav.gz"
+
+    def __init__(
+        self,
+        cache_dir: str = "data/tts_cache",
+        max_bytes: int = 50 * 1024 * 1024,
+        memory_items: int = 32,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max(0, int(max_bytes))
+        self.memory_items = max(0, int(memory_items))
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        # key -> (size on disk, last access)
+        self._index: dict[str, tuple[int, float]] = {}
+        self._disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._scan()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return re.sub(r"\s+", " ", text or "").strip()
+
+    @classmethod
+    def make_key(cls, text: str, model: str, voice: str) -> str:
+        raw = "\0".join((model or "", voice or "", cls.normalize_text(text)))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, text: str, model: str, voice: str) -> Optional[bytes]:
+        """Return cached WAV bytes or None."""
+        key = self.make_key(text, model, voice)
+        with self._lock:
+            wav_bytes = self._memory.get(key)
+            if wav_bytes is not None:
+                self._memory.move_to_end(key)
+                self._touch(key)
+                self.hits += 1
+                return wav_bytes
+            if key not in self._index:
+                self.misses += 1
+                return None
+        try:
+            with gzip.open(self._path(key), "rb") as f:
+                wav_bytes = f.read()
+        except (OSError, EOFError):
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            self._touch(key)
+            self._remember(key, wav_bytes)
+            self.hits += 1
+        return wav_bytes
+
+    def put(self, text: str, model: str, voice: str, wav_bytes: bytes) -> None:
+        if not wav_bytes:
+            return
+        key = self.make_key(text, model, voice)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                f.write(wav_bytes)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            print(f"TTS-Cache: speichern fehlgeschlagen ({e})")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            old = self._index.get(key)
+            if old:
+                self._disk_bytes -= old[0]
+            self._index[key] = (size, time.time())
+            self._disk_bytes += size
+            self._remember(key, wav_bytes)
+            self._evict()
+
+    def get_or_synthesize(
+        self, text: str, model: str, voice: str, synthesize: Callable[[str], bytes]
+    ) -> bytes:
+        wav_bytes = self.get(text, model, voice)
+        if wav_bytes is not None:
+            return wav_bytes
+        wav_bytes = synthesize(text)
+        self.put(text, model, voice, wav_bytes)
+        return wav_bytes
+
+    def warm(
+        self,
+        phrases: Iterable[str],
+        model: str,
+        voice: str,
+        synthesize: Callable[[str], bytes],
+    ) -> threading.Thread:
+        """Synthesize missing phrases in a background thread."""
+        phrases = [p for p in phrases if self.normalize_text(p)]
+
+        def _warm() -> None:
+            added = 0
+            for phrase in phrases:
+                key = self.make_key(phrase, model, voice)
+                with self._lock:
+                    if key in self._index:
+                        continue
+                try:
+                    self.put(phrase, model, voice, synthesize(phrase))
+                    added += 1
+                except Exception as e:
+                    print(f"TTS-Cache: Vorwärmen fehlgeschlagen ({e})")
+                    return
+            if added:
+                print(f"TTS-Cache: {added} Phrase(n) vorgewärmt.")
+
+        thread = threading.Thread(target=_warm, daemon=True)
+        thread.start()
+        return thread
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.SUFFIX)
+
+    def _scan(self) -> None:
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except OSError:
+            return
+        for entry in entries:
+            if not entry.name.endswith(self.SUFFIX):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            key = entry.name[: -len(self.SUFFIX)]
+            self._index[key] = (st.st_size, st.st_mtime)
+            self._disk_bytes += st.st_size
+        with self._lock:
+            self._evict()
+
+    def _touch(self, key: str) -> None:
+        entry = self._index.get(key)
+        if not entry:
+            return
+        now = time.time()
+        self._index[key] = (entry[0], now)
+        try:
+            os.utime(self._path(key), (now, now))
+        except OSError:
+            pass
+
+    def _remember(self, key: str, wav_bytes: bytes) -> None:
+        if self.memory_items <= 0:
+            return
+        self._memory[key] = wav_bytes
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _forget(self, key: str) -> None:
+        entry = self._index.pop(key, None)
+        if entry:
+            self._disk_bytes -= entry[0]
+        self._memory.pop(key, None)
+
+    def _evict(self) -> None:
+        if self._disk_bytes <= self.max_bytes:
+            return
+        for key, _ in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._disk_bytes <= self.max_bytes:
+                break
+            self._forget(key)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+
+_cache: Optional[TtsCache] = None
+_cache_lock = threading.Lock()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return v.strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def get_tts_cache() -> Optional[TtsCache]:
+    """Return the shared TTS cache (None if TTS_CACHE_ENABLED=false)."""
+    global _cache
+    if not _env_bool("TTS_CACHE_ENABLED", True):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                max_mb = float(os.getenv("TTS_CACHE_MAX_MB", "50"))
+            except ValueError:
+                max_mb = 50.0
+            try:
+                memory_items = int(os.getenv("TTS_CACHE_MEMORY_ITEMS", "32"))
+            except ValueError:
+                memory_items = 32
+            _cache = TtsCache(
+                cache_dir=os.getenv("TTS_CACHE_DIR", "data/tts_cache"),
+                max_bytes=int(max_mb * 1024 * 1024),
+                memory_items=memory_items,
+            )
+        return _cache
+
+
+def _max_text_chars() -> int:
+    try:
+        return int(os.getenv("TTS_CACHE_MAX_TEXT_CHARS", "200"))
+    except ValueError:
+        return 200
+
+
+def cached_synthesize(
+    text: str, model: str, voice: str, synthesize: Callable[[str], bytes]
+) -> bytes:
+    """Synthesize text through the shared cache (long texts bypass it)."""
+    cache = get_tts_cache()
+    if cache is None or len(cache.normalize_text(text)) > _max_text_chars():
+        return synthesize(text)
+    return cache.get_or_synthesize(text, model, voice, synthesize)
+
+
+def warm_tts_cache(
+    phrases: Iterable[str], model: str, voice: str, synthesize: Callable[[str], bytes]
+) -> Optional[threading.Thread]:
+    """Pre-synthesize fixed phrases in the background (TTS_CACHE_WARM)."""
+    cache = get_tts_cache()
+    if cache is None or not _env_bool("TTS_CACHE_WARM", True):
+        return None
+    return cache.warm(phrases, model, voice, synthesize)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .audio_frame import AudioFrame
+
+
+@dataclass(frozen=True)
+class VadResult:
+    mask: np.ndarray  # bool per frame
+    frame_rms: np.ndarray  # float32 per frame (0..1)
+    threshold: float  # effective RMS threshold used for this block
+    noise_floor: float
+    frames_checked: int  # < len(mask) if webrtcvad stopped early
+
+    @property
+    def total_frames(self) -> int:
+        return int(self.mask.size)
+
+    @property
+    def speech_frames(self) -> int:
+        return int(np.count_nonzero(self.mask))
+
+    @property
+    def is_speech(self) -> bool:
+        return bool(self.mask.any())
+
+    @property
+    def speech_ratio(self) -> float:
+        return self.speech_frames / self.frames_checked if self.frames_checked else 0.0
+
+    @property
+    def rms(self) -> float:
+        """RMS of the whole block (from the per-frame energies)."""
+        if not self.frame_rms.size:
+            return 0.0
+        return float(np.sqrt(np.mean(self.frame_rms.astype(np.float64) ** 2)))
+
+    @property
+    def peak_rms(self) -> float:
+        return float(self.frame_rms.max()) if self.frame_rms.size else 0.0
+
+
+class VoiceActivityDetector:
+    """Frame-level voice activity detection for int16 mono audio.
+
+    The block is viewed as (frames, frame_len) without copying and per-frame
+    RMS is computed in one NumPy pass. With webrtcvad available its decision
+    is used per frame; otherwise frames are compared with
+    max(rms_threshold, noise_floor * noise_multiplier), lowered by
+    hangover_factor while speech continues. The noise floor is an EMA over
+    quiet frames and is kept per instance, so use one detector per stream.
+    ``noise_alpha`` is the EMA weight per ``noise_alpha_sec`` of quiet audio
+    (None = per frame); it is converted to the equivalent per-frame weight.
+    """
+
+    def __init__(
+        self,
+        samplerate: int = 16000,
+        frame_ms: int = 30,
+        rms_threshold: float = 0.01,
+        noise_multiplier: float = 3.0,
+        noise_alpha: float = 0.1,
+        hangover_factor: float = 0.6,
+        use_webrtcvad: bool = True,
+        webrtcvad_mode: int = 2,
+        noise_alpha_sec: float | None = None,
+    ) -> None:
+        self.samplerate = int(samplerate)
+        self.frame_ms = frame_ms if frame_ms in (10, 20, 30) else 30
+        self.frame_len = int(self.samplerate * self.frame_ms / 1000)
+        self.rms_threshold = rms_threshold
+        self.noise_multiplier = noise_multiplier
+        self.noise_alpha = max(0.0, min(noise_alpha, 1.0))
+        if noise_alpha_sec and noise_alpha_sec > 0 and self.noise_alpha < 1.0:
+            # Same decay per noise_alpha_sec, spread over its frames
+            frames_per_step = noise_alpha_sec * 1000.0 / self.frame_ms
+            self.noise_alpha = 1.0 - (1.0 - self.noise_alpha) ** (1.0 / frames_per_step)
+        self.hangover_factor = max(0.1, min(hangover_factor, 1.0))
+        self.noise_floor = 0.0
+        self.webrtcvad_error: Optional[str] = None
+        self._webrtcvad = None
+        if use_webrtcvad:
+            try:
+                import webrtcvad  # type: ignore
+                self._webrtcvad = webrtcvad.Vad(max(0, min(int(webrtcvad_mode), 3)))
+            except Exception as e:
+                self.webrtcvad_error = str(e)
+
+    @property
+    def uses_webrtcvad(self) -> bool:
+        return self._webrtcvad is not None
+
+    def reset(self) -> None:
+        self.noise_floor = 0.0
+
+    def frames(self, samples: np.ndarray) -> np.ndarray:
+        """(n_frames, frame_len) view of the complete frames in samples (no copy)."""
+        samples = np.ascontiguousarray(samples.reshape(-1))
+        n = samples.size // self.frame_len
+        return samples[: n * self.frame_len].reshape(n, self.frame_len)
+
+    def frame_rms(self, frames: np.ndarray) -> np.ndarray:
+        """Per-frame RMS of float32 frames (-1..1)."""
+        return np.sqrt(np.einsum("ij,ij->i", frames, frames) / max(1, frames.shape[1]))
+
+    def _update_noise_floor(self, rms: np.ndarray) -> None:
+        quiet = rms[rms < self.rms_threshold]
+        if self.noise_alpha <= 0 or not quiet.size:
+            return
+        a = self.noise_alpha
+        floor = self.noise_floor
+        if floor <= 0:
+            floor = float(quiet[0])
+            quiet = quiet[1:]
+        m = quiet.size
+        if m:
+            # Closed form of m sequential EMA steps
+            weights = a * (1.0 - a) ** np.arange(m - 1, -1, -1, dtype=np.float64)
+            floor = (1.0 - a) ** m * floor + float(np.dot(weights, quiet))
+        self.noise_floor = floor
+
+    def _rms_mask(self, rms: np.ndarray, threshold: float, in_speech: bool) -> np.ndarray:
+        full = rms > threshold
+        hang = rms > threshold * self.hangover_factor
+        if self.hangover_factor >= 1.0:
+            return full
+        # A frame above the hangover threshold is speech if a frame above the
+        # full threshold (or speech carried in from the previous block) occurs
+        # earlier in the same run of hangover frames.
+        idx = np.arange(rms.size)
+        run_start = np.maximum.accumulate(np.where(~hang, idx, -1)) + 1
+        last_full = np.maximum.accumulate(np.where(full, idx, -1))
+        carried = in_speech & (run_start == 0)
+        return hang & ((last_full >= run_start) | carried)
+
+    def _webrtcvad_mask(self, frames: np.ndarray, stop_on_speech: bool) -> tuple[np.ndarray, int]:
+        mask = np.zeros(frames.shape[0], dtype=bool)
+        for i in range(frames.shape[0]):
+            try:
+                mask[i] = self._webrtcvad.is_speech(frames[i].tobytes(), self.samplerate)
+            except Exception:
+                continue
+            if stop_on_speech and mask[i]:
+                return mask, i + 1
+        return mask, frames.shape[0]
+
+    def analyze(
+        self,
+        audio: np.ndarray | AudioFrame,
+        in_speech: bool = False,
+        stop_on_speech: bool = False,
+    ) -> VadResult:
+        """Classify the complete frames of audio (int16 array or AudioFrame).
+
+        The result is also stored as ``frame.vad`` when an AudioFrame is passed.
+
+        Args:
+            in_speech: Speech was active at the end of the previous block (hangover)
+            stop_on_speech: Stop webrtcvad at the first speech frame (yes/no use)
+        """
+        frame = audio if isinstance(audio, AudioFrame) else AudioFrame(audio, self.samplerate)
+        rms = self.frame_rms(self.frames(frame.float32))
+        self._update_noise_floor(rms)
+        threshold = max(self.rms_threshold, self.noise_floor * self.noise_multiplier)
+        if self._webrtcvad is not None:
+            mask, checked = self._webrtcvad_mask(self.frames(frame.pcm), stop_on_speech)
+        else:
+            mask, checked = self._rms_mask(rms, threshold, in_speech), rms.size
+        frame.vad = VadResult(mask, rms, threshold, self.noise_floor, checked)
+        return frame.vad
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import atexit
+import http.client
+import json
 import os
 import shlex
+import socket
 import subprocess
 import tempfile
-from typing import Optional, Sequence
+import threading
+import time
+import uuid
+from typing import Callable, Optional, Sequence
 
 
 def transcribe_wav_bytes(
@@ -81,3 +88,254 @@ def _split_args(args: str) -> Sequence[str]:
         return shlex.split(args)
     except Exception:
         return []
+
+
+class WhisperCppServer:
+    """Long-lived whisper.cpp HTTP server with the model kept in memory.
+
+    The server binary is started once on 127.0.0.1 and receives each utterance
+    as a WAV upload on /inference, so the ggml model is not reloaded per call.
+    If the process dies it is restarted on the next request.
+    """
+
+    def __init__(
+        self,
+        bin_path: str,
+        model_path: str,
+        port: int = 8178,
+        language: Optional[str] = None,
+        threads: int = 4,
+        temperature: float = 0.0,
+        extra_args: Optional[str] = None,
+        start_timeout: float = 60.0,
+        request_timeout: float = 60.0,
+    ) -> None:
+        self.bin_path = bin_path or "whisper.cpp/server"
+        self.model_path = model_path or "models/ggml-base.bin"
+        self.host = "127.0.0.1"
+        self.port = int(port)
+        self.language = language
+        self.threads = max(1, int(threads))
+        self.temperature = temperature
+        self.extra_args = extra_args
+        self.start_timeout = start_timeout
+        self.request_timeout = request_timeout
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self) -> None:
+        """Start the server (if needed) and wait until it accepts connections."""
+        with self._lock:
+            self._ensure_started()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stop_locked()
+
+    def transcribe(self, wav_bytes: bytes) -> str:
+        """Transcribe WAV bytes; restarts the server once if it is gone."""
+        if not wav_bytes:
+            return ""
+        with self._lock:
+            for attempt in range(2):
+                self._ensure_started()
+                try:
+                    return self._post_inference(wav_bytes)
+                except (OSError, http.client.HTTPException) as e:
+                    if attempt == 0 and not self.is_running:
+                        print(f"whisper.cpp server stopped ({e}), restarting...")
+                        self._stop_locked()
+                        continue
+                    raise RuntimeError(f"whisper.cpp server request failed: {e}") from e
+        return ""
+
+    def _command(self) -> list[str]:
+        cmd: list[str] = [
+            self.bin_path,
+            "-m",
+            self.model_path,
+            "--host",
+            self.host,
+            "--port",
+            str(self.port),
+            "-nt",
+            "-t",
+            str(self.threads),
+        ]
+        if self.language:
+            cmd.extend(["-l", self.language])
+        if self.extra_args:
+            cmd.extend(_split_args(self.extra_args))
+        return cmd
+
+    def _ensure_started(self) -> None:
+        if self.is_running:
+            return
+        self._stop_locked()
+        if not os.path.exists(self.bin_path):
+            raise FileNotFoundError(f"whisper.cpp server binary not found: {self.bin_path}")
+        if not os.path.exists(self.model_path):
+            raise FileNotFoundError(f"whisper.cpp model not found: {self.model_path}")
+        self._proc = subprocess.Popen(
+            self._command(),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        # The server only binds its port after the model is loaded.
+        deadline = time.monotonic() + self.start_timeout
+        while time.monotonic() < deadline:
+            if self._proc.poll() is not None:
+                code = self._proc.returncode
+                self._proc = None
+                raise RuntimeError(f"whisper.cpp server exited during startup (code {code})")
+            try:
+                with socket.create_connection((self.host, self.port), timeout=0.5):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        self._stop_locked()
+        raise RuntimeError(f"whisper.cpp server not ready after {self.start_timeout:.0f}s")
+
+    def _stop_locked(self) -> None:
+        proc = self._proc
+        self._proc = None
+        if proc is None or proc.poll() is not None:
+            return
+        proc.terminate()
+        try:
+            proc.wait(timeout=3.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    def _post_inference(self, wav_bytes: bytes) -> str:
+        fields = {
+            "response_format": "json",
+            "temperature": str(float(self.temperature or 0.0)),
+        }
+        if self.language:
+            fields["language"] = self.language
+        body, content_type = _encode_multipart(fields, "file", "audio.wav", wav_bytes)
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.request_timeout)
+        try:
+            conn.request("POST", "/inference", body=body, headers={"Content-Type": content_type})
+            resp = conn.getresponse()
+            data = resp.read()
+        finally:
+            conn.close()
+        if resp.status != 200:
+            raise RuntimeError(f"whisper.cpp server HTTP {resp.status}: {data[:200]!r}")
+        try:
+            return str(json.loads(data.decode("utf-8")).get("text", "")).strip()
+        except ValueError:
+            return data.decode("utf-8", errors="replace").strip()
+
+
+def _encode_multipart(
+    fields: dict[str, str], file_field: str, filename: str, file_bytes: bytes
+) -> tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts: list[bytes] = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+            f'filename="{filename}"\r\nContent-Type: audio/wav\r\n\r\n'
+        ).encode()
+    )
+    parts.append(file_bytes)
+    parts.append(f"\r\n--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+_servers: dict[tuple, WhisperCppServer] = {}
+_servers_lock = threading.Lock()
+
+
+def get_whisper_cpp_server(
+    bin_path: str,
+    model_path: str,
+    port: int = 8178,
+    language: Optional[str] = None,
+    threads: int = 4,
+    temperature: float = 0.0,
+    extra_args: Optional[str] = None,
+) -> WhisperCppServer:
+    """Return the shared server for this configuration (stopped at exit)."""
+    key = (bin_path, model_path, int(port), language, threads, temperature, extra_args)
+    with _servers_lock:
+        server = _servers.get(key)
+        if server is None:
+            server = WhisperCppServer(
+                bin_path,
+                model_path,
+                port=port,
+                language=language,
+                threads=threads,
+                temperature=temperature,
+                extra_args=extra_args,
+            )
+            if not _servers:
+                atexit.register(_stop_all_servers)
+            _servers[key] = server
+        return server
+
+
+def _stop_all_servers() -> None:
+    with _servers_lock:
+        servers = list(_servers.values())
+    for server in servers:
+        server.stop()
+
+
+def make_whisper_cpp_transcribe_fn(settings) -> Callable[[bytes], str]:
+    """Build the whisper.cpp transcribe function selected by WHISPER_CPP_BACKEND."""
+
+    def _cli_transcribe(wav_bytes: bytes) -> str:
+        return transcribe_wav_bytes(
+            wav_bytes,
+            bin_path=settings.whisper_cpp_bin,
+            model_path=settings.whisper_cpp_model,
+            language=settings.whisper_cpp_language,
+            threads=settings.whisper_cpp_threads,
+            temperature=settings.whisper_cpp_temperature,
+            extra_args=settings.whisper_cpp_extra_args,
+        )
+
+    if settings.whisper_cpp_backend != "server":
+        return _cli_transcribe
+
+    server = get_whisper_cpp_server(
+        settings.whisper_cpp_server_bin,
+        settings.whisper_cpp_model,
+        port=settings.whisper_cpp_server_port,
+        language=settings.whisper_cpp_language,
+        threads=settings.whisper_cpp_threads,
+        temperature=settings.whisper_cpp_temperature,
+        extra_args=settings.whisper_cpp_extra_args,
+    )
+    # Load the model now instead of on the first utterance.
+    threading.Thread(target=_prestart, args=(server,), daemon=True).start()
+
+    def _server_transcribe(wav_bytes: bytes) -> str:
+        try:
+            return server.transcribe(wav_bytes)
+        except (OSError, RuntimeError) as e:
+            print(f"whisper.cpp server unavailable ({e}), falling back to CLI")
+            return _cli_transcribe(wav_bytes)
+
+    return _server_transcribe
+
+
+def _prestart(server: WhisperCppServer) -> None:
+    try:
+        server.start()
+    except (OSError, RuntimeError) as e:
+        print(f"whisper.cpp server start failed: {e}")